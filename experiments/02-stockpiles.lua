@@ -1,20 +1,20 @@
--- experiments/02-stockpiles.lua
--- Status: untested
--- Patterns for stockpile creation and configuration
-
--- =============================================================================
--- PATTERN: Create stockpile
--- =============================================================================
--- dfhack.buildings.constructBuilding{type=df.building_type.Stockpile, pos={...}, width=W, height=H, abstract=true}
-
--- =============================================================================
--- PATTERN: Configure with preset
--- =============================================================================
--- stockpiles import library/all -s ID
-
--- =============================================================================
--- TODO: Explore
--- =============================================================================
--- [ ] Link stockpile to workshop
--- [ ] Custom filter settings
--- [ ] Give from/take from
+-- experiments/02-stockpiles.lua
+-- Status: untested
+-- Patterns for stockpile creation and configuration
+
+-- =============================================================================
+-- PATTERN: Create stockpile
+-- =============================================================================
+-- dfhack.buildings.constructBuilding{type=df.building_type.Stockpile, pos={...}, width=W, height=H, abstract=true}
+
+-- =============================================================================
+-- PATTERN: Configure with preset
+-- =============================================================================
+-- stockpiles import library/all -s ID
+
+-- =============================================================================
+-- TODO: Explore
+-- =============================================================================
+-- [ ] Link stockpile to workshop
+-- [ ] Custom filter settings
+-- [ ] Give from/take from
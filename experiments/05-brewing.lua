@@ -1,15 +1,15 @@
--- experiments/05-brewing.lua
--- Status: untested
--- Patterns for drink production
-
--- =============================================================================
--- PATTERN: Add brew job to still
--- =============================================================================
--- job.job_type = 113 (ProcessPlantsBarrel)
-
--- =============================================================================
--- TODO: Explore
--- =============================================================================
--- [ ] Check available brewable plants
--- [ ] Count empty barrels
--- [ ] Check drink levels
+-- experiments/05-brewing.lua
+-- Status: untested
+-- Patterns for drink production
+
+-- =============================================================================
+-- PATTERN: Add brew job to still
+-- =============================================================================
+-- job.job_type = 113 (ProcessPlantsBarrel)
+
+-- =============================================================================
+-- TODO: Explore
+-- =============================================================================
+-- [ ] Check available brewable plants
+-- [ ] Count empty barrels
+-- [ ] Check drink levels
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Decode benchmark for large GetUnitList replies.
+
+Builds a synthetic RemoteFortressReader.UnitList (no game needed) and
+compares the hand-rolled dict decoder, the lazy MessageView walk (the
+fallback when the generated classes are unavailable) and the generated,
+upb-backed message classes: for decoding alone, for decoding plus
+building the citizen list the way DFClient.get_citizens does, and for a
+flags-only threat scan like the one in scripts/threats.py. Finally it
+times classifying decoded units per unit against UnitTable masks.
+
+Usage: bench_decode.py [units] [rounds]
+"""
+
+import sys
+import time
+sys.path.insert(0, "src")
+
+from dfclient.client import (
+    _build_citizens,
+    _decode_unit_list,
+    _decode_units,
+    _iter_unit_views,
+)
+from dfclient.enums import EnumTable
+from dfclient.units import UnitTable
+from dfclient.connection import _encode_string, _encode_varint
+from dfclient.proto import rfr_pb2
+
+
+# Profession enum of the synthetic units: 0 and 103 are idle, 73 military
+PROFESSIONS = EnumTable(0, [
+    {0: "NONE", 73: "HAMMERMAN", 103: "CHILD"}.get(i, f"PROFESSION_{i}") for i in range(130)
+])
+
+
+def _varint_field(field_num: int, value: int) -> bytes:
+    return _encode_varint(field_num << 3) + _encode_varint(value & 0xFFFFFFFFFFFFFFFF)
+
+
+def _bytes_field(field_num: int, value: bytes) -> bytes:
+    return _encode_varint((field_num << 3) | 2) + _encode_varint(len(value)) + value
+
+
+def make_unit(i: int) -> bytes:
+    """One unit with roughly the field mix of a real UnitList entry."""
+    return b"".join([
+        _varint_field(1, 10000 + i),
+        _varint_field(2, 1),
+        _varint_field(3, 40 + i % 90),
+        _varint_field(4, 150 + i % 20),
+        _varint_field(5, 572),
+        _bytes_field(6, _varint_field(1, 0 if i % 7 else -1) + _varint_field(2, 1)),
+        _bytes_field(7, _varint_field(1, 100) + _varint_field(2, 120) + _varint_field(3, 80)),
+        _varint_field(8, 0x2 if i % 31 == 0 else (0x40 if i % 29 == 0 else 0)),
+        _varint_field(9, 0x800000 if i % 37 == 0 else 0),
+        _varint_field(10, 0),
+        _varint_field(11, 0),
+        _bytes_field(12, _varint_field(1, 6000) + _varint_field(2, 6000) + _varint_field(3, 100)),
+        _encode_string(13, f"Urist McDwarf{i}"),
+        _varint_field(14, 5000),
+        _varint_field(15, 5000),
+        _bytes_field(16, _varint_field(1, 1) + _varint_field(3, [1, 103, 0, 73, 40][i % 5])),
+        _varint_field(17, [1, 103, 0, 73, 40][i % 5]),
+        _bytes_field(20, _varint_field(1, 3) + _bytes_field(2, _varint_field(1, 0) + _varint_field(2, 5))),
+        _bytes_field(20, _varint_field(1, 7) + _bytes_field(2, _varint_field(1, 0) + _varint_field(2, 9))),
+        _varint_field(25, 20 + i % 80),
+    ])
+
+
+def bench(fn, payload: bytes, rounds: int) -> float:
+    """Return mean time per call in milliseconds."""
+    fn(payload)  # warm up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(payload)
+    return (time.perf_counter() - start) / rounds * 1e3
+
+
+def main():
+    units = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    if rfr_pb2 is None:
+        print("Generated protobuf classes unavailable; only the fallback decoder can run",
+              file=sys.stderr)
+        sys.exit(1)
+
+    payload = b"".join(_bytes_field(1, make_unit(i)) for i in range(units))
+
+    def threat_ids(units):
+        return [u.id for u in units if u.flags1 & 0x80000 or u.flags2 & 0x1]
+
+    def dict_threat_ids(data):
+        return [fields.get(1) for fields in _decode_unit_list(data)
+                if fields.get(8, 0) & 0x80000 or fields.get(9, 0) & 0x1]
+
+    def view_table(data):
+        return UnitTable.from_units(_iter_unit_views(data), PROFESSIONS)
+
+    def compiled_table(data):
+        return UnitTable.from_units(_decode_units(data), PROFESSIONS)
+
+    cases = [
+        ("decode", _decode_unit_list, lambda d: list(_iter_unit_views(d)), _decode_units),
+        ("decode + UnitTable", None, view_table, compiled_table),
+        ("decode + get_citizens", None,
+         lambda d: _build_citizens(view_table(d)),
+         lambda d: _build_citizens(compiled_table(d))),
+        ("threat scan", dict_threat_ids,
+         lambda d: threat_ids(_iter_unit_views(d)),
+         lambda d: threat_ids(_decode_units(d))),
+    ]
+
+    print(f"UnitList: {units} units, {len(payload) / 1024:.0f} KB")
+    print(f"{'step':<24} {'dicts':>10} {'views':>10} {'compiled':>10}")
+    for label, *fns in cases:
+        cells = [f"{bench(fn, payload, rounds):>8.2f}ms" if fn else f"{'-':>10}" for fn in fns]
+        print(f"{label:<24} {' '.join(cells)}")
+
+    # Classifying an already decoded fortress: per-unit loop vs table masks
+    decoded = _decode_units(payload)
+    table = UnitTable.from_units(decoded, PROFESSIONS)
+
+    def loop_idle_citizens(units):
+        return sum(
+            1 for u in units
+            if not u.flags1 & 0x80042 and not u.flags2 & 0x800000
+            and u.civ.civ_id >= 0 and u.profession.profession_id in (0, 103)
+        )
+
+    def mask_idle_citizens(t):
+        return int((t.citizen() & t.idle()).sum())
+
+    print(f"idle citizens, per-unit loop: {bench(loop_idle_citizens, decoded, rounds) * 1e3:>9.1f}us")
+    print(f"idle citizens, table masks:   {bench(mask_idle_citizens, table, rounds) * 1e3:>9.1f}us")
+
+
+if __name__ == "__main__":
+    main()
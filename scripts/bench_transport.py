@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Round-trip benchmark for the DFHackConnection transport modes.
+
+Runs against an in-process stand-in for the DFHack RPC server, so no game is
+needed. Compares the original transport (low_latency=False) with the
+low-latency one for small calls (GetPauseState-sized and a short
+RunCommand-sized request) and for multi-megabyte replies (GetUnitList-sized).
+
+Usage: bench_transport.py [small_calls] [large_calls]
+"""
+
+import socket
+import struct
+import sys
+import threading
+import time
+sys.path.insert(0, "src")
+
+from dfclient.connection import (
+    DFHACK_MAGIC_REQUEST,
+    DFHACK_MAGIC_RESPONSE,
+    DFHACK_VERSION,
+    RPC_REPLY_RESULT,
+    RPC_REQUEST_QUIT,
+    DFHackConnection,
+)
+
+
+# Method IDs understood by the stand-in server
+SMALL_REPLY = 100    # 2-byte reply, like GetPauseState's SingleBool
+LARGE_REPLY = 101    # multi-megabyte reply, like GetUnitList on a big fort
+
+LARGE_REPLY_SIZE = 4 * 1024 * 1024
+
+
+def _recv_exact(conn: socket.socket, n: int) -> bytes:
+    data = bytearray()
+    while len(data) < n:
+        chunk = conn.recv(n - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed")
+        data += chunk
+    return bytes(data)
+
+
+def _serve_client(conn: socket.socket) -> None:
+    """Answer RPC calls, writing each reply header and body separately."""
+    small = b"\x08\x01"
+    large = b"\x00" * LARGE_REPLY_SIZE
+    try:
+        _recv_exact(conn, len(DFHACK_MAGIC_REQUEST) + 4)
+        conn.sendall(DFHACK_MAGIC_RESPONSE + struct.pack("<I", DFHACK_VERSION))
+        while True:
+            method_id, size = struct.unpack("<hxxI", _recv_exact(conn, 8))
+            if size:
+                _recv_exact(conn, size)
+            if method_id == RPC_REQUEST_QUIT:
+                return
+            reply = large if method_id == LARGE_REPLY else small
+            conn.sendall(struct.pack("<hxxI", RPC_REPLY_RESULT, len(reply)))
+            conn.sendall(reply)
+    except (ConnectionError, OSError):
+        pass
+    finally:
+        conn.close()
+
+
+def start_server() -> int:
+    """Start the stand-in server on a free port and return the port."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(5)
+
+    def accept_loop() -> None:
+        while True:
+            conn, _ = server.accept()
+            threading.Thread(target=_serve_client, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=accept_loop, daemon=True).start()
+    return server.getsockname()[1]
+
+
+def bench(conn: DFHackConnection, method_id: int, payload: bytes, calls: int) -> float:
+    """Return mean round-trip time in microseconds."""
+    conn.call(method_id, payload)  # warm up
+    start = time.perf_counter()
+    for _ in range(calls):
+        conn.call(method_id, payload)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    small_calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    large_calls = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    port = start_server()
+    command = b"\n\x03lua\x12\x10print(cur_year)"  # CoreRunCommandRequest-sized
+
+    cases = [
+        ("GetPauseState (empty request)", SMALL_REPLY, b"", small_calls),
+        ("RunCommand (small request)", SMALL_REPLY, command, small_calls),
+        (f"GetUnitList ({LARGE_REPLY_SIZE // (1024 * 1024)} MB reply)", LARGE_REPLY, b"", large_calls),
+    ]
+
+    print(f"{'call':<34} {'original':>12} {'low_latency':>12} {'speedup':>8}")
+    for label, method_id, payload, calls in cases:
+        results = []
+        for low_latency in (False, True):
+            conn = DFHackConnection("127.0.0.1", port, low_latency=low_latency)
+            status = conn.connect()
+            if not status.connected:
+                print(f"Failed to connect: {status.error}", file=sys.stderr)
+                sys.exit(1)
+            try:
+                results.append(bench(conn, method_id, payload, calls))
+            finally:
+                conn.disconnect()
+        before, after = results
+        print(f"{label:<34} {before:>10.1f}us {after:>10.1f}us {before / after:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,27 @@
-#!/usr/bin/env python3
-"""List idle citizens as JSON."""
-
-import json
-import sys
-sys.path.insert(0, "src")
-
-from dfclient.client import DFClient
-
-
-def main():
-    with DFClient() as client:
-        idle = client.get_idle_citizens()
-        print(json.dumps([c.model_dump() for c in idle], indent=2))
-
-
-if __name__ == "__main__":
-    main()
+#!/usr/bin/env python3
+"""List idle citizens as JSON.
+
+Reads the daemon's state file when it is fresh, otherwise asks DFHack;
+--live always asks DFHack.
+"""
+
+import json
+import sys
+sys.path.insert(0, "src")
+
+from dfclient.client import DFClient, _build_citizens
+from dfclient.shm import read_fortress_state
+
+
+def main():
+    state = None if "--live" in sys.argv else read_fortress_state()
+    if state is not None:
+        idle = [c for c in _build_citizens(state.units) if c.is_idle]
+    else:
+        with DFClient() as client:
+            idle = client.get_idle_citizens()
+    print(json.dumps([c.model_dump() for c in idle], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,154 +1,364 @@
-#!/usr/bin/env python3
-"""Query the DFClient daemon.
-
-Usage:
-    q.py daemon                - Start the daemon (run first)
-    q.py snapshot [radius]     - Get camera-centered game state (default radius=100)
-    q.py pause                 - Pause game
-    q.py unpause               - Unpause game
-    q.py play [seconds]        - Run game for N seconds (default 5)
-    q.py tick [ticks]          - Advance game by N ticks (faster, use with timestream)
-    q.py run <command>         - Run DFHack console command
-
-Designation Commands (dwarves will act on these):
-    q.py dig x1 y1 z1 x2 y2 [type]   - Designate area for digging
-                                       types: mine, stair_down, stair_up, stair_updown, channel, ramp
-    q.py dig-now                      - Instantly complete all dig designations
-    q.py build <type> x y z           - Build workshop/furnace at position
-                                       types: carpenter, mason, still, kitchen, craftsdwarf, mechanic, etc.
-    q.py stockpile x y z w h <preset> - Create stockpile with preset configuration
-                                       presets: all, food, booze, stone, wood, weapons, armor, etc.
-    q.py order <job> [amount]         - Create manager work order
-                                       jobs: BrewDrink, MakeCharcoal, ConstructBed, etc.
-    q.py labor <name> <labor> on|off  - Enable/disable labor for dwarf
-                                       labors: MINE, PLANT, BREW, CARPENTER, MASON, HAUL_STONE, etc.
-"""
-
-import json
-import socket
-import sys
-
-DAEMON_PORT = 5001
-
-
-def query(request: dict) -> dict:
-    """Send a request to the daemon and return the response."""
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.settimeout(120)  # Long timeout for play commands
-    try:
-        sock.connect(("127.0.0.1", DAEMON_PORT))
-        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
-
-        # Read response
-        data = b""
-        while b"\n" not in data:
-            chunk = sock.recv(4096)
-            if not chunk:
-                break
-            data += chunk
-
-        return json.loads(data.decode("utf-8"))
-    finally:
-        sock.close()
-
-
-def main():
-    if len(sys.argv) < 2:
-        print(__doc__)
-        sys.exit(1)
-
-    cmd = sys.argv[1]
-
-    if cmd == "daemon":
-        # Start the daemon directly
-        from dfclient.daemon import DFDaemon
-        daemon = DFDaemon()
-        daemon.run()
-        return
-
-    if cmd == "snapshot":
-        radius = int(sys.argv[2]) if len(sys.argv) > 2 else 100
-        request = {"cmd": "snapshot", "radius": radius}
-    elif cmd == "pause":
-        request = {"cmd": "pause"}
-    elif cmd == "unpause":
-        request = {"cmd": "unpause"}
-    elif cmd == "play":
-        seconds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
-        request = {"cmd": "play", "seconds": seconds}
-    elif cmd == "tick":
-        ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 100
-        request = {"cmd": "tick", "ticks": ticks}
-    elif cmd == "run":
-        command = " ".join(sys.argv[2:])
-        request = {"cmd": "run", "command": command}
-    elif cmd == "quit":
-        request = {"cmd": "quit"}
-    # Designation commands
-    elif cmd == "dig":
-        # dig x1 y1 z1 x2 y2 [type]
-        if len(sys.argv) < 7:
-            print("Usage: dig x1 y1 z1 x2 y2 [type]")
-            print("Types: mine, stair_down, stair_up, stair_updown, channel, ramp")
-            sys.exit(1)
-        x1, y1, z1, x2, y2 = int(sys.argv[2]), int(sys.argv[3]), int(sys.argv[4]), int(sys.argv[5]), int(sys.argv[6])
-        dig_type = sys.argv[7] if len(sys.argv) > 7 else "mine"
-        request = {"cmd": "dig", "x1": x1, "y1": y1, "z1": z1, "x2": x2, "y2": y2, "type": dig_type}
-    elif cmd == "dig-now":
-        request = {"cmd": "dig-now"}
-    elif cmd == "build":
-        # build <type> x y z
-        if len(sys.argv) < 6:
-            print("Usage: build <type> x y z")
-            print("Types: carpenter, mason, still, kitchen, craftsdwarf, mechanic, butcher, tanner, leather, clothier, fishery, farmer, jeweler, loom, dyer, bowyer, siege, kennel, ashery, tool, metalsmith, furnace_smelter, furnace_wood, furnace_glass, furnace_kiln")
-            sys.exit(1)
-        build_type = sys.argv[2]
-        x, y, z = int(sys.argv[3]), int(sys.argv[4]), int(sys.argv[5])
-        request = {"cmd": "build", "type": build_type, "x": x, "y": y, "z": z}
-    elif cmd == "stockpile":
-        # stockpile x y z w h <preset>
-        if len(sys.argv) < 8:
-            print("Usage: stockpile x y z width height <preset>")
-            print("Presets: all, food, booze, seeds, stone, wood, weapons, armor, ammo, furniture, bars, gems, cloth, leather, finished_goods, refuse, corpses, animals, coins")
-            sys.exit(1)
-        x, y, z = int(sys.argv[2]), int(sys.argv[3]), int(sys.argv[4])
-        w, h = int(sys.argv[5]), int(sys.argv[6])
-        preset = sys.argv[7]
-        request = {"cmd": "stockpile", "x": x, "y": y, "z": z, "width": w, "height": h, "preset": preset}
-    elif cmd == "order":
-        # order <job> [amount]
-        if len(sys.argv) < 3:
-            print("Usage: order <job_type> [amount]")
-            print("Common jobs: BrewDrink, ProcessPlants, ConstructBed, MakeBarrel, MakeBin, ConstructChair, ConstructTable, ConstructDoor, ConstructCabinet, MakeCharcoal, SmeltOre")
-            sys.exit(1)
-        job_type = sys.argv[2]
-        amount = int(sys.argv[3]) if len(sys.argv) > 3 else 1
-        request = {"cmd": "order", "job": job_type, "amount": amount}
-    elif cmd == "labor":
-        # labor <name> <labor> on|off
-        if len(sys.argv) < 5:
-            print("Usage: labor <dwarf_name> <labor_type> on|off")
-            print("Labors: MINE, HAUL_STONE, HAUL_WOOD, HAUL_BODY, HAUL_FOOD, HAUL_REFUSE, HAUL_ITEM, HAUL_FURNITURE, HAUL_ANIMALS, CUTWOOD, CARPENTER, DETAIL, MASON, ARCHITECT, ANIMALTRAIN, ANIMALCARE, DIAGNOSE, SURGERY, BONE_SETTING, SUTURING, DRESSING_WOUNDS, FEED_WATER_CIVILIANS, RECOVER_WOUNDED, BUTCHER, TRAPPER, SMALL_ANIMAL_DISSECTION, LEATHER, TANNER, BREWER, ALCHEMIST, SOAP_MAKER, WEAVER, CLOTHESMAKER, MILLER, PROCESS_PLANT, MAKE_CHEESE, COOK, PLANT, HERBALIST, FISH, CLEAN_FISH, DISSECT_FISH, HUNT, SMELT, FORGE_WEAPON, FORGE_ARMOR, FORGE_FURNITURE, METAL_CRAFT, CUT_GEM, ENCRUST_GEM, WOOD_CRAFT, STONE_CRAFT, BONE_CARVE, GLAZING, PRESSING, STRAND_EXTRACTION, BEEKEEPING, WAX_WORKING, PAPERMAKING, BOOKBINDING")
-            sys.exit(1)
-        dwarf_name = sys.argv[2]
-        labor_type = sys.argv[3]
-        enabled = sys.argv[4].lower() in ("on", "true", "1", "yes")
-        request = {"cmd": "labor", "name": dwarf_name, "labor": labor_type, "enabled": enabled}
-    else:
-        print(f"Unknown command: {cmd}")
-        print(__doc__)
-        sys.exit(1)
-
-    try:
-        response = query(request)
-        print(json.dumps(response, indent=2))
-    except ConnectionRefusedError:
-        print('{"ok": false, "error": "Daemon not running. Start with: uv run python scripts/daemon.py"}')
-        sys.exit(1)
-    except Exception as e:
-        print(f'{{"ok": false, "error": "{e}"}}')
-        sys.exit(1)
-
-
-if __name__ == "__main__":
-    main()
+#!/usr/bin/env python3
+"""Query the DFClient daemon.
+
+Usage:
+    q.py daemon                - Start the daemon (run first)
+    q.py snapshot [radius]     - Get camera-centered game state (default radius=100)
+    q.py pause                 - Pause game
+    q.py unpause               - Unpause game
+    q.py play [seconds]        - Run game for N seconds (default 5)
+    q.py tick [ticks]          - Advance game by N ticks (faster, use with timestream)
+    q.py run <command>         - Run DFHack console command
+    q.py stream <command>      - Run DFHack console command, printing output as it arrives
+    q.py session               - Keep one connection open and read commands from stdin,
+                                 one per line (q.py syntax without "q.py", or a JSON
+                                 request). Interactive on a terminal; piped input is
+                                 pipelined and answered as JSON lines in order
+
+Designation Commands (dwarves will act on these):
+    q.py dig x1 y1 z1 x2 y2 [type]   - Designate area for digging
+                                       types: mine, stair_down, stair_up, stair_updown, channel, ramp
+    q.py dig-now                      - Instantly complete all dig designations
+    q.py build <type> x y z           - Build workshop/furnace at position
+                                       types: carpenter, mason, still, kitchen, craftsdwarf, mechanic, etc.
+    q.py stockpile x y z w h <preset> - Create stockpile with preset configuration
+                                       presets: all, food, booze, stone, wood, weapons, armor, etc.
+    q.py order <job> [amount]         - Create manager work order
+                                       jobs: BrewDrink, MakeCharcoal, ConstructBed, etc.
+    q.py labor <name> <labor> on|off  - Enable/disable labor for dwarf
+                                       labors: MINE, PLANT, BREW, CARPENTER, MASON, HAUL_STONE, etc.
+    q.py batch [--atomic] "<command>"...
+                                      - Run several commands as one request, e.g.
+                                        q.py batch "dig 10 10 150 20 12" "labor Urist MINE on"
+                                        --atomic: pause meanwhile, stop at the first failure
+"""
+
+import json
+import os
+import shlex
+import socket
+import sys
+import tempfile
+from collections import deque
+from pathlib import Path
+from typing import Iterator
+
+DAEMON_PORT = 5001
+
+# The daemon's Unix socket (scripts/daemon.py --unix); used instead of TCP
+# when it exists. DFCLIENT_SOCKET overrides the path.
+DAEMON_SOCKET_PATH = Path(
+    os.environ.get("DFCLIENT_SOCKET")
+    or Path(os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()) / "dfclient" / "daemon.sock"
+)
+
+# Piped session requests in flight at once, as many as the daemon takes per
+# connection before it stops reading (DAEMON_CLIENT_BACKLOG)
+SESSION_WINDOW = 8
+
+
+class UsageError(Exception):
+    """A command line that doesn't make a valid request; the message is the usage text."""
+
+
+class DaemonClient:
+    """Persistent connection to the daemon.
+
+    Requests get an "id" and may be pipelined: ``send`` several, then
+    ``receive`` each. Responses arriving for other requests meanwhile are
+    kept until asked for.
+    """
+
+    def __init__(self, port: int = DAEMON_PORT, timeout: float = 120, unix_path: Path | str | None = DAEMON_SOCKET_PATH):
+        """Connect over the Unix socket if unix_path exists and accepts, else TCP port."""
+        self._sock = None
+        if unix_path is not None and hasattr(socket, "AF_UNIX") and os.path.exists(unix_path):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(str(unix_path))
+                self._sock = sock
+            except OSError:
+                # Left behind by a daemon that is gone
+                sock.close()
+        if self._sock is None:
+            self._sock = socket.create_connection(("127.0.0.1", port))
+        # Long timeout for play commands
+        self._sock.settimeout(timeout)
+        self._reader = self._sock.makefile("rb")
+        self._next_id = 0
+        # request id -> messages read while waiting for another request
+        self._buffered: dict[int, deque[dict]] = {}
+
+    def close(self) -> None:
+        self._reader.close()
+        self._sock.close()
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def send(self, request: dict) -> int:
+        """Send a request without waiting; returns its id."""
+        self._next_id += 1
+        request_id = self._next_id
+        self._buffered[request_id] = deque()
+        self._sock.sendall(json.dumps({**request, "id": request_id}).encode("utf-8") + b"\n")
+        return request_id
+
+    def _next_message(self, request_id: int) -> dict:
+        """Next message (streamed line or response) for a request."""
+        buffered = self._buffered[request_id]
+        while not buffered:
+            raw = self._reader.readline()
+            if not raw:
+                raise ConnectionError("Daemon closed the connection")
+            message = json.loads(raw.decode("utf-8"))
+            if "id" not in message:
+                # An error about the session itself (e.g. an unreadable line)
+                return message
+            if message["id"] in self._buffered:
+                self._buffered[message["id"]].append(message)
+        return buffered.popleft()
+
+    def iter_messages(self, request_id: int) -> Iterator[dict]:
+        """Yield a sent request's {"line": ...} objects, then its response."""
+        try:
+            while True:
+                message = self._next_message(request_id)
+                message.pop("id", None)
+                yield message
+                if "line" not in message:
+                    return
+        finally:
+            self._buffered.pop(request_id, None)
+
+    def receive(self, request_id: int) -> dict:
+        """Wait for a sent request's response, skipping streamed lines."""
+        for message in self.iter_messages(request_id):
+            pass
+        return message
+
+    def query(self, request: dict) -> dict:
+        """Send a request and wait for its response."""
+        return self.receive(self.send(request))
+
+    def query_stream(self, request: dict) -> Iterator[dict]:
+        """Send a streaming request and yield each object as it arrives."""
+        return self.iter_messages(self.send(request))
+
+    def pipeline(self, requests: list[dict]) -> list[dict]:
+        """Send all requests at once, then collect their responses in order."""
+        return [self.receive(request_id) for request_id in [self.send(r) for r in requests]]
+
+
+def query(request: dict) -> dict:
+    """Send a request to the daemon and return the response."""
+    with DaemonClient() as client:
+        return client.query(request)
+
+
+def query_stream(request: dict) -> Iterator[dict]:
+    """Send a streaming request and yield each response object as it arrives.
+
+    Output lines come as {"line": ...} objects; the last object is the
+    normal response.
+    """
+    with DaemonClient() as client:
+        yield from client.query_stream(request)
+
+
+def build_request(args: list[str]) -> dict:
+    """Turn a q.py command line (without "q.py") into a daemon request.
+
+    Raises:
+        UsageError: If the command is unknown or its arguments are missing
+    """
+    cmd = args[0]
+
+    if cmd == "snapshot":
+        radius = int(args[1]) if len(args) > 1 else 100
+        request = {"cmd": "snapshot", "radius": radius}
+    elif cmd == "pause":
+        request = {"cmd": "pause"}
+    elif cmd == "unpause":
+        request = {"cmd": "unpause"}
+    elif cmd == "play":
+        seconds = int(args[1]) if len(args) > 1 else 5
+        request = {"cmd": "play", "seconds": seconds}
+    elif cmd == "tick":
+        ticks = int(args[1]) if len(args) > 1 else 100
+        request = {"cmd": "tick", "ticks": ticks}
+    elif cmd == "run":
+        command = " ".join(args[1:])
+        request = {"cmd": "run", "command": command}
+    elif cmd == "stream":
+        command = " ".join(args[1:])
+        request = {"cmd": "run", "command": command, "stream": True}
+    elif cmd == "quit":
+        request = {"cmd": "quit"}
+    # Designation commands
+    elif cmd == "dig":
+        # dig x1 y1 z1 x2 y2 [type]
+        if len(args) < 6:
+            raise UsageError(
+                "Usage: dig x1 y1 z1 x2 y2 [type]\n"
+                "Types: mine, stair_down, stair_up, stair_updown, channel, ramp"
+            )
+        x1, y1, z1, x2, y2 = int(args[1]), int(args[2]), int(args[3]), int(args[4]), int(args[5])
+        dig_type = args[6] if len(args) > 6 else "mine"
+        request = {"cmd": "dig", "x1": x1, "y1": y1, "z1": z1, "x2": x2, "y2": y2, "type": dig_type}
+    elif cmd == "dig-now":
+        request = {"cmd": "dig-now"}
+    elif cmd == "build":
+        # build <type> x y z
+        if len(args) < 5:
+            raise UsageError(
+                "Usage: build <type> x y z\n"
+                "Types: carpenter, mason, still, kitchen, craftsdwarf, mechanic, butcher, tanner, leather, clothier, fishery, farmer, jeweler, loom, dyer, bowyer, siege, kennel, ashery, tool, metalsmith, furnace_smelter, furnace_wood, furnace_glass, furnace_kiln"
+            )
+        build_type = args[1]
+        x, y, z = int(args[2]), int(args[3]), int(args[4])
+        request = {"cmd": "build", "type": build_type, "x": x, "y": y, "z": z}
+    elif cmd == "stockpile":
+        # stockpile x y z w h <preset>
+        if len(args) < 7:
+            raise UsageError(
+                "Usage: stockpile x y z width height <preset>\n"
+                "Presets: all, food, booze, seeds, stone, wood, weapons, armor, ammo, furniture, bars, gems, cloth, leather, finished_goods, refuse, corpses, animals, coins"
+            )
+        x, y, z = int(args[1]), int(args[2]), int(args[3])
+        w, h = int(args[4]), int(args[5])
+        preset = args[6]
+        request = {"cmd": "stockpile", "x": x, "y": y, "z": z, "width": w, "height": h, "preset": preset}
+    elif cmd == "order":
+        # order <job> [amount]
+        if len(args) < 2:
+            raise UsageError(
+                "Usage: order <job_type> [amount]\n"
+                "Common jobs: BrewDrink, ProcessPlants, ConstructBed, MakeBarrel, MakeBin, ConstructChair, ConstructTable, ConstructDoor, ConstructCabinet, MakeCharcoal, SmeltOre"
+            )
+        job_type = args[1]
+        amount = int(args[2]) if len(args) > 2 else 1
+        request = {"cmd": "order", "job": job_type, "amount": amount}
+    elif cmd == "labor":
+        # labor <name> <labor> on|off
+        if len(args) < 4:
+            raise UsageError(
+                "Usage: labor <dwarf_name> <labor_type> on|off\n"
+                "Labors: MINE, HAUL_STONE, HAUL_WOOD, HAUL_BODY, HAUL_FOOD, HAUL_REFUSE, HAUL_ITEM, HAUL_FURNITURE, HAUL_ANIMALS, CUTWOOD, CARPENTER, DETAIL, MASON, ARCHITECT, ANIMALTRAIN, ANIMALCARE, DIAGNOSE, SURGERY, BONE_SETTING, SUTURING, DRESSING_WOUNDS, FEED_WATER_CIVILIANS, RECOVER_WOUNDED, BUTCHER, TRAPPER, SMALL_ANIMAL_DISSECTION, LEATHER, TANNER, BREWER, ALCHEMIST, SOAP_MAKER, WEAVER, CLOTHESMAKER, MILLER, PROCESS_PLANT, MAKE_CHEESE, COOK, PLANT, HERBALIST, FISH, CLEAN_FISH, DISSECT_FISH, HUNT, SMELT, FORGE_WEAPON, FORGE_ARMOR, FORGE_FURNITURE, METAL_CRAFT, CUT_GEM, ENCRUST_GEM, WOOD_CRAFT, STONE_CRAFT, BONE_CARVE, GLAZING, PRESSING, STRAND_EXTRACTION, BEEKEEPING, WAX_WORKING, PAPERMAKING, BOOKBINDING"
+            )
+        dwarf_name = args[1]
+        labor_type = args[2]
+        enabled = args[3].lower() in ("on", "true", "1", "yes")
+        request = {"cmd": "labor", "name": dwarf_name, "labor": labor_type, "enabled": enabled}
+    elif cmd == "batch":
+        # batch [--atomic] "<command>"...
+        atomic = "--atomic" in args[1:]
+        commands = [arg for arg in args[1:] if arg != "--atomic"]
+        if not commands:
+            raise UsageError('Usage: batch [--atomic] "<command>"...')
+        request = {"cmd": "batch", "ops": [build_request(shlex.split(c)) for c in commands], "atomic": atomic}
+    else:
+        raise UsageError(f"Unknown command: {cmd}\n{__doc__}")
+    return request
+
+
+
+def run_session() -> None:
+    """Send commands read from stdin over one connection.
+
+    On a terminal each command is answered before the next prompt. Piped
+    input is pipelined: up to SESSION_WINDOW commands are in flight at once,
+    and the responses are printed as one JSON line per command, in order.
+    """
+    interactive = sys.stdin.isatty()
+    with DaemonClient() as client:
+        # Piped input: request ids, or the error for a line that wasn't sent
+        sent: deque[int | dict] = deque()
+        in_flight = 0
+
+        def print_oldest() -> None:
+            nonlocal in_flight
+            entry = sent.popleft()
+            if isinstance(entry, int):
+                in_flight -= 1
+                entry = client.receive(entry)
+            print(json.dumps(entry), flush=True)
+
+        while True:
+            if interactive:
+                print("> ", end="", flush=True)
+            line = sys.stdin.readline()
+            if not line:
+                break
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                request = json.loads(line) if line.startswith("{") else build_request(shlex.split(line))
+            except (UsageError, ValueError) as e:
+                error = {"ok": False, "error": str(e)}
+                if interactive:
+                    print(json.dumps(error, indent=2))
+                else:
+                    sent.append(error)
+                continue
+            if not interactive:
+                while in_flight >= SESSION_WINDOW:
+                    print_oldest()
+                sent.append(client.send(request))
+                in_flight += 1
+                continue
+            for message in client.query_stream(request):
+                if "line" in message:
+                    print(message["line"], flush=True)
+                else:
+                    print(json.dumps(message, indent=2))
+
+        while sent:
+            print_oldest()
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    cmd = sys.argv[1]
+
+    if cmd == "daemon":
+        # Start the daemon directly
+        from dfclient.daemon import DFDaemon
+        daemon = DFDaemon()
+        daemon.run()
+        return
+
+    try:
+        if cmd == "session":
+            run_session()
+            return
+        request = build_request(sys.argv[1:])
+        if request.get("stream"):
+            for message in query_stream(request):
+                if "line" in message:
+                    print(message["line"], flush=True)
+                else:
+                    print(json.dumps(message, indent=2))
+            return
+        response = query(request)
+        print(json.dumps(response, indent=2))
+    except UsageError as e:
+        print(e)
+        sys.exit(1)
+    except ConnectionRefusedError:
+        print('{"ok": false, "error": "Daemon not running. Start with: uv run python scripts/daemon.py"}')
+        sys.exit(1)
+    except Exception as e:
+        print(f'{{"ok": false, "error": "{e}"}}')
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,69 +1,61 @@
-#!/usr/bin/env python3
-"""Detect hostile units/threats as JSON."""
-
-import json
-import sys
-sys.path.insert(0, "src")
-
-from dfclient.client import DFClient, _parse_protobuf, _get_int, _get_string, _get_profession_name
-
-
-def main():
-    with DFClient() as client:
-        raw_units = client._get_raw_unit_list()
-
-        threats = []
-        for u in raw_units:
-            flags1 = _get_int(u, 8)
-            flags2 = _get_int(u, 9)
-
-            # Check threat flags
-            is_dead = bool(flags1 & 0x2)
-            is_active_invader = bool(flags1 & 0x80000)
-            is_hidden_ambusher = bool(flags1 & 0x40000)
-            is_invader_origin = bool(flags2 & 0x1)
-
-            # Skip dead units and non-threats
-            if is_dead:
-                continue
-            if not (is_active_invader or is_hidden_ambusher or is_invader_origin):
-                continue
-
-            unit_id = _get_int(u, 1)
-            name = _get_string(u, 13, "Unknown")
-            race_id = _get_int(u, 5)
-            pos_y = _get_int(u, 3)
-            pos_z = _get_int(u, 4)
-
-            # Get profession
-            prof_data = u.get(16)
-            prof_id = 0
-            if isinstance(prof_data, bytes):
-                pf = _parse_protobuf(prof_data)
-                prof_id = _get_int(pf, 3)
-
-            threat_type = []
-            if is_active_invader:
-                threat_type.append("active_invader")
-            if is_hidden_ambusher:
-                threat_type.append("hidden_ambusher")
-            if is_invader_origin:
-                threat_type.append("invader_origin")
-
-            threats.append({
-                "id": unit_id,
-                "name": name,
-                "race_id": race_id,
-                "profession": _get_profession_name(prof_id),
-                "position": {"y": pos_y, "z": pos_z},
-                "threat_type": threat_type,
-            })
-
-        print(json.dumps({
-            "threat_count": len(threats),
-            "threats": threats
-        }, indent=2))
-
-
-if __name__ == "__main__":
-    main()
+#!/usr/bin/env python3
+"""Detect hostile units/threats as JSON.
+
+Reads the daemon's state file when it is fresh, otherwise asks DFHack;
+--live always asks DFHack.
+"""
+
+import json
+import sys
+sys.path.insert(0, "src")
+
+from dfclient.client import DFClient, _decode_text
+from dfclient.shm import read_fortress_state
+from dfclient.units import FLAG1_ACTIVE_INVADER, FLAG1_HIDDEN_AMBUSHER, FLAG2_INVADER_ORIGIN
+
+
+def find_threats(units, raws):
+    """Threat entries for the living invaders in a unit table; raws names their races."""
+    threats = []
+    # Living units with any threat flag
+    for row in units.rows(units.alive() & units.invader()):
+        flags1 = int(units.flags1[row])
+        flags2 = int(units.flags2[row])
+
+        threat_type = []
+        if flags1 & FLAG1_ACTIVE_INVADER:
+            threat_type.append("active_invader")
+        if flags1 & FLAG1_HIDDEN_AMBUSHER:
+            threat_type.append("hidden_ambusher")
+        if flags2 & FLAG2_INVADER_ORIGIN:
+            threat_type.append("invader_origin")
+
+        _, pos_y, pos_z = units.pos[row].tolist()
+        threats.append({
+            "id": int(units.id[row]),
+            "name": _decode_text(units.names[row], "Unknown"),
+            "race_id": int(units.race[row]),
+            "race": raws.creature(int(units.race[row])),
+            "profession": units.professions.name(int(units.profession_id[row])),
+            "position": {"y": pos_y, "z": pos_z},
+            "threat_type": threat_type,
+        })
+    return threats
+
+
+def main():
+    state = None if "--live" in sys.argv else read_fortress_state()
+    if state is not None:
+        threats = find_threats(state.units, state)
+    else:
+        with DFClient() as client:
+            threats = find_threats(client.get_unit_table(), client.get_raws())
+
+    print(json.dumps({
+        "threat_count": len(threats),
+        "threats": threats
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
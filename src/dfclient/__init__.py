@@ -1,15 +1,33 @@
-"""DFHack RemoteFortressReader client for Dwarf Fortress."""
-
-from dfclient.models import (
-    Unit,
-    MapInfo,
-    GameState,
-)
-from dfclient.client import DFClient
-
-__all__ = [
-    "DFClient",
-    "Unit",
-    "MapInfo",
-    "GameState",
-]
+"""DFHack RemoteFortressReader client for Dwarf Fortress."""
+
+from dfclient.models import (
+    Unit,
+    MapInfo,
+    GameState,
+)
+from dfclient.client import DFClient
+from dfclient.async_client import AsyncDFClient
+from dfclient.enums import EnumTable, GameEnums
+from dfclient.mapcache import MapCache, MapRegion
+from dfclient.raws import MaterialTable, TiletypeTable, WorldRaws
+from dfclient.shm import FortressState, StateReader, read_fortress_state
+from dfclient.units import UnitTable
+
+__all__ = [
+    "DFClient",
+    "AsyncDFClient",
+    "UnitTable",
+    "MapCache",
+    "MapRegion",
+    "TiletypeTable",
+    "MaterialTable",
+    "WorldRaws",
+    "GameEnums",
+    "EnumTable",
+    "FortressState",
+    "StateReader",
+    "read_fortress_state",
+    "Unit",
+    "MapInfo",
+    "GameState",
+]
@@ -0,0 +1,147 @@
+"""Python wrappers for the dfclient.actions Lua library."""
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from dfclient.client import DFClient
+
+
+# Lua module holding the actions (src/dfclient/lua/actions.lua)
+ACTIONS_MODULE = "dfclient.actions"
+
+
+class DFActions:
+    """The Lua patterns from ``actions/*.lua`` as parameterized calls.
+
+    Available as ``DFClient.actions``. Each method runs one function of the
+    ``dfclient.actions`` Lua module, which is loaded into DFHack once and
+    reloaded only when its content changes, so a call sends just the
+    function name and its arguments.
+    """
+
+    def __init__(self, client: "DFClient"):
+        self._client = client
+
+    def _call(self, function: str, *args: Any) -> Any:
+        return self._client.call_lua(ACTIONS_MODULE, function, args)
+
+    # Citizens
+
+    def citizens(self) -> list[dict[str, Any]]:
+        """Citizens with id, name, profession, stress and current job."""
+        return self._call("citizens") or []
+
+    def find_citizens(self, fragment: str) -> list[dict[str, Any]]:
+        """Citizens (id, name) whose name contains ``fragment``, ignoring case."""
+        return self._call("find_citizens", fragment) or []
+
+    def unit_skills(self, unit_id: int) -> dict[str, int]:
+        """Skill name -> rating for a unit's trained skills."""
+        return self._call("unit_skills", unit_id) or {}
+
+    def unit_needs(self, unit_id: int) -> dict[str, int]:
+        """Need name -> focus level for a unit's unmet needs."""
+        return self._call("unit_needs", unit_id) or {}
+
+    def unit_emotions(self, unit_id: int) -> list[dict[str, Any]]:
+        """A unit's current emotions (type, strength), oldest first."""
+        return self._call("unit_emotions", unit_id) or []
+
+    # Needs and physical state
+
+    def unit_condition(self, unit_id: int) -> dict[str, Any]:
+        """Hunger/thirst/sleep timers, stress, latest emotion, wounds and blood."""
+        return self._call("unit_condition", unit_id)
+
+    def satisfy_needs(self) -> int:
+        """Reset hunger, thirst and sleepiness of all citizens; returns the count."""
+        return self._call("satisfy_needs")
+
+    # Labors
+
+    def unit_labors(self, unit_id: int) -> list[str]:
+        """Names of the labors enabled for a unit."""
+        return self._call("unit_labors", unit_id) or []
+
+    def set_labors(self, unit_id: int, labors: list[str], enabled: bool = True) -> int:
+        """Enable or disable labors (e.g. ["MINE"]); returns how many changed."""
+        return self._call("set_labors", unit_id, labors, enabled)
+
+    def only_labor(self, unit_id: int, labor: str) -> None:
+        """Disable every labor of a unit except ``labor``."""
+        self._call("only_labor", unit_id, labor)
+
+    # Digging and jobs
+
+    def dig_area(self, x1: int, y1: int, x2: int, y2: int, z: int,
+                 designation: str = "Default") -> int:
+        """Designate a rectangle for digging and create the jobs.
+
+        ``designation`` is a tile_dig_designation name: Default (mine),
+        UpDownStair, Channel, Ramp, DownStair, UpStair or No (clear).
+        Returns the number of tiles designated.
+        """
+        return self._call("dig_area", x1, y1, x2, y2, z, designation)
+
+    def jobs(self) -> list[dict[str, Any]]:
+        """All jobs with id, type, position and worker name."""
+        return self._call("jobs") or []
+
+    def assign_job(self, job_type: str, unit_id: int) -> int | None:
+        """Assign a unit to the first job of ``job_type``; returns the job id."""
+        return self._call("assign_job", job_type, unit_id)
+
+    def add_workshop_job(self, workshop_id: int, job_type: str, vector: str | None = None) -> int:
+        """Queue a job (e.g. "MakeBarrel") at a workshop; returns the job id.
+
+        ``vector`` is an optional job_item_vector_id name (e.g. "WOOD") used
+        as the job's material filter.
+        """
+        return self._call("add_workshop_job", workshop_id, job_type, vector)
+
+    # Buildings
+
+    def buildings(self) -> list[dict[str, Any]]:
+        """All buildings with id, type and center position."""
+        return self._call("buildings") or []
+
+    def building_at(self, x: int, y: int, z: int) -> int | None:
+        """Id of the building covering a tile, if any."""
+        return self._call("building_at", x, y, z)
+
+    def place_workshop(self, workshop_type: str, x: int, y: int, z: int,
+                       instant: bool = False) -> int:
+        """Place a 3x3 workshop (workshop_type name, e.g. "Still").
+
+        Dwarves build it unless ``instant`` is set. Returns the building id.
+        """
+        return self._call("place_workshop", workshop_type, x, y, z, instant)
+
+    # Threats and military
+
+    def hostiles(self) -> list[dict[str, Any]]:
+        """Hostile units with id, race and position."""
+        raws = self._client.get_raws()
+        hostiles = self._call("hostiles") or []
+        for hostile in hostiles:
+            hostile["race"] = raws.creature(hostile["race"])
+        return hostiles
+
+    def hostile_counts(self) -> dict[str, int]:
+        """Race -> number of hostile units."""
+        raws = self._client.get_raws()
+        return {raws.creature(race): count for race, count in self._call("hostile_counts") or []}
+
+    def squads(self) -> list[dict[str, Any]]:
+        """Fortress squads with id, name and member names."""
+        return self._call("squads") or []
+
+    # World
+
+    def world_info(self) -> dict[str, Any]:
+        """Date, site name, weather, camera position and citizen count."""
+        return self._call("world_info")
+
+    def announcements(self, count: int = 10, reports: bool = False) -> list[str]:
+        """Newest ``count`` announcements (or combat reports), newest first."""
+        return self._call("announcements", count, reports) or []
@@ -0,0 +1,363 @@
+"""High-level asyncio DFHack client API."""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Sequence
+
+from dfclient.async_connection import AsyncDFHackConnection
+from dfclient.client import (
+    _LUA_RPC_MODULE,
+    _LUA_VERSION_CALL,
+    _RAWS_KEY_METHODS,
+    _RAWS_METHODS,
+    _RFR_METHODS,
+    _SUMMARY_METHODS,
+    _UNIT_LIST_METHODS,
+    _UnitSnapshot,
+    _build_all_units,
+    _build_citizens,
+    _build_summary,
+    _decode_clock,
+    _decode_lua_reply,
+    _decode_map_info,
+    _decode_unit_detail,
+    _decode_pause_state,
+    _decode_unit_list,
+    _decode_units,
+    _decode_version_info,
+    _decode_view_info,
+    _encode_pause_state,
+    _encode_run_command,
+    _lua_install_call,
+    _lua_rpc_call,
+    _lua_sources,
+    _raws_cache_file,
+    _save_raws,
+)
+from dfclient.connection import CORE_RUN_COMMAND, _MethodIds, _decode_string_list
+from dfclient.enums import GAME_ENUMS, GameEnums
+from dfclient.models import (
+    CacheStats,
+    ConnectionStatus,
+    FortressSummary,
+    MapInfo,
+    UnitBrief,
+    UnitDetail,
+    ViewInfo,
+)
+from dfclient.raws import RAWS_CACHE_DIR, MaterialTable, TiletypeTable, WorldRaws
+from dfclient.units import CitizenExport, UnitTable
+
+
+class AsyncDFClient:
+    """Asyncio counterpart of DFClient.
+
+    Every method that talks to DFHack is a coroutine with the same name
+    and result as on DFClient; calls accept a ``timeout`` deadline instead
+    of touching the socket's timeout, and can be issued concurrently from
+    one event loop. The unit snapshot and raws caches work as on DFClient.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 5000, timeout: float = 30.0,
+                 snapshot_max_age: float | None = 0.0,
+                 raws_cache_dir: Path | None = RAWS_CACHE_DIR):
+        self.host = host
+        self.port = port
+        self.snapshot_max_age = snapshot_max_age
+        self.raws_cache_dir = raws_cache_dir
+        self._conn = AsyncDFHackConnection(host, port, timeout)
+        self._method_ids = _MethodIds()
+        self._lua_modules: set[str] = set()
+        self._snapshot_lock = asyncio.Lock()
+        self._snapshot = _UnitSnapshot()
+        self._raws: WorldRaws | None = None
+        self._enums: GameEnums | None = None
+
+    async def connect(self) -> ConnectionStatus:
+        """Connect to DFHack."""
+        self._method_ids.clear()
+        self._lua_modules.clear()
+        self._raws = None
+        self._enums = None
+        return await self._conn.connect()
+
+    async def disconnect(self) -> None:
+        """Disconnect from DFHack."""
+        await self._conn.disconnect()
+
+    async def _bind_method(self, method: str, input_msg: str, output_msg: str, plugin: str = "") -> int:
+        """Bind a method and return its assigned ID."""
+        return (await self._bind_methods([(method, input_msg, output_msg)], plugin))[0]
+
+    async def _bind_methods(self, methods: list[tuple[str, str, str]], plugin: str = "") -> list[int]:
+        """Bind several methods, pipelining the ones not already cached."""
+        unbound = self._method_ids.unbound(methods, plugin)
+        if unbound:
+            replies = await self._conn.call_many(self._method_ids.requests(unbound, plugin))
+            self._method_ids.store(unbound, replies, plugin)
+        return self._method_ids.ids(methods, plugin)
+
+    async def _call_rfr(self, method: str, request: bytes = b"",
+                        timeout: float | None = None) -> bytes:
+        """Bind (if needed) and call a RemoteFortressReader method."""
+        input_msg, output_msg = _RFR_METHODS[method]
+        method_id = await self._bind_method(
+            method, input_msg, output_msg, plugin="RemoteFortressReader"
+        )
+        return await self._conn.call(method_id, request, timeout=timeout)
+
+    async def _call_rfr_many(self, methods: Sequence[str], timeout: float | None = None) -> list[bytes]:
+        """Call argument-less RemoteFortressReader methods in one round trip."""
+        method_ids = await self._bind_methods(
+            [(m, *_RFR_METHODS[m]) for m in methods], plugin="RemoteFortressReader"
+        )
+        return await self._conn.call_many(
+            [(method_id, b"") for method_id in method_ids], timeout=timeout
+        )
+
+    async def run_command(self, command: str, timeout: float | None = None) -> list[str]:
+        """
+        Run a DFHack console command.
+
+        Args:
+            command: The command to run (e.g., "ls", "kill-unit 123")
+            timeout: Optional deadline (some commands don't return results)
+
+        Returns:
+            List of output lines
+        """
+        output_lines: list[str] = []
+
+        def collect_output(text: str) -> None:
+            output_lines.extend(text.splitlines())
+
+        request = _encode_run_command(command)
+
+        # Some commands (like clean, prospect) don't return a RESULT.
+        # A missed deadline is accepted as success for those; the late reply
+        # is discarded by the connection instead of leaking into the next call.
+        try:
+            await self._conn.call(
+                CORE_RUN_COMMAND, request, text_callback=collect_output, timeout=timeout
+            )
+        except TimeoutError:
+            pass
+
+        return output_lines
+
+    async def _install_lua(self) -> None:
+        """Load the bundled Lua modules unless DFHack already has this version."""
+        try:
+            installed = _decode_string_list(await self._conn.call(*_LUA_VERSION_CALL))
+        except OSError:
+            raise
+        except Exception:
+            installed = []
+        install = _lua_install_call(installed)
+        if install is not None:
+            await self._conn.call(*install)
+        self._lua_modules.update(_lua_sources())
+
+    async def call_lua(
+        self,
+        module: str,
+        function: str,
+        args: Sequence[Any] = (),
+        timeout: float | None = None,
+    ) -> Any:
+        """Call a Lua function inside DFHack with JSON-typed arguments and result."""
+        if _LUA_RPC_MODULE not in self._lua_modules:
+            await self._install_lua()
+        reply = await self._conn.call(*_lua_rpc_call(module, function, args), timeout=timeout)
+        return _decode_lua_reply(module, function, reply)
+
+    async def send_command(self, command: str) -> None:
+        """Send a DFHack console command without waiting for it to finish."""
+        await self._conn.post(CORE_RUN_COMMAND, _encode_run_command(command))
+
+    async def get_pause_state(self, timeout: float | None = None) -> bool:
+        """Get whether the game is currently paused."""
+        reply = await self._call_rfr("GetPauseState", timeout=timeout)
+        return _decode_pause_state(reply)
+
+    async def set_pause_state(self, paused: bool, timeout: float | None = None) -> None:
+        """Set the game pause state."""
+        await self._call_rfr("SetPauseState", _encode_pause_state(paused), timeout=timeout)
+
+    async def pause(self) -> None:
+        """Pause the game."""
+        await self.set_pause_state(True)
+
+    async def unpause(self) -> None:
+        """Unpause the game."""
+        await self.set_pause_state(False)
+
+    async def get_version_info(self, timeout: float | None = None) -> dict[str, str]:
+        """Get DFHack and DF version information."""
+        reply = await self._call_rfr("GetVersionInfo", timeout=timeout)
+        return _decode_version_info(reply)
+
+    async def get_map_info(self, timeout: float | None = None) -> MapInfo:
+        """Get map dimensions and world name."""
+        reply = await self._call_rfr("GetMapInfo", timeout=timeout)
+        return _decode_map_info(reply)
+
+    async def get_view_info(self, timeout: float | None = None) -> ViewInfo:
+        """Get current camera/cursor position."""
+        reply = await self._call_rfr("GetViewInfo", timeout=timeout)
+        return _decode_view_info(reply)
+
+    async def get_raws(self, timeout: float | None = None) -> WorldRaws:
+        """Get creature, plant, material and tiletype raws of the loaded world."""
+        if self._raws is not None:
+            return self._raws
+
+        path = None
+        if self.raws_cache_dir is not None:
+            path = _raws_cache_file(
+                self.raws_cache_dir, *await self._call_rfr_many(_RAWS_KEY_METHODS, timeout)
+            )
+            if path is not None:
+                self._raws = WorldRaws.load(path)
+
+        if self._raws is None:
+            self._raws = WorldRaws.from_replies(*await self._call_rfr_many(_RAWS_METHODS, timeout))
+            _save_raws(self._raws, path)
+        return self._raws
+
+    async def get_enums(self, timeout: float | None = None) -> GameEnums:
+        """Get the game's enum tables (professions, job types, skills, ...)."""
+        if self._enums is None:
+            self._enums = GameEnums(
+                await self.call_lua("dfclient.enums", "tables", [list(GAME_ENUMS)], timeout=timeout)
+            )
+        return self._enums
+
+    async def get_tiletypes(self, timeout: float | None = None) -> TiletypeTable:
+        """Get the shape/material/special lookup arrays of every tiletype."""
+        return (await self.get_raws(timeout)).tiletypes
+
+    async def get_materials(self, timeout: float | None = None) -> MaterialTable:
+        """Get every material of the world, for looking up tile materials."""
+        return (await self.get_raws(timeout)).materials
+
+    async def _get_raw_unit_list(self, timeout: float | None = None) -> list[dict[int, Any]]:
+        """Get raw unit list data (internal)."""
+        reply = await self._call_rfr("GetUnitList", timeout=timeout)
+        return _decode_unit_list(reply)
+
+    async def _get_units(self, timeout: float | None = None) -> Sequence[Any]:
+        """Get the unit list as decoded UnitDefinition messages (internal)."""
+        return _decode_units(await self._call_rfr("GetUnitList", timeout=timeout))
+
+    async def _clock_call(self) -> tuple[int, bytes]:
+        """The game clock read as a call_many entry (internal)."""
+        if _LUA_RPC_MODULE not in self._lua_modules:
+            await self._install_lua()
+        return _lua_rpc_call("dfclient.snapshot", "clock")
+
+    async def _store_snapshot(self, clock: tuple[int, int, bool], units_reply: bytes | None = None,
+                              timeout: float | None = None) -> UnitTable:
+        """Keep the snapshot if it was taken at clock, else replace it (internal).
+
+        Called with _snapshot_lock held; units_reply, if given, is a unit
+        list read together with clock and always replaces the snapshot.
+        """
+        read_at = time.monotonic()
+        if units_reply is None:
+            table = self._snapshot.revalidate(clock)
+            if table is not None:
+                return table
+            units_reply = await self._call_rfr("GetUnitList", timeout=timeout)
+        professions = (await self.get_enums(timeout)).profession
+        return self._snapshot.store(clock, units_reply, professions, read_at)
+
+    async def get_unit_table(self, timeout: float | None = None) -> UnitTable:
+        """Get every unit as a columnar UnitTable (flags, ids, professions, ...)."""
+        if self.snapshot_max_age is None:
+            professions = (await self.get_enums(timeout)).profession
+            return UnitTable.from_units(await self._get_units(timeout), professions)
+
+        # Held while fetching, so concurrent callers wait for one fetch
+        async with self._snapshot_lock:
+            if self._snapshot.table is None:
+                # Nothing to revalidate: read the clock and the units together
+                (units_id,) = await self._bind_methods(_UNIT_LIST_METHODS, plugin="RemoteFortressReader")
+                clock_reply, units_reply = await self._conn.call_many(
+                    [await self._clock_call(), (units_id, b"")], timeout=timeout
+                )
+                return await self._store_snapshot(_decode_clock(clock_reply), units_reply, timeout)
+            table = self._snapshot.fresh(self.snapshot_max_age)
+            if table is not None:
+                return table
+            clock_reply = await self._conn.call(*await self._clock_call(), timeout=timeout)
+            return await self._store_snapshot(_decode_clock(clock_reply), timeout=timeout)
+
+    def invalidate_unit_cache(self) -> None:
+        """Drop the cached unit snapshot, e.g. after changing units while paused."""
+        self._snapshot.clear()
+
+    def get_cache_stats(self) -> CacheStats:
+        """Hit/miss counters of the unit snapshot cache."""
+        return self._snapshot.stats.model_copy()
+
+    async def get_all_units(self, timeout: float | None = None) -> list[UnitBrief]:
+        """Get all units as brief summaries."""
+        return _build_all_units(await self.get_unit_table(timeout))
+
+    async def get_citizens(self, timeout: float | None = None) -> list[UnitBrief]:
+        """Get fortress citizens only (living dwarves)."""
+        return _build_citizens(await self.get_unit_table(timeout))
+
+    async def get_idle_citizens(self, timeout: float | None = None) -> list[UnitBrief]:
+        """Get idle citizens only."""
+        return [u for u in await self.get_citizens(timeout) if u.is_idle]
+
+    async def get_unit(self, unit_id: int, timeout: float | None = None) -> UnitDetail | None:
+        """Get detailed info for a specific unit."""
+        return _decode_unit_detail(
+            await self.call_lua("dfclient.units", "detail", [unit_id], timeout=timeout),
+            await self.get_raws(timeout),
+        )
+
+    async def export_citizens(self, timeout: float | None = None) -> CitizenExport:
+        """Get every citizen's skills matrix, labor bitmap and current job."""
+        return CitizenExport(
+            await self.call_lua("dfclient.units", "export_citizens", timeout=timeout)
+        )
+
+    async def get_summary(self, timeout: float | None = None) -> FortressSummary:
+        """Get high-level fortress summary - minimal context cost."""
+        cached = self.snapshot_max_age is not None
+        map_id, pause_id, units_id = await self._bind_methods(
+            _SUMMARY_METHODS, plugin="RemoteFortressReader"
+        )
+        calls = [(map_id, b""), (pause_id, b"")]
+        if cached:
+            calls.append(await self._clock_call())
+        if not cached or self._snapshot.table is None:
+            calls.append((units_id, b""))
+        replies = await self._conn.call_many(calls, timeout=timeout)
+
+        if not cached:
+            professions = (await self.get_enums(timeout)).profession
+            table = UnitTable.from_units(_decode_units(replies[2]), professions)
+        else:
+            async with self._snapshot_lock:
+                units_reply = replies[3] if len(replies) > 3 else None
+                table = None if units_reply is not None else self._snapshot.fresh(self.snapshot_max_age)
+                if table is None:
+                    table = await self._store_snapshot(_decode_clock(replies[2]), units_reply, timeout)
+        return _build_summary(
+            _decode_map_info(replies[0]),
+            _decode_pause_state(replies[1]),
+            table,
+        )
+
+    async def __aenter__(self) -> "AsyncDFClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.disconnect()
@@ -0,0 +1,278 @@
+"""Asyncio TCP connection and RPC protocol for DFHack."""
+
+import asyncio
+import socket
+import struct
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable
+
+from dfclient.connection import (
+    DFHACK_MAGIC_REQUEST,
+    DFHACK_MAGIC_RESPONSE,
+    DFHACK_VERSION,
+    RPC_REPLY_FAIL,
+    RPC_REPLY_RESULT,
+    RPC_REPLY_TEXT,
+    RPC_REQUEST_QUIT,
+    _HEADER,
+    _decode_text_message,
+)
+from dfclient.models import ConnectionStatus
+
+
+@dataclass
+class _PendingCall:
+    """A request that has been written and is waiting for its reply."""
+    future: asyncio.Future
+    text_callback: Callable[[str], None] | None = None
+    abandoned: bool = False
+
+
+class AsyncDFHackConnection:
+    """Asyncio connection to DFHack RPC server.
+
+    A single reader task owns the stream and hands each reply to the oldest
+    outstanding call (DFHack answers requests on a connection in order).
+    A call that misses its deadline stays queued, so its late RESULT is read
+    and discarded instead of being mistaken for the next call's reply.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 5000, timeout: float = 30.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._read_task: asyncio.Task | None = None
+        self._pending: deque[_PendingCall] = deque()
+        self._connected = False
+        self._dfhack_version: str = ""
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    async def connect(self) -> ConnectionStatus:
+        """Connect to DFHack and perform handshake."""
+        try:
+            async with asyncio.timeout(self.timeout):
+                self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+                sock = self._writer.get_extra_info("socket")
+                if sock is not None:
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+                # Send handshake
+                self._writer.write(DFHACK_MAGIC_REQUEST + struct.pack("<I", DFHACK_VERSION))
+                await self._writer.drain()
+
+                # Read response
+                response_magic = await self._reader.readexactly(len(DFHACK_MAGIC_RESPONSE))
+                if response_magic != DFHACK_MAGIC_RESPONSE:
+                    raise ConnectionError(f"Invalid magic: {response_magic!r}")
+
+                version_data = await self._reader.readexactly(4)
+                server_version = struct.unpack("<I", version_data)[0]
+                self._dfhack_version = str(server_version)
+
+            self._connected = True
+            self._read_task = asyncio.create_task(self._read_loop())
+            return ConnectionStatus(
+                connected=True,
+                dfhack_version=self._dfhack_version,
+            )
+
+        except Exception as e:
+            self._connected = False
+            self._close_writer()
+            return ConnectionStatus(
+                connected=False,
+                error=str(e) or type(e).__name__,
+            )
+
+    async def disconnect(self) -> None:
+        """Close the connection."""
+        if self._writer:
+            try:
+                # Send quit request
+                self._writer.write(_HEADER.pack(RPC_REQUEST_QUIT, 0))
+                await self._writer.drain()
+            except Exception:
+                pass
+        if self._read_task:
+            self._read_task.cancel()
+            try:
+                await self._read_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._read_task = None
+        self._close_writer()
+        self._fail_pending(ConnectionError("Connection closed"))
+        self._connected = False
+
+    def _close_writer(self) -> None:
+        if self._writer:
+            try:
+                self._writer.close()
+            except Exception:
+                pass
+            self._writer = None
+            self._reader = None
+
+    def _fail_pending(self, error: Exception) -> None:
+        """Fail every outstanding call (connection lost or closed)."""
+        while self._pending:
+            pending = self._pending.popleft()
+            if not pending.future.done() and not pending.abandoned:
+                pending.future.set_exception(error)
+
+    async def _read_loop(self) -> None:
+        """Read reply frames and route them to outstanding calls in order."""
+        try:
+            while True:
+                header = await self._reader.readexactly(_HEADER.size)
+                msg_id, size = _HEADER.unpack(header)
+                data = await self._reader.readexactly(size) if size > 0 else b""
+
+                if not self._pending:
+                    # Nothing is waiting for this frame; drop it
+                    continue
+                pending = self._pending[0]
+
+                if msg_id == RPC_REPLY_TEXT:
+                    # Text message (console output) - protobuf wrapped
+                    if pending.text_callback and not pending.abandoned and data:
+                        text = _decode_text_message(data)
+                        if text:
+                            pending.text_callback(text)
+                    continue
+
+                self._pending.popleft()
+                if pending.abandoned or pending.future.done():
+                    continue
+
+                if msg_id == RPC_REPLY_RESULT:
+                    pending.future.set_result(data)
+                elif msg_id == RPC_REPLY_FAIL:
+                    error_msg = data.decode("utf-8", errors="replace") if data else "Unknown error"
+                    pending.future.set_exception(Exception(f"RPC failed: {error_msg}"))
+                else:
+                    pending.future.set_exception(Exception(f"Unexpected response type: {msg_id}"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._connected = False
+            self._fail_pending(ConnectionError(f"Connection closed: {e}"))
+
+    def _write_request(self, method_id: int, request_data: bytes) -> None:
+        self._writer.write(_HEADER.pack(method_id, len(request_data)) + request_data)
+
+    async def _wait(self, pending: _PendingCall, timeout: float | None) -> bytes:
+        """Wait for a call's reply, abandoning it if the deadline passes."""
+        try:
+            async with asyncio.timeout(self.timeout if timeout is None else timeout):
+                return await asyncio.shield(pending.future)
+        except (TimeoutError, asyncio.CancelledError):
+            pending.abandoned = True
+            raise
+
+    async def call(
+        self,
+        method_id: int,
+        request_data: bytes = b"",
+        text_callback: Callable[[str], None] | None = None,
+        timeout: float | None = None,
+    ) -> bytes:
+        """
+        Call an RPC method and return the response data.
+
+        Args:
+            method_id: The method ID to call
+            request_data: Serialized protobuf request
+            text_callback: Optional callback for text messages (like console output)
+            timeout: Deadline for this call in seconds (default: connection timeout)
+
+        Returns:
+            The response data bytes
+
+        Raises:
+            RPCError: If the call fails
+            TimeoutError: If no reply arrives before the deadline
+        """
+        if not self._connected:
+            raise ConnectionError("Not connected")
+
+        pending = _PendingCall(asyncio.get_running_loop().create_future(), text_callback)
+        self._pending.append(pending)
+        self._write_request(method_id, request_data)
+        await self._writer.drain()
+        return await self._wait(pending, timeout)
+
+    async def post(self, method_id: int, request_data: bytes = b"") -> None:
+        """
+        Send an RPC request without waiting for its reply.
+
+        The reply (and any text output) is read and discarded.
+        """
+        if not self._connected:
+            raise ConnectionError("Not connected")
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(_PendingCall(future, abandoned=True))
+        self._write_request(method_id, request_data)
+        await self._writer.drain()
+
+    async def call_many(
+        self,
+        calls: list[tuple[int, bytes] | tuple[int, bytes, Callable[[str], None] | None]],
+        timeout: float | None = None,
+    ) -> list[bytes]:
+        """
+        Pipeline several RPC calls over a single network round trip.
+
+        Args:
+            calls: (method_id, request_data) or
+                (method_id, request_data, text_callback) tuples
+            timeout: Deadline for the whole batch in seconds
+
+        Returns:
+            The response data bytes, one per call, in request order
+
+        Raises:
+            RPCError: If any call fails (after every reply has arrived)
+        """
+        if not self._connected:
+            raise ConnectionError("Not connected")
+        if not calls:
+            return []
+
+        loop = asyncio.get_running_loop()
+        batch = []
+        for call in calls:
+            pending = _PendingCall(loop.create_future(), call[2] if len(call) > 2 else None)
+            self._pending.append(pending)
+            self._write_request(call[0], call[1])
+            batch.append(pending)
+        await self._writer.drain()
+
+        try:
+            async with asyncio.timeout(self.timeout if timeout is None else timeout):
+                results = await asyncio.shield(
+                    asyncio.gather(*(p.future for p in batch), return_exceptions=True)
+                )
+        except (TimeoutError, asyncio.CancelledError):
+            for pending in batch:
+                pending.abandoned = True
+            raise
+
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return list(results)
+
+    async def __aenter__(self) -> "AsyncDFHackConnection":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.disconnect()
@@ -1,764 +1,1146 @@
-"""High-level DFHack client API."""
-
-import struct
-from typing import Any
-
-from dfclient.connection import DFHackConnection
-from dfclient.models import (
-    ConnectionStatus,
-    FortressSummary,
-    MapInfo,
-    Position,
-    UnitBrief,
-    UnitDetail,
-    UnitFlags,
-    ViewInfo,
-)
-
-
-# Core protocol method IDs (built-in)
-CORE_BIND_METHOD = 0
-CORE_RUN_COMMAND = 1
-CORE_RUN_LUA = 2
-
-# Profession lookup table (from DF profession_type enum)
-PROFESSIONS: dict[int, str] = {
-    0: "NONE",
-    1: "MINER",
-    2: "WOODWORKER",
-    3: "CARPENTER",
-    4: "BOWYER",
-    5: "WOODCUTTER",
-    6: "STONEWORKER",
-    7: "ENGRAVER",
-    8: "MASON",
-    9: "METALSMITH",
-    10: "WEAPONSMITH",
-    11: "ARMORSMITH",
-    12: "BLACKSMITH",
-    13: "METALCRAFTER",
-    14: "JEWELER",
-    15: "GEM_CUTTER",
-    16: "GEM_SETTER",
-    17: "CRAFTSMAN",
-    18: "WOODCRAFTER",
-    19: "STONECRAFTER",
-    20: "LEATHERWORKER",
-    21: "BONE_CARVER",
-    22: "WEAVER",
-    23: "CLOTHIER",
-    24: "GLASSMAKER",
-    25: "POTTER",
-    26: "GLAZER",
-    27: "WAX_WORKER",
-    28: "STRAND_EXTRACTOR",
-    29: "FISHERY_WORKER",
-    30: "FISH_CLEANER",
-    31: "FISH_DISSECTOR",
-    32: "RANGER",
-    33: "ANIMAL_CARETAKER",
-    34: "ANIMAL_TRAINER",
-    35: "HUNTER",
-    36: "TRAPPER",
-    37: "ANIMAL_DISSECTOR",
-    38: "CHEESE_MAKER",
-    39: "MILKER",
-    40: "COOK",
-    41: "THRESHER",
-    42: "MILLER",
-    43: "BUTCHER",
-    44: "TANNER",
-    45: "DYER",
-    46: "PLANTER",
-    47: "HERBALIST",
-    48: "BREWER",
-    49: "SOAP_MAKER",
-    50: "POTASH_MAKER",
-    51: "LYE_MAKER",
-    52: "WOOD_BURNER",
-    53: "SHEARER",
-    54: "SPINNER",
-    55: "PRESSER",
-    56: "BEEKEEPER",
-    57: "ENGINEER",
-    58: "MECHANIC",
-    59: "SIEGE_ENGINEER",
-    60: "SIEGE_OPERATOR",
-    61: "PUMP_OPERATOR",
-    62: "CLERK",
-    63: "ADMINISTRATOR",
-    64: "TRADER",
-    65: "ARCHITECT",
-    66: "ALCHEMIST",
-    67: "DOCTOR",
-    68: "DIAGNOSER",
-    69: "BONE_SETTER",
-    70: "SUTURER",
-    71: "SURGEON",
-    72: "MERCHANT",
-    73: "HAMMERMAN",
-    74: "SPEARMAN",
-    75: "CROSSBOWMAN",
-    76: "WRESTLER",
-    77: "AXEMAN",
-    78: "SWORDSMAN",
-    79: "MACEMAN",
-    80: "PIKEMAN",
-    81: "BOWMAN",
-    82: "BLOWGUNMAN",
-    83: "LASHER",
-    84: "RECRUIT",
-    85: "TRAINED_HUNTER",
-    86: "TRAINED_WAR",
-    87: "MASTER_HAMMERMAN",
-    88: "MASTER_SPEARMAN",
-    89: "MASTER_CROSSBOWMAN",
-    90: "MASTER_WRESTLER",
-    91: "MASTER_AXEMAN",
-    92: "MASTER_SWORDSMAN",
-    93: "MASTER_MACEMAN",
-    94: "MASTER_PIKEMAN",
-    95: "MASTER_BOWMAN",
-    96: "MASTER_BLOWGUNMAN",
-    97: "MASTER_LASHER",
-    98: "ELITE_HAMMERMAN",
-    99: "ELITE_SPEARMAN",
-    100: "ELITE_CROSSBOWMAN",
-    101: "ELITE_WRESTLER",
-    102: "ELITE_AXEMAN",
-    103: "CHILD",
-    104: "BABY",
-    105: "DRUNK",
-    106: "MONSTER_SLAYER",
-    107: "SCOUT",
-    108: "BEAST_HUNTER",
-    109: "SNATCHER",
-    110: "MERCENARY",
-    111: "THIEF",
-    112: "PRISONER",
-    113: "SLAVE",
-    114: "STANDARD",
-    115: "SAGE",
-    116: "SCHOLAR",
-    117: "PHILOSOPHER",
-    118: "MATHEMATICIAN",
-    119: "HISTORIAN",
-    120: "ASTRONOMER",
-    121: "NATURALIST",
-    122: "CHEMIST",
-    123: "GEOGRAPHER",
-    124: "SCRIBE",
-    125: "PERFORMER",
-    126: "POET",
-    127: "BARD",
-    128: "DANCER",
-    129: "CRIMINAL",
-}
-
-
-def _encode_varint(value: int) -> bytes:
-    """Encode an integer as a protobuf varint."""
-    parts = []
-    while value > 127:
-        parts.append((value & 0x7F) | 0x80)
-        value >>= 7
-    parts.append(value)
-    return bytes(parts)
-
-
-def _decode_varint(data: bytes, offset: int = 0) -> tuple[int, int]:
-    """Decode a protobuf varint, return (value, bytes_consumed)."""
-    result = 0
-    shift = 0
-    pos = offset
-    while True:
-        if pos >= len(data):
-            raise ValueError("Truncated varint")
-        byte = data[pos]
-        result |= (byte & 0x7F) << shift
-        pos += 1
-        if not (byte & 0x80):
-            break
-        shift += 7
-    return result, pos - offset
-
-
-def _encode_string(field_num: int, value: str) -> bytes:
-    """Encode a string field in protobuf format."""
-    encoded = value.encode("utf-8")
-    tag = (field_num << 3) | 2  # wire type 2 = length-delimited
-    return _encode_varint(tag) + _encode_varint(len(encoded)) + encoded
-
-
-def _encode_bind_request(method: str, input_msg: str, output_msg: str, plugin: str = "") -> bytes:
-    """Encode a CoreBindRequest protobuf message."""
-    # Fields: method (1), input_msg (2), output_msg (3), plugin (4)
-    data = _encode_string(1, method)
-    data += _encode_string(2, input_msg)
-    data += _encode_string(3, output_msg)
-    if plugin:
-        data += _encode_string(4, plugin)
-    return data
-
-
-def _decode_bind_reply(data: bytes) -> int:
-    """Decode a CoreBindReply to get the assigned method ID."""
-    # Field 1 is assigned_id (int32)
-    pos = 0
-    while pos < len(data):
-        tag, consumed = _decode_varint(data, pos)
-        pos += consumed
-        field_num = tag >> 3
-        wire_type = tag & 0x7
-
-        if field_num == 1 and wire_type == 0:  # varint
-            value, consumed = _decode_varint(data, pos)
-            # Handle signed int32 (zigzag would be different, but this is regular int32)
-            if value > 0x7FFFFFFF:
-                value -= 0x100000000
-            return value
-        elif wire_type == 0:
-            _, consumed = _decode_varint(data, pos)
-            pos += consumed
-        elif wire_type == 2:
-            length, consumed = _decode_varint(data, pos)
-            pos += consumed + length
-        else:
-            raise ValueError(f"Unknown wire type {wire_type}")
-
-    raise ValueError("assigned_id not found in reply")
-
-
-def _parse_protobuf(data: bytes) -> dict[int, Any]:
-    """Parse protobuf bytes into field_num -> value dict.
-
-    Returns dict where:
-    - Varint fields (wire type 0) -> int
-    - Length-delimited fields (wire type 2) -> bytes (for strings/submessages)
-    - Repeated fields -> list of values
-    """
-    result: dict[int, Any] = {}
-    pos = 0
-
-    while pos < len(data):
-        tag, consumed = _decode_varint(data, pos)
-        pos += consumed
-        field_num = tag >> 3
-        wire_type = tag & 0x7
-
-        if wire_type == 0:  # varint
-            value, consumed = _decode_varint(data, pos)
-            pos += consumed
-        elif wire_type == 2:  # length-delimited
-            length, consumed = _decode_varint(data, pos)
-            pos += consumed
-            value = data[pos:pos + length]
-            pos += length
-        elif wire_type == 5:  # 32-bit fixed
-            value = struct.unpack("<I", data[pos:pos+4])[0]
-            pos += 4
-        elif wire_type == 1:  # 64-bit fixed
-            value = struct.unpack("<Q", data[pos:pos+8])[0]
-            pos += 8
-        else:
-            raise ValueError(f"Unknown wire type {wire_type}")
-
-        # Handle repeated fields
-        if field_num in result:
-            if not isinstance(result[field_num], list):
-                result[field_num] = [result[field_num]]
-            result[field_num].append(value)
-        else:
-            result[field_num] = value
-
-    return result
-
-
-def _get_string(fields: dict[int, Any], field_num: int, default: str = "") -> str:
-    """Get a string field from parsed protobuf."""
-    if field_num not in fields:
-        return default
-    val = fields[field_num]
-    if isinstance(val, bytes):
-        # Try to decode as string first
-        try:
-            decoded = val.decode("utf-8", errors="replace")
-            if decoded.isprintable() and len(decoded) > 0:
-                return decoded
-        except:
-            pass
-        # Might be a submessage - try to parse and look for string in field 10
-        try:
-            subfields = _parse_protobuf(val)
-            if 10 in subfields and isinstance(subfields[10], bytes):
-                return subfields[10].decode("utf-8", errors="replace")
-        except:
-            pass
-    return default
-
-
-def _get_int(fields: dict[int, Any], field_num: int, default: int = 0) -> int:
-    """Get an int field from parsed protobuf."""
-    return fields.get(field_num, default)
-
-
-def _get_profession_name(prof_id: int) -> str:
-    """Get human-readable profession name."""
-    return PROFESSIONS.get(prof_id, f"UNKNOWN_{prof_id}")
-
-
-class DFClient:
-    """High-level client for interacting with Dwarf Fortress via DFHack."""
-
-    def __init__(self, host: str = "127.0.0.1", port: int = 5000):
-        self.host = host
-        self.port = port
-        self._conn = DFHackConnection(host, port)
-        self._method_ids: dict[str, int] = {}
-
-    def connect(self) -> ConnectionStatus:
-        """Connect to DFHack."""
-        return self._conn.connect()
-
-    def disconnect(self) -> None:
-        """Disconnect from DFHack."""
-        self._conn.disconnect()
-
-    def _bind_method(self, method: str, input_msg: str, output_msg: str, plugin: str = "") -> int:
-        """Bind a method and return its assigned ID."""
-        cache_key = f"{plugin}:{method}"
-        if cache_key in self._method_ids:
-            return self._method_ids[cache_key]
-
-        request = _encode_bind_request(method, input_msg, output_msg, plugin)
-        reply = self._conn.call(CORE_BIND_METHOD, request)
-        method_id = _decode_bind_reply(reply)
-        self._method_ids[cache_key] = method_id
-        return method_id
-
-    def run_command(self, command: str, timeout: float | None = None) -> list[str]:
-        """
-        Run a DFHack console command.
-
-        Args:
-            command: The command to run (e.g., "ls", "kill-unit 123")
-            timeout: Optional timeout override (some commands don't return results)
-
-        Returns:
-            List of output lines
-        """
-        output_lines: list[str] = []
-
-        def collect_output(text: str) -> None:
-            output_lines.extend(text.splitlines())
-
-        # Parse command into name and arguments
-        # CoreRunCommandRequest: command (1) = string, arguments (2) = repeated string
-        import shlex
-
-        # Special case: "lua" command - pass entire code as single argument
-        if command.startswith("lua "):
-            cmd_name = "lua"
-            cmd_args = [command[4:]]  # Everything after "lua "
-        else:
-            try:
-                parts = shlex.split(command)
-            except ValueError:
-                parts = command.split()
-            cmd_name = parts[0] if parts else command
-            cmd_args = parts[1:] if len(parts) > 1 else []
-
-        # Encode: field 1 = command name, field 2 (repeated) = arguments
-        request = _encode_string(1, cmd_name)
-        for arg in cmd_args:
-            request += _encode_string(2, arg)
-
-        # Some commands (like clean, prospect) don't return a RESULT
-        # Use shorter timeout and accept timeout as success for those
-        old_timeout = self._conn._socket.gettimeout() if self._conn._socket else 30.0
-        if timeout is not None and self._conn._socket:
-            self._conn._socket.settimeout(timeout)
-
-        try:
-            self._conn.call(CORE_RUN_COMMAND, request, text_callback=collect_output)
-        except TimeoutError:
-            # For fire-and-forget commands, timeout is acceptable
-            pass
-        finally:
-            if self._conn._socket:
-                self._conn._socket.settimeout(old_timeout)
-
-        return output_lines
-
-    def get_pause_state(self) -> bool:
-        """Get whether the game is currently paused."""
-        method_id = self._bind_method(
-            "GetPauseState",
-            "dfproto.EmptyMessage",
-            "RemoteFortressReader.SingleBool",
-            plugin="RemoteFortressReader",
-        )
-
-        reply = self._conn.call(method_id, b"")
-        # SingleBool: value (1) = bool (varint)
-        if reply:
-            value, _ = _decode_varint(reply, 0)
-            # Skip tag byte(s) to get to the value
-            pos = 0
-            while pos < len(reply):
-                tag, consumed = _decode_varint(reply, pos)
-                pos += consumed
-                field_num = tag >> 3
-                wire_type = tag & 0x7
-                if field_num == 1 and wire_type == 0:
-                    value, _ = _decode_varint(reply, pos)
-                    return bool(value)
-                elif wire_type == 0:
-                    _, consumed = _decode_varint(reply, pos)
-                    pos += consumed
-        return False
-
-    def set_pause_state(self, paused: bool) -> None:
-        """Set the game pause state."""
-        method_id = self._bind_method(
-            "SetPauseState",
-            "RemoteFortressReader.SingleBool",
-            "dfproto.EmptyMessage",
-            plugin="RemoteFortressReader",
-        )
-
-        # SingleBool: value (1) = bool
-        tag = (1 << 3) | 0  # field 1, varint
-        request = _encode_varint(tag) + _encode_varint(1 if paused else 0)
-
-        self._conn.call(method_id, request)
-
-    def pause(self) -> None:
-        """Pause the game."""
-        self.set_pause_state(True)
-
-    def unpause(self) -> None:
-        """Unpause the game."""
-        self.set_pause_state(False)
-
-    def get_version_info(self) -> dict[str, str]:
-        """Get DFHack and DF version information."""
-        method_id = self._bind_method(
-            "GetVersionInfo",
-            "dfproto.EmptyMessage",
-            "RemoteFortressReader.VersionInfo",
-            plugin="RemoteFortressReader",
-        )
-
-        reply = self._conn.call(method_id, b"")
-
-        # Parse VersionInfo
-        result = {"dfhack_version": "", "df_version": ""}
-        pos = 0
-        while pos < len(reply):
-            tag, consumed = _decode_varint(reply, pos)
-            pos += consumed
-            field_num = tag >> 3
-            wire_type = tag & 0x7
-
-            if wire_type == 2:  # length-delimited (string)
-                length, consumed = _decode_varint(reply, pos)
-                pos += consumed
-                value = reply[pos : pos + length].decode("utf-8", errors="replace")
-                pos += length
-
-                if field_num == 1:
-                    result["dfhack_version"] = value
-                elif field_num == 2:
-                    result["df_version"] = value
-            elif wire_type == 0:
-                _, consumed = _decode_varint(reply, pos)
-                pos += consumed
-
-        return result
-
-    def get_map_info(self) -> MapInfo:
-        """Get map dimensions and world name."""
-        method_id = self._bind_method(
-            "GetMapInfo",
-            "dfproto.EmptyMessage",
-            "RemoteFortressReader.MapInfo",
-            plugin="RemoteFortressReader",
-        )
-
-        reply = self._conn.call(method_id, b"")
-        fields = _parse_protobuf(reply)
-
-        # MapInfo fields:
-        # 1: block_size_x, 2: block_size_y, 3: block_size_z
-        # 4: block_pos_x, 5: block_pos_y, 6: block_pos_z
-        # 7: world_name, 8: world_name_english, 9: save_name
-        return MapInfo(
-            block_size_x=_get_int(fields, 1),
-            block_size_y=_get_int(fields, 2),
-            block_size_z=_get_int(fields, 3),
-            block_pos_x=_get_int(fields, 4),
-            block_pos_y=_get_int(fields, 5),
-            block_pos_z=_get_int(fields, 6),
-            world_name=_get_string(fields, 7),
-            world_name_english=_get_string(fields, 8),
-            save_name=_get_string(fields, 9),
-        )
-
-    def get_view_info(self) -> ViewInfo:
-        """Get current camera/cursor position."""
-        method_id = self._bind_method(
-            "GetViewInfo",
-            "dfproto.EmptyMessage",
-            "RemoteFortressReader.ViewInfo",
-            plugin="RemoteFortressReader",
-        )
-
-        reply = self._conn.call(method_id, b"")
-        fields = _parse_protobuf(reply)
-
-        # ViewInfo fields:
-        # 1: view_pos_x, 2: view_pos_y, 3: view_pos_z
-        # 4: cursor_pos_x, 5: cursor_pos_y, 6: cursor_pos_z
-        # 7: follow_unit_id
-        return ViewInfo(
-            view_x=_get_int(fields, 1),
-            view_y=_get_int(fields, 2),
-            view_z=_get_int(fields, 3),
-            cursor_x=_get_int(fields, 4, -30000),
-            cursor_y=_get_int(fields, 5, -30000),
-            cursor_z=_get_int(fields, 6, -30000),
-            follow_unit_id=_get_int(fields, 7, -1),
-        )
-
-    def _get_raw_unit_list(self) -> list[dict[int, Any]]:
-        """Get raw unit list data (internal)."""
-        method_id = self._bind_method(
-            "GetUnitList",
-            "dfproto.EmptyMessage",
-            "RemoteFortressReader.UnitList",
-            plugin="RemoteFortressReader",
-        )
-
-        reply = self._conn.call(method_id, b"")
-        fields = _parse_protobuf(reply)
-
-        # UnitList field 1 = repeated CreatureList
-        creatures_raw = fields.get(1, [])
-        if not isinstance(creatures_raw, list):
-            creatures_raw = [creatures_raw]
-
-        units = []
-        for creature_bytes in creatures_raw:
-            if isinstance(creature_bytes, bytes):
-                units.append(_parse_protobuf(creature_bytes))
-        return units
-
-    def _parse_unit_name(self, name_bytes: bytes) -> str:
-        """Parse NameTriple to string."""
-        if not name_bytes:
-            return ""
-        fields = _parse_protobuf(name_bytes)
-        # NameTriple: 1=first_name, 2=nickname, 3=last_name
-        first = _get_string(fields, 1)
-        nick = _get_string(fields, 2)
-        last = _get_string(fields, 3)
-
-        if nick:
-            return f'"{nick}"'
-        elif first:
-            return first.capitalize()
-        elif last:
-            return last.capitalize()
-        return "Unknown"
-
-    def _get_profession_id(self, unit_fields: dict[int, Any]) -> int:
-        """Extract profession ID from unit fields."""
-        # Field 16 is a submessage containing profession info
-        # Subfield 3 within it is the profession_id
-        prof_data = unit_fields.get(16)
-        if isinstance(prof_data, bytes):
-            prof_fields = _parse_protobuf(prof_data)
-            return _get_int(prof_fields, 3)
-        return 0
-
-    def get_all_units(self) -> list[UnitBrief]:
-        """Get all units as brief summaries."""
-        raw_units = self._get_raw_unit_list()
-        result = []
-
-        for u in raw_units:
-            # CreatureList fields (from debug analysis):
-            # 1: id, 3: pos_y, 4: pos_z, 5: race_id
-            # 6: mat submsg (civ info?), 7: color RGB
-            # 8: flags1, 9: flags2, 10: flags3, 11: flags4
-            # 13: name (string!)
-            # 16: profession submsg (field 3 = prof_id)
-            # 17: squad/group?, 25: age?
-            unit_id = _get_int(u, 1)
-
-            # Field 13 is the name as a string
-            name = _get_string(u, 13, "Unknown")
-
-            # Check flags for idle/dead status
-            flags1 = _get_int(u, 8)
-            is_dead = bool(flags1 & 0x2)  # bit 1 = dead
-
-            # Get profession ID from submessage
-            prof_id = self._get_profession_id(u)
-            is_idle = prof_id == 103 or prof_id == 0
-
-            result.append(UnitBrief(
-                id=unit_id,
-                name=name,
-                profession=_get_profession_name(prof_id),
-                is_idle=is_idle and not is_dead,
-            ))
-
-        return result
-
-    def _get_civ_id(self, unit_fields: dict[int, Any]) -> int:
-        """Extract civilization ID from unit fields."""
-        # Field 6 is a submessage, subfield 1 is the civ_id
-        civ_data = unit_fields.get(6)
-        if isinstance(civ_data, bytes):
-            civ_fields = _parse_protobuf(civ_data)
-            return _get_int(civ_fields, 1, -1)
-        return -1
-
-    def get_citizens(self) -> list[UnitBrief]:
-        """Get fortress citizens only (living dwarves)."""
-        raw_units = self._get_raw_unit_list()
-        result = []
-
-        for u in raw_units:
-            # Check if this is a citizen using correct field numbers
-            flags1 = _get_int(u, 8)   # flags1
-            flags2 = _get_int(u, 9)   # flags2
-
-            is_dead = bool(flags1 & 0x2)
-            is_merchant = bool(flags1 & 0x40)
-            is_diplomat = bool(flags2 & 0x800000)
-            is_invader = bool(flags1 & 0x80000)
-
-            # Skip non-citizens
-            if is_dead or is_merchant or is_diplomat or is_invader:
-                continue
-
-            # Check civilization - civ_id > 0 means belongs to a civilization
-            civ_id = self._get_civ_id(u)
-            if civ_id < 0:
-                continue  # Wild animal
-
-            unit_id = _get_int(u, 1)
-            name = _get_string(u, 13, "Unknown")
-
-            prof_id = self._get_profession_id(u)
-            is_idle = prof_id == 103 or prof_id == 0
-
-            result.append(UnitBrief(
-                id=unit_id,
-                name=name,
-                profession=_get_profession_name(prof_id),
-                is_idle=is_idle,
-            ))
-
-        return result
-
-    def get_idle_citizens(self) -> list[UnitBrief]:
-        """Get idle citizens only."""
-        return [u for u in self.get_citizens() if u.is_idle]
-
-    def get_unit(self, unit_id: int) -> UnitDetail | None:
-        """Get detailed info for a specific unit."""
-        raw_units = self._get_raw_unit_list()
-
-        for u in raw_units:
-            if _get_int(u, 1) != unit_id:
-                continue
-
-            # Found the unit - parse full details using correct field numbers
-            name = _get_string(u, 13, "Unknown")
-
-            flags1 = _get_int(u, 8)   # flags1
-            flags2 = _get_int(u, 9)   # flags2
-
-            prof_id = self._get_profession_id(u)
-
-            return UnitDetail(
-                id=unit_id,
-                name=name,
-                race=f"race_{_get_int(u, 5)}",  # TODO: lookup race name
-                profession=_get_profession_name(prof_id),
-                position=Position(
-                    x=0,  # pos_x not in data, might be field 2 or missing
-                    y=_get_int(u, 3),
-                    z=_get_int(u, 4),
-                ),
-                flags=UnitFlags(
-                    dead=bool(flags1 & 0x2),
-                    caged=bool(flags1 & 0x200000),
-                    tame=bool(flags1 & 0x400),
-                    merchant=bool(flags1 & 0x40),
-                    diplomat=bool(flags2 & 0x800000),
-                    active_invader=bool(flags1 & 0x80000),
-                ),
-                current_job=None,  # TODO: parse job info
-            )
-
-        return None
-
-    def get_summary(self) -> FortressSummary:
-        """Get high-level fortress summary - minimal context cost."""
-        map_info = self.get_map_info()
-        is_paused = self.get_pause_state()
-
-        # Get unit counts using correct field numbers
-        raw_units = self._get_raw_unit_list()
-
-        citizen_count = 0
-        idle_count = 0
-        animal_count = 0
-        other_count = 0
-
-        for u in raw_units:
-            flags1 = _get_int(u, 8)   # flags1
-            flags2 = _get_int(u, 9)   # flags2
-            civ_id = self._get_civ_id(u)
-            prof_id = self._get_profession_id(u)
-
-            is_dead = bool(flags1 & 0x2)
-            if is_dead:
-                continue
-
-            is_merchant = bool(flags1 & 0x40)
-            is_diplomat = bool(flags2 & 0x800000)
-            is_invader = bool(flags1 & 0x80000)
-
-            if civ_id < 0:
-                animal_count += 1
-            elif is_merchant or is_diplomat or is_invader:
-                other_count += 1
-            else:
-                citizen_count += 1
-                if prof_id == 103 or prof_id == 0:
-                    idle_count += 1
-
-        return FortressSummary(
-            world_name=map_info.world_name,
-            world_name_english=map_info.world_name_english,
-            save_name=map_info.save_name,
-            map_size=(map_info.block_size_x, map_info.block_size_y, map_info.block_size_z),
-            citizen_count=citizen_count,
-            idle_count=idle_count,
-            animal_count=animal_count,
-            other_count=other_count,
-            is_paused=is_paused,
-        )
-
-    def __enter__(self) -> "DFClient":
-        self.connect()
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
-        self.disconnect()
+"""High-level DFHack client API."""
+
+import hashlib
+import json
+import shlex
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from importlib import resources
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Sequence
+
+from dfclient.connection import (
+    CORE_RUN_COMMAND,
+    CORE_RUN_LUA,
+    DFHackConnection,
+    _decode_string_list,
+    _decode_varint,
+    _encode_run_lua,
+    _encode_string,
+    _encode_varint,
+)
+from dfclient.actions import DFActions
+from dfclient.enums import GAME_ENUMS, EnumTable, GameEnums
+from dfclient.mapcache import (
+    BlockTiles,
+    MapCache,
+    MapRegion,
+    _block_chunks,
+    _decode_block_list,
+    _encode_block_request,
+    _tile_buffers,
+)
+from dfclient.pool import DFHackConnectionPool
+from dfclient.proto import rfr_pb2
+from dfclient.protoview import MessageView
+from dfclient.raws import RAWS_CACHE_DIR, MaterialTable, TiletypeTable, WorldRaws, raws_cache_path
+from dfclient.units import CitizenExport, UnitIndex, UnitTable
+from dfclient.models import (
+    CacheStats,
+    ConnectionStatus,
+    FortressSummary,
+    MapInfo,
+    Position,
+    SkillInfo,
+    UnitBrief,
+    UnitDetail,
+    UnitFlags,
+    ViewInfo,
+)
+
+
+def _parse_protobuf(data: bytes) -> dict[int, Any]:
+    """Parse protobuf bytes into field_num -> value dict.
+
+    Returns dict where:
+    - Varint fields (wire type 0) -> int
+    - Length-delimited fields (wire type 2) -> bytes (for strings/submessages)
+    - Repeated fields -> list of values
+    """
+    result: dict[int, Any] = {}
+    pos = 0
+
+    while pos < len(data):
+        tag, consumed = _decode_varint(data, pos)
+        pos += consumed
+        field_num = tag >> 3
+        wire_type = tag & 0x7
+
+        if wire_type == 0:  # varint
+            value, consumed = _decode_varint(data, pos)
+            pos += consumed
+        elif wire_type == 2:  # length-delimited
+            length, consumed = _decode_varint(data, pos)
+            pos += consumed
+            value = data[pos:pos + length]
+            pos += length
+        elif wire_type == 5:  # 32-bit fixed
+            value = struct.unpack("<I", data[pos:pos+4])[0]
+            pos += 4
+        elif wire_type == 1:  # 64-bit fixed
+            value = struct.unpack("<Q", data[pos:pos+8])[0]
+            pos += 8
+        else:
+            raise ValueError(f"Unknown wire type {wire_type}")
+
+        # Handle repeated fields
+        if field_num in result:
+            if not isinstance(result[field_num], list):
+                result[field_num] = [result[field_num]]
+            result[field_num].append(value)
+        else:
+            result[field_num] = value
+
+    return result
+
+
+def _decode_text(val: bytes, default: str = "") -> str:
+    """Decode a string field value (or the string in field 10 of a submessage)."""
+    # Try to decode as string first
+    try:
+        decoded = val.decode("utf-8", errors="replace")
+        if decoded.isprintable() and len(decoded) > 0:
+            return decoded
+    except:
+        pass
+    # Might be a submessage - try to parse and look for string in field 10
+    try:
+        subfields = _parse_protobuf(val)
+        if 10 in subfields and isinstance(subfields[10], bytes):
+            return subfields[10].decode("utf-8", errors="replace")
+    except:
+        pass
+    return default
+
+
+def _get_string(fields: dict[int, Any], field_num: int, default: str = "") -> str:
+    """Get a string field from parsed protobuf."""
+    if field_num not in fields:
+        return default
+    val = fields[field_num]
+    if isinstance(val, bytes):
+        return _decode_text(val, default)
+    return default
+
+
+def _get_int(fields: dict[int, Any], field_num: int, default: int = 0) -> int:
+    """Get an int field from parsed protobuf."""
+    return fields.get(field_num, default)
+
+
+def _decode_pause_state(reply: bytes) -> bool:
+    """Decode a SingleBool reply from GetPauseState."""
+    if rfr_pb2 is not None:
+        return rfr_pb2.SingleBool.FromString(reply).value
+
+    # Hand-rolled fallback. SingleBool: value (1) = bool (varint)
+    pos = 0
+    while pos < len(reply):
+        tag, consumed = _decode_varint(reply, pos)
+        pos += consumed
+        field_num = tag >> 3
+        wire_type = tag & 0x7
+        if field_num == 1 and wire_type == 0:
+            value, _ = _decode_varint(reply, pos)
+            return bool(value)
+        elif wire_type == 0:
+            _, consumed = _decode_varint(reply, pos)
+            pos += consumed
+    return False
+
+
+def _decode_map_info(reply: bytes) -> MapInfo:
+    """Decode a RemoteFortressReader.MapInfo reply."""
+    if rfr_pb2 is not None:
+        info = rfr_pb2.MapInfo.FromString(reply)
+        return MapInfo(
+            block_size_x=info.block_size_x,
+            block_size_y=info.block_size_y,
+            block_size_z=info.block_size_z,
+            block_pos_x=info.block_pos_x,
+            block_pos_y=info.block_pos_y,
+            block_pos_z=info.block_pos_z,
+            world_name=_decode_text(info.world_name),
+            world_name_english=_decode_text(info.world_name_english),
+            save_name=_decode_text(info.save_name),
+        )
+
+    # Hand-rolled fallback
+    fields = _parse_protobuf(reply)
+
+    # MapInfo fields:
+    # 1: block_size_x, 2: block_size_y, 3: block_size_z
+    # 4: block_pos_x, 5: block_pos_y, 6: block_pos_z
+    # 7: world_name, 8: world_name_english, 9: save_name
+    return MapInfo(
+        block_size_x=_get_int(fields, 1),
+        block_size_y=_get_int(fields, 2),
+        block_size_z=_get_int(fields, 3),
+        block_pos_x=_get_int(fields, 4),
+        block_pos_y=_get_int(fields, 5),
+        block_pos_z=_get_int(fields, 6),
+        world_name=_get_string(fields, 7),
+        world_name_english=_get_string(fields, 8),
+        save_name=_get_string(fields, 9),
+    )
+
+
+def _decode_unit_list(reply: bytes) -> list[dict[int, Any]]:
+    """Decode a RemoteFortressReader.UnitList reply into raw unit fields."""
+    fields = _parse_protobuf(reply)
+
+    # UnitList field 1 = repeated CreatureList
+    creatures_raw = fields.get(1, [])
+    if not isinstance(creatures_raw, list):
+        creatures_raw = [creatures_raw]
+
+    units = []
+    for creature_bytes in creatures_raw:
+        if isinstance(creature_bytes, bytes):
+            units.append(_parse_protobuf(creature_bytes))
+    return units
+
+
+class _UnitCivView(MessageView):
+    """UnitDefinition.civ (field 6) as a lazy view; subfield 1 is the civ_id."""
+
+    __slots__ = ()
+
+    @property
+    def civ_id(self) -> int:
+        return self.get_int32(1, -1)
+
+
+class _UnitProfessionView(MessageView):
+    """UnitDefinition.profession (field 16) as a lazy view; subfield 3 is the id."""
+
+    __slots__ = ()
+
+    @property
+    def profession_id(self) -> int:
+        return self.get_int32(3)
+
+
+class _UnitView(MessageView):
+    """UnitDefinition look-alike over the raw reply (fallback decoder).
+
+    Fields are decoded only when read, so filtering units on their flags
+    never touches names or submessages of the units that are skipped.
+    """
+
+    __slots__ = ()
+
+    @property
+    def id(self) -> int:
+        return self.get_int32(1)
+
+    @property
+    def name(self) -> bytes:
+        value = self.get_bytes(13)
+        return value.tobytes() if value is not None else b""
+
+    @property
+    def pos_y(self) -> int:
+        return self.get_int32(3)
+
+    @property
+    def pos_z(self) -> int:
+        return self.get_int32(4)
+
+    @property
+    def race_id(self) -> int:
+        return self.get_int32(5)
+
+    @property
+    def flags1(self) -> int:
+        return self.get_int(8)
+
+    @property
+    def flags2(self) -> int:
+        return self.get_int(9)
+
+    @property
+    def flags3(self) -> int:
+        return self.get_int(10)
+
+    @property
+    def flags4(self) -> int:
+        return self.get_int(11)
+
+    @property
+    def civ(self) -> _UnitCivView:
+        return self.get_message(6, _UnitCivView)
+
+    @property
+    def profession(self) -> _UnitProfessionView:
+        return self.get_message(16, _UnitProfessionView)
+
+
+def _iter_unit_views(reply: bytes) -> Iterator[_UnitView]:
+    """Lazily walk a RemoteFortressReader.UnitList reply, one view per unit."""
+    # UnitList field 1 = repeated UnitDefinition
+    return MessageView(reply).iter_messages(1, _UnitView)
+
+
+def _decode_units(reply: bytes) -> Sequence[Any]:
+    """Decode a RemoteFortressReader.UnitList reply into UnitDefinition messages.
+
+    Units expose id, name (bytes), pos_y, pos_z, race_id, flags1-4,
+    civ.civ_id and profession.profession_id, whichever decoder is used.
+    """
+    if rfr_pb2 is not None:
+        return rfr_pb2.UnitList.FromString(reply).creature_list
+    return list(_iter_unit_views(reply))
+
+
+def _decode_version_info(reply: bytes) -> dict[str, str]:
+    """Decode a RemoteFortressReader.VersionInfo reply."""
+    if rfr_pb2 is not None:
+        info = rfr_pb2.VersionInfo.FromString(reply)
+        return {
+            "dfhack_version": info.dfhack_version.decode("utf-8", errors="replace"),
+            "df_version": info.df_version.decode("utf-8", errors="replace"),
+        }
+
+    # Hand-rolled fallback
+    result = {"dfhack_version": "", "df_version": ""}
+    pos = 0
+    while pos < len(reply):
+        tag, consumed = _decode_varint(reply, pos)
+        pos += consumed
+        field_num = tag >> 3
+        wire_type = tag & 0x7
+
+        if wire_type == 2:  # length-delimited (string)
+            length, consumed = _decode_varint(reply, pos)
+            pos += consumed
+            value = reply[pos : pos + length].decode("utf-8", errors="replace")
+            pos += length
+
+            if field_num == 1:
+                result["dfhack_version"] = value
+            elif field_num == 2:
+                result["df_version"] = value
+        elif wire_type == 0:
+            _, consumed = _decode_varint(reply, pos)
+            pos += consumed
+
+    return result
+
+
+def _decode_view_info(reply: bytes) -> ViewInfo:
+    """Decode a RemoteFortressReader.ViewInfo reply."""
+    if rfr_pb2 is not None:
+        info = rfr_pb2.ViewInfo.FromString(reply)
+        return ViewInfo(
+            view_x=info.view_pos_x,
+            view_y=info.view_pos_y,
+            view_z=info.view_pos_z,
+            cursor_x=info.cursor_pos_x,
+            cursor_y=info.cursor_pos_y,
+            cursor_z=info.cursor_pos_z,
+            follow_unit_id=info.follow_unit_id,
+        )
+
+    # Hand-rolled fallback
+    fields = _parse_protobuf(reply)
+
+    # ViewInfo fields:
+    # 1: view_pos_x, 2: view_pos_y, 3: view_pos_z
+    # 4: cursor_pos_x, 5: cursor_pos_y, 6: cursor_pos_z
+    # 7: follow_unit_id
+    return ViewInfo(
+        view_x=_get_int(fields, 1),
+        view_y=_get_int(fields, 2),
+        view_z=_get_int(fields, 3),
+        cursor_x=_get_int(fields, 4, -30000),
+        cursor_y=_get_int(fields, 5, -30000),
+        cursor_z=_get_int(fields, 6, -30000),
+        follow_unit_id=_get_int(fields, 7, -1),
+    )
+
+
+def _encode_pause_state(paused: bool) -> bytes:
+    """Encode a SingleBool request for SetPauseState."""
+    # SingleBool: value (1) = bool
+    tag = (1 << 3) | 0  # field 1, varint
+    return _encode_varint(tag) + _encode_varint(1 if paused else 0)
+
+
+def _encode_run_command(command: str) -> bytes:
+    """Encode a console command line as a CoreRunCommandRequest."""
+    # Parse command into name and arguments
+    # CoreRunCommandRequest: command (1) = string, arguments (2) = repeated string
+
+    # Special case: "lua" command - pass entire code as single argument
+    if command.startswith("lua "):
+        cmd_name = "lua"
+        cmd_args = [command[4:]]  # Everything after "lua "
+    else:
+        try:
+            parts = shlex.split(command)
+        except ValueError:
+            parts = command.split()
+        cmd_name = parts[0] if parts else command
+        cmd_args = parts[1:] if len(parts) > 1 else []
+
+    # Encode: field 1 = command name, field 2 (repeated) = arguments
+    request = _encode_string(1, cmd_name)
+    for arg in cmd_args:
+        request += _encode_string(2, arg)
+    return request
+
+
+# Lua modules bundled in dfclient/lua/, installed into DFHack as "dfclient.<name>"
+_LUA_MODULES = ("rpc", "snapshot", "dig", "build", "labor", "actions", "units", "enums", "batch")
+
+# Module whose call() decodes JSON arguments and JSON-encodes the result
+_LUA_RPC_MODULE = "dfclient.rpc"
+
+
+@cache
+def _lua_sources() -> dict[str, str]:
+    """Source of each bundled Lua module, by module name."""
+    lua_dir = resources.files("dfclient") / "lua"
+    return {
+        f"dfclient.{name}": (lua_dir / f"{name}.lua").read_text(encoding="utf-8")
+        for name in _LUA_MODULES
+    }
+
+
+@cache
+def _lua_bundle_version() -> str:
+    """Content hash of the bundled Lua modules."""
+    digest = hashlib.sha256()
+    for module, source in _lua_sources().items():
+        digest.update(module.encode("utf-8") + b"\0" + source.encode("utf-8") + b"\0")
+    return digest.hexdigest()[:16]
+
+
+@cache
+def _lua_install_command() -> str:
+    """Build the ``lua`` console command that loads the bundled modules."""
+    chunks = [
+        f'package.loaded["{module}"] = (function()\n{source}\nend)()'
+        for module, source in _lua_sources().items()
+    ]
+    chunks.append(f'package.loaded["{_LUA_RPC_MODULE}"].VERSION = "{_lua_bundle_version()}"')
+    return "lua " + "\n".join(chunks)
+
+
+# Reads the installed bundle version; the reply goes to _lua_install_call
+_LUA_VERSION_CALL = (CORE_RUN_LUA, _encode_run_lua(_LUA_RPC_MODULE, "version", []))
+
+
+def _lua_install_call(installed: list[str]) -> tuple[int, bytes] | None:
+    """The call that loads the bundled Lua modules, None if already loaded.
+
+    ``installed`` is the decoded reply to _LUA_VERSION_CALL, ``[]`` if
+    dfclient.rpc isn't loaded at all.
+    """
+    if installed == [_lua_bundle_version()]:
+        return None
+    return CORE_RUN_COMMAND, _encode_run_command(_lua_install_command())
+
+
+def _encode_lua_call(module: str, function: str, args: Sequence[Any]) -> list[str]:
+    """Arguments for dfclient.rpc.call: target module, function and JSON args."""
+    return [module, function, json.dumps(list(args))]
+
+
+def _lua_rpc_call(module: str, function: str, args: Sequence[Any] = ()) -> tuple[int, bytes]:
+    """A dfclient.rpc.call of module.function as a (method_id, request) call."""
+    return CORE_RUN_LUA, _encode_run_lua(_LUA_RPC_MODULE, "call", _encode_lua_call(module, function, args))
+
+
+def _decode_lua_result(module: str, function: str, values: list[str]) -> Any:
+    """Decode dfclient.rpc.call's JSON reply, raising on a Lua error."""
+    reply = json.loads(values[0]) if values and values[0] else {}
+    if "error" in reply:
+        raise Exception(f"Lua {module}.{function} failed: {reply['error']}")
+    return reply.get("result")
+
+
+def _decode_lua_reply(module: str, function: str, reply: bytes) -> Any:
+    """Decode the CoreRunLua reply to a _lua_rpc_call."""
+    return _decode_lua_result(module, function, _decode_string_list(reply))
+
+
+def _decode_clock(reply: bytes) -> tuple[int, int, bool]:
+    """Decode a dfclient.snapshot.clock CoreRunLua reply into (year, tick, paused)."""
+    year, tick, paused = _decode_lua_reply("dfclient.snapshot", "clock", reply)
+    return year, tick, paused
+
+
+def _build_briefs(table: UnitTable, rows: list[int]) -> list[UnitBrief]:
+    """Turn the given unit table rows into UnitBriefs."""
+    ids = table.id[rows].tolist()
+    prof_ids = table.profession_id[rows].tolist()
+    idle = (table.idle() & table.alive())[rows].tolist()
+    names = table.names
+    professions = table.professions
+    return [
+        UnitBrief(
+            id=unit_id,
+            name=_decode_text(names[row], "Unknown"),
+            profession=professions.name(prof_id),
+            is_idle=is_idle,
+        )
+        for row, unit_id, prof_id, is_idle in zip(rows, ids, prof_ids, idle)
+    ]
+
+
+def _build_all_units(table: UnitTable) -> list[UnitBrief]:
+    """Brief summaries of every unit."""
+    return _build_briefs(table, table.rows())
+
+
+def _build_citizens(table: UnitTable) -> list[UnitBrief]:
+    """Brief summaries of living citizens."""
+    return _build_briefs(table, table.rows(table.citizen()))
+
+
+def _unit_index(table: UnitTable) -> UnitIndex:
+    """The table's UnitIndex, built on first use."""
+    if table.index is None:
+        table.index = UnitIndex(table, [_decode_text(name) for name in table.names])
+    return table.index
+
+
+def _decode_unit_detail(data: dict[str, Any] | None, raws: WorldRaws) -> UnitDetail | None:
+    """Build a UnitDetail from dfclient.units.detail's reply."""
+    if not data:
+        return None
+    x, y, z = data["pos"]
+    job = data.get("job")
+    return UnitDetail(
+        id=data["id"],
+        name=data.get("name") or "Unknown",
+        race=raws.creature(data["race"]),
+        profession=data.get("profession") or "",
+        position=Position(x=x, y=y, z=z),
+        flags=UnitFlags(**data.get("flags", {})),
+        current_job=job["name"] if job else None,
+        skills=[SkillInfo(**skill) for skill in data.get("skills") or []],
+        labors={labor: True for labor in data.get("labors") or []},
+    )
+
+
+def _build_summary(map_info: MapInfo, is_paused: bool, table: UnitTable) -> FortressSummary:
+    """Combine map info, pause state and unit counts into a summary."""
+    alive = table.alive()
+    citizens = table.citizen()
+
+    return FortressSummary(
+        world_name=map_info.world_name,
+        world_name_english=map_info.world_name_english,
+        save_name=map_info.save_name,
+        map_size=(map_info.block_size_x, map_info.block_size_y, map_info.block_size_z),
+        citizen_count=int(citizens.sum()),
+        idle_count=int((citizens & table.idle()).sum()),
+        animal_count=int((alive & (table.civ_id < 0)).sum()),
+        other_count=int((alive & table.visitor()).sum()),
+        is_paused=is_paused,
+    )
+
+
+# RemoteFortressReader methods used by the client: method -> (input_msg, output_msg)
+_RFR_METHODS: dict[str, tuple[str, str]] = {
+    "GetPauseState": ("dfproto.EmptyMessage", "RemoteFortressReader.SingleBool"),
+    "SetPauseState": ("RemoteFortressReader.SingleBool", "dfproto.EmptyMessage"),
+    "GetVersionInfo": ("dfproto.EmptyMessage", "RemoteFortressReader.VersionInfo"),
+    "GetMapInfo": ("dfproto.EmptyMessage", "RemoteFortressReader.MapInfo"),
+    "GetViewInfo": ("dfproto.EmptyMessage", "RemoteFortressReader.ViewInfo"),
+    "GetUnitList": ("dfproto.EmptyMessage", "RemoteFortressReader.UnitList"),
+    "GetBlockList": ("RemoteFortressReader.BlockRequest", "RemoteFortressReader.BlockList"),
+    "GetTiletypeList": ("dfproto.EmptyMessage", "RemoteFortressReader.TiletypeList"),
+    "GetMaterialList": ("dfproto.EmptyMessage", "RemoteFortressReader.MaterialList"),
+    "GetCreatureRaws": ("dfproto.EmptyMessage", "RemoteFortressReader.CreatureRawList"),
+    "GetPlantRaws": ("dfproto.EmptyMessage", "RemoteFortressReader.PlantRawList"),
+}
+
+# Reads that make up a WorldRaws, in WorldRaws.from_replies order
+_RAWS_METHODS = ("GetCreatureRaws", "GetPlantRaws", "GetMaterialList", "GetTiletypeList")
+
+# Reads that identify a world's raws cache file, in _raws_cache_file order
+_RAWS_KEY_METHODS = ("GetMapInfo", "GetVersionInfo")
+
+# Methods read together by get_summary: (method, input_msg, output_msg)
+_SUMMARY_METHODS = [
+    (method, *_RFR_METHODS[method])
+    for method in ("GetMapInfo", "GetPauseState", "GetUnitList")
+]
+
+# The unit list read, pipelined with the game clock on a cold snapshot cache
+_UNIT_LIST_METHODS = _SUMMARY_METHODS[2:]
+
+
+
+def _raws_cache_file(cache_dir: Path, map_reply: bytes, version_reply: bytes) -> Path | None:
+    """The raws cache file of the loaded world, None if the world has no name."""
+    map_info = _decode_map_info(map_reply)
+    if not (map_info.world_name or map_info.save_name):
+        return None
+    return raws_cache_path(
+        cache_dir, map_info.world_name, map_info.save_name,
+        _decode_version_info(version_reply)["df_version"],
+    )
+
+
+def _save_raws(raws: WorldRaws, path: Path | None) -> None:
+    """Write raws to their cache file, if they have one."""
+    if path is None:
+        return
+    try:
+        raws.save(path)
+    except OSError:
+        pass  # a read-only cache directory only costs the next session
+
+
+class _UnitSnapshot:
+    """State of a unit snapshot cache, without I/O or locking.
+
+    The clients read the game clock and unit list their own way and
+    serialize access with their own lock.
+    """
+
+    def __init__(self):
+        self.table: UnitTable | None = None
+        # Game clock the table was read at, and time.monotonic() of the read
+        self.clock: tuple[int, int, bool] | None = None
+        self.time = 0.0
+        self.stats = CacheStats()
+
+    def clear(self) -> None:
+        self.table = None
+        self.clock = None
+
+    def fresh(self, max_age: float) -> UnitTable | None:
+        """The table if younger than max_age seconds."""
+        if self.table is None or time.monotonic() - self.time >= max_age:
+            return None
+        self.stats.hits += 1
+        return self.table
+
+    def revalidate(self, clock: tuple[int, int, bool]) -> UnitTable | None:
+        """The table if it was read at clock, which makes it fresh again."""
+        if self.table is None or clock != self.clock:
+            return None
+        self.stats.hits += 1
+        self.time = time.monotonic()
+        return self.table
+
+    def store(
+        self, clock: tuple[int, int, bool], units_reply: bytes, professions: EnumTable, read_at: float,
+    ) -> UnitTable:
+        """Replace the table with a GetUnitList reply read at clock.
+
+        ``read_at`` is when the clock was read: if the game moves while the
+        units are fetched, the next check sees a newer clock and refetches.
+        """
+        self.stats.misses += 1
+        self.table = UnitTable.from_units(_decode_units(units_reply), professions)
+        self.clock = clock
+        self.time = read_at
+        return self.table
+
+
+class DFClient:
+    """High-level client for interacting with Dwarf Fortress via DFHack.
+
+    Calls go through a pool of up to ``pool_size`` DFHack connections, so
+    the client can be shared between threads and cheap reads don't queue
+    behind a long-running command on another thread.
+
+    Unit queries (get_citizens, find_citizens, get_summary, ...) share one
+    snapshot of the unit list per game tick. A snapshot younger than
+    ``snapshot_max_age`` seconds is reused as is; an older one is checked
+    against the game clock (year, tick and pause state) and refetched only
+    if the clock moved. ``snapshot_max_age=None`` turns the cache off.
+
+    World raws (get_raws) are read once per connection and saved to a
+    file per world under ``raws_cache_dir``, so later sessions load them
+    from disk instead of the game. ``raws_cache_dir=None`` keeps them in
+    memory only.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 5000,
+        pool_size: int = 2,
+        snapshot_max_age: float | None = 0.0,
+        raws_cache_dir: Path | None = RAWS_CACHE_DIR,
+    ):
+        self.host = host
+        self.port = port
+        self.snapshot_max_age = snapshot_max_age
+        self.raws_cache_dir = raws_cache_dir
+        self._pool = DFHackConnectionPool(
+            host, port, size=pool_size,
+            warm_methods={
+                "RemoteFortressReader": [(m, *sig) for m, sig in _RFR_METHODS.items()],
+            },
+        )
+        self.actions = DFActions(self)
+
+        # Unit snapshot cache, locked while fetching
+        self._snapshot_lock = threading.Lock()
+        self._snapshot = _UnitSnapshot()
+
+        # World raws and game enums, loaded once per connection
+        self._raws: WorldRaws | None = None
+        self._enums: GameEnums | None = None
+
+    def connect(self) -> ConnectionStatus:
+        """Connect to DFHack."""
+        self._raws = None
+        self._enums = None
+        return self._pool.connect()
+
+    def disconnect(self) -> None:
+        """Disconnect from DFHack."""
+        self._pool.close()
+
+    def _call_rfr(self, method: str, request: bytes = b"") -> bytes:
+        """Call a RemoteFortressReader method on a pooled connection."""
+        input_msg, output_msg = _RFR_METHODS[method]
+        with self._pool.connection() as conn:
+            method_id = conn.bind_method(
+                method, input_msg, output_msg, plugin="RemoteFortressReader"
+            )
+            return conn.call(method_id, request)
+
+    def _call_rfr_many(self, methods: Sequence[str]) -> list[bytes]:
+        """Call argument-less RemoteFortressReader methods in one round trip."""
+        with self._pool.connection() as conn:
+            method_ids = conn.bind_methods(
+                [(m, *_RFR_METHODS[m]) for m in methods], plugin="RemoteFortressReader"
+            )
+            return conn.call_many([(method_id, b"") for method_id in method_ids])
+
+    def run_command(self, command: str, timeout: float | None = None) -> list[str]:
+        """
+        Run a DFHack console command.
+
+        Args:
+            command: The command to run (e.g., "ls", "kill-unit 123")
+            timeout: Optional timeout override (some commands don't return results)
+
+        Returns:
+            List of output lines
+        """
+        output_lines: list[str] = []
+
+        def collect_output(text: str) -> None:
+            output_lines.extend(text.splitlines())
+
+        request = _encode_run_command(command)
+
+        # Some commands (like clean, prospect) take longer than callers want
+        # to wait. A missed deadline is accepted as success for those; the
+        # late reply stays outstanding and is skipped by the next call.
+        with self._pool.connection() as conn:
+            try:
+                conn.call(CORE_RUN_COMMAND, request, text_callback=collect_output, timeout=timeout)
+            except TimeoutError:
+                pass
+
+        return output_lines
+
+    def _install_lua(self, conn: DFHackConnection) -> None:
+        """Load the bundled Lua modules unless DFHack already has this version.
+
+        The modules live in DFHack's Lua state, so they survive reconnects
+        and are shared by all connections; the version check is one cheap
+        call per connection and the source is only uploaded when it changed.
+        """
+        try:
+            installed = _decode_string_list(conn.call(*_LUA_VERSION_CALL))
+        except OSError:
+            raise
+        except Exception:
+            # Module not loaded at all
+            installed = []
+        install = _lua_install_call(installed)
+        if install is not None:
+            conn.call(*install)
+        conn.lua_modules.update(_lua_sources())
+
+    def call_lua(
+        self,
+        module: str,
+        function: str,
+        args: Sequence[Any] = (),
+        timeout: float | None = None,
+    ) -> Any:
+        """
+        Call a Lua function inside DFHack via CoreRunLua.
+
+        Arguments and the return value are JSON-typed (numbers, strings,
+        booleans, lists and dicts/tables). The bundled ``dfclient.*`` Lua
+        modules are checked (and installed if missing or outdated) on each
+        connection before its first call, so calls only send the function
+        name and arguments.
+
+        Args:
+            module: Module name as given to require (e.g., "dfclient.dig")
+            function: Function name within the module
+            args: Positional arguments
+            timeout: Optional deadline for the call in seconds
+
+        Returns:
+            The function's (first) return value
+
+        Raises:
+            Exception: If the module or function is missing or raises
+        """
+        with self._pool.connection() as conn:
+            if _LUA_RPC_MODULE not in conn.lua_modules:
+                self._install_lua(conn)
+            reply = conn.call(*_lua_rpc_call(module, function, args), timeout=timeout)
+        return _decode_lua_reply(module, function, reply)
+
+    def send_command(self, command: str) -> None:
+        """
+        Send a DFHack console command without waiting for it to finish.
+
+        The command's output and result are discarded. Useful for pushing
+        many short commands whose output isn't needed.
+
+        Args:
+            command: The command to run (e.g., "dig-now")
+        """
+        with self._pool.connection() as conn:
+            conn.post(CORE_RUN_COMMAND, _encode_run_command(command))
+
+    def iter_command(self, command: str, timeout: float | None = None) -> Iterator[str]:
+        """
+        Run a DFHack console command, yielding output lines as they arrive.
+
+        Produces the same lines as run_command, but without holding the whole
+        output in memory. A pooled connection is held until the generator is
+        exhausted or closed; other client calls made meanwhile (e.g. inside
+        the loop) need another one, and raise TimeoutError if none frees up
+        within the pool's checkout timeout.
+
+        Args:
+            command: The command to run (e.g., "ls", "prospect")
+            timeout: Optional deadline for the whole command
+
+        Yields:
+            Output lines
+        """
+        request = _encode_run_command(command)
+        with self._pool.connection() as conn:
+            stream = conn.iter_call(CORE_RUN_COMMAND, request, timeout=timeout)
+            try:
+                for text in stream:
+                    yield from text.splitlines()
+            finally:
+                stream.close()
+
+    def get_pause_state(self) -> bool:
+        """Get whether the game is currently paused."""
+        reply = self._call_rfr("GetPauseState")
+        return _decode_pause_state(reply)
+
+    def set_pause_state(self, paused: bool) -> None:
+        """Set the game pause state."""
+        self._call_rfr("SetPauseState", _encode_pause_state(paused))
+
+    def pause(self) -> None:
+        """Pause the game."""
+        self.set_pause_state(True)
+
+    def unpause(self) -> None:
+        """Unpause the game."""
+        self.set_pause_state(False)
+
+    def get_version_info(self) -> dict[str, str]:
+        """Get DFHack and DF version information."""
+        reply = self._call_rfr("GetVersionInfo")
+        return _decode_version_info(reply)
+
+    def get_map_info(self) -> MapInfo:
+        """Get map dimensions and world name."""
+        reply = self._call_rfr("GetMapInfo")
+        return _decode_map_info(reply)
+
+    def get_view_info(self) -> ViewInfo:
+        """Get current camera/cursor position."""
+        reply = self._call_rfr("GetViewInfo")
+        return _decode_view_info(reply)
+
+    def get_map_cache(self, x1: int, y1: int, z1: int, x2: int, y2: int, z2: int) -> MapCache:
+        """Load the tiles of a map region into a MapCache.
+
+        Call ``refresh()`` on the cache to pull in blocks that changed since.
+        """
+        cache = MapCache(self, MapRegion(x1, y1, z1, x2, y2, z2))
+        cache.refresh()
+        return cache
+
+    def get_raws(self) -> WorldRaws:
+        """Get creature, plant, material and tiletype raws of the loaded world.
+
+        Read from the cache file of this world and DF version when there
+        is one; otherwise fetched from the game and written to it.
+        """
+        if self._raws is not None:
+            return self._raws
+
+        path = None
+        if self.raws_cache_dir is not None:
+            path = _raws_cache_file(self.raws_cache_dir, *self._call_rfr_many(_RAWS_KEY_METHODS))
+            if path is not None:
+                self._raws = WorldRaws.load(path)
+
+        if self._raws is None:
+            self._raws = WorldRaws.from_replies(*self._call_rfr_many(_RAWS_METHODS))
+            _save_raws(self._raws, path)
+        return self._raws
+
+    def get_enums(self) -> GameEnums:
+        """Get the game's enum tables (professions, job types, skills, ...).
+
+        Read from the running game on first use and kept until the next
+        connect(), so names always match the loaded DF version.
+        """
+        if self._enums is None:
+            self._enums = GameEnums(self.call_lua("dfclient.enums", "tables", [list(GAME_ENUMS)]))
+        return self._enums
+
+    def get_tiletypes(self) -> TiletypeTable:
+        """Get the shape/material/special lookup arrays of every tiletype."""
+        return self.get_raws().tiletypes
+
+    def get_materials(self) -> MaterialTable:
+        """Get every material of the world, for looking up tile materials."""
+        return self.get_raws().materials
+
+    def iter_blocks(self, region: MapRegion, batch_blocks: int = 64) -> Iterator[BlockTiles]:
+        """Stream every loaded map block of a region, whatever its size.
+
+        The region is requested ``batch_blocks`` blocks at a time, and the
+        next batch is fetched on a background thread while the current one
+        is being consumed, so at most two replies are held in memory.
+        Blocks are block-aligned and may reach past the region's edges.
+
+        Every block is decoded into the same arrays: a yielded BlockTiles
+        is only valid until the next one, so copy whatever must be kept.
+        """
+        def fetch(chunk: tuple[int, int, int, int, int]) -> bytes:
+            min_x, max_x, min_y, max_y, z = chunk
+            request = _encode_block_request(
+                min_x, max_x, min_y, max_y, z, z + 1,
+                blocks_needed=(max_x - min_x) * (max_y - min_y),
+                force_reload=True,
+            )
+            return self._call_rfr("GetBlockList", request)
+
+        buffers = _tile_buffers()
+        chunks = _block_chunks(region, batch_blocks)
+        first = next(chunks, None)
+        if first is None:
+            return
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(fetch, first)
+            while pending is not None:
+                reply = pending.result()
+                chunk = next(chunks, None)
+                pending = executor.submit(fetch, chunk) if chunk else None
+                yield from _decode_block_list(reply, buffers)
+                del reply
+
+    def _get_raw_unit_list(self) -> list[dict[int, Any]]:
+        """Get raw unit list data as field_num -> value dicts (internal)."""
+        reply = self._call_rfr("GetUnitList")
+        return _decode_unit_list(reply)
+
+    def _parse_unit_name(self, name_bytes: bytes) -> str:
+        """Parse NameTriple to string."""
+        if not name_bytes:
+            return ""
+        fields = _parse_protobuf(name_bytes)
+        # NameTriple: 1=first_name, 2=nickname, 3=last_name
+        first = _get_string(fields, 1)
+        nick = _get_string(fields, 2)
+        last = _get_string(fields, 3)
+
+        if nick:
+            return f'"{nick}"'
+        elif first:
+            return first.capitalize()
+        elif last:
+            return last.capitalize()
+        return "Unknown"
+
+    def _get_units(self) -> Sequence[Any]:
+        """Get the unit list as decoded UnitDefinition messages (internal)."""
+        return _decode_units(self._call_rfr("GetUnitList"))
+
+    def _get_game_clock(self) -> tuple[int, int, bool]:
+        """Get (year, tick within the year, paused) from the game (internal)."""
+        year, tick, paused = self.call_lua("dfclient.snapshot", "clock")
+        return year, tick, paused
+
+    def _clock_call(self, conn: DFHackConnection) -> tuple[int, bytes]:
+        """The game clock read as a call_many entry for conn (internal)."""
+        if _LUA_RPC_MODULE not in conn.lua_modules:
+            self._install_lua(conn)
+        return _lua_rpc_call("dfclient.snapshot", "clock")
+
+    def _get_clock_and_units(self) -> tuple[tuple[int, int, bool], bytes]:
+        """Get the game clock and the GetUnitList reply in one round trip (internal)."""
+        with self._pool.connection() as conn:
+            (units_id,) = conn.bind_methods(_UNIT_LIST_METHODS, plugin="RemoteFortressReader")
+            clock_reply, units_reply = conn.call_many([self._clock_call(conn), (units_id, b"")])
+        return _decode_clock(clock_reply), units_reply
+
+    def _store_snapshot(self, clock: tuple[int, int, bool], units_reply: bytes | None = None) -> UnitTable:
+        """Keep the snapshot if it was taken at clock, else replace it (internal).
+
+        Called with _snapshot_lock held; units_reply, if given, is a unit
+        list read together with clock and always replaces the snapshot.
+        """
+        read_at = time.monotonic()
+        if units_reply is None:
+            table = self._snapshot.revalidate(clock)
+            if table is not None:
+                return table
+            units_reply = self._call_rfr("GetUnitList")
+        return self._snapshot.store(clock, units_reply, self.get_enums().profession, read_at)
+
+    def get_unit_table(self) -> UnitTable:
+        """Get every unit as a columnar UnitTable (flags, ids, professions, ...).
+
+        Served from the unit snapshot cache unless it is off or stale.
+        """
+        if self.snapshot_max_age is None:
+            return UnitTable.from_units(self._get_units(), self.get_enums().profession)
+
+        # Held while fetching, so concurrent callers wait for one fetch
+        with self._snapshot_lock:
+            if self._snapshot.table is None:
+                # Nothing to revalidate: read the clock and the units together
+                return self._store_snapshot(*self._get_clock_and_units())
+            table = self._snapshot.fresh(self.snapshot_max_age)
+            if table is not None:
+                return table
+            return self._store_snapshot(self._get_game_clock())
+
+    def invalidate_unit_cache(self) -> None:
+        """Drop the cached unit snapshot, e.g. after changing units while paused."""
+        with self._snapshot_lock:
+            self._snapshot.clear()
+
+    def get_cache_stats(self) -> CacheStats:
+        """Hit/miss counters of the unit snapshot cache."""
+        return self._snapshot.stats.model_copy()
+
+    def get_all_units(self) -> list[UnitBrief]:
+        """Get all units as brief summaries."""
+        return _build_all_units(self.get_unit_table())
+
+    def get_citizens(self) -> list[UnitBrief]:
+        """Get fortress citizens only (living dwarves)."""
+        return _build_citizens(self.get_unit_table())
+
+    def get_idle_citizens(self) -> list[UnitBrief]:
+        """Get idle citizens only."""
+        return [u for u in self.get_citizens() if u.is_idle]
+
+    def get_unit(self, unit_id: int) -> UnitDetail | None:
+        """Get detailed info for a specific unit.
+
+        Asks DFHack for that unit alone (position, current job, skills and
+        labors included), so the cost doesn't grow with the population.
+        """
+        return _decode_unit_detail(
+            self.call_lua("dfclient.units", "detail", [unit_id]), self.get_raws()
+        )
+
+    def export_citizens(self) -> CitizenExport:
+        """Get every citizen's skills matrix, labor bitmap and current job.
+
+        One call for the whole fortress, instead of a round trip per dwarf.
+        """
+        return CitizenExport(self.call_lua("dfclient.units", "export_citizens"))
+
+    def find_citizens(self, name: str) -> list[UnitBrief]:
+        """Get citizens whose name, or a word of it, starts with ``name``.
+
+        Matching ignores case, accents and quotes ("urist", "mcdwarf" and
+        "urist mcd" all find Urist McDwarf).
+        """
+        return self.find_citizens_many([name])[name]
+
+    def find_citizens_many(self, names: Iterable[str]) -> dict[str, list[UnitBrief]]:
+        """find_citizens for several names at once, from one unit snapshot."""
+        table = self.get_unit_table()
+        index = _unit_index(table)
+        citizen = table.citizen()
+        return {
+            name: _build_briefs(table, [row for row in index.find_name(name) if citizen[row]])
+            for name in names
+        }
+
+    def get_units_by_profession(self, profession: int | str) -> list[UnitBrief]:
+        """Get living units with a profession, by id or name (e.g. "MINER")."""
+        table = self.get_unit_table()
+        prof_id = profession if isinstance(profession, int) else table.professions.value(profession.upper())
+        if prof_id is None:
+            raise ValueError(f"Unknown profession: {profession}")
+        alive = table.alive()
+        rows = _unit_index(table).by_profession.get(prof_id, [])
+        return _build_briefs(table, [row for row in rows if alive[row]])
+
+    def get_military(self) -> list[UnitBrief]:
+        """Get living citizens with a military profession."""
+        table = self.get_unit_table()
+        citizen = table.citizen()
+        rows = _unit_index(table).by_class["military"]
+        return _build_briefs(table, [row for row in rows if citizen[row]])
+
+    def get_summary(self) -> FortressSummary:
+        """Get high-level fortress summary - minimal context cost.
+
+        The map info, pause state and game clock are read in one round
+        trip, with the unit list too unless the snapshot cache can answer.
+        """
+        cached = self.snapshot_max_age is not None
+        with self._pool.connection() as conn:
+            map_id, pause_id, units_id = conn.bind_methods(
+                _SUMMARY_METHODS, plugin="RemoteFortressReader"
+            )
+            calls = [(map_id, b""), (pause_id, b"")]
+            if cached:
+                calls.append(self._clock_call(conn))
+            if not cached or self._snapshot.table is None:
+                calls.append((units_id, b""))
+            replies = conn.call_many(calls)
+
+        if not cached:
+            table = UnitTable.from_units(_decode_units(replies[2]), self.get_enums().profession)
+        else:
+            with self._snapshot_lock:
+                units_reply = replies[3] if len(replies) > 3 else None
+                table = None if units_reply is not None else self._snapshot.fresh(self.snapshot_max_age)
+                if table is None:
+                    table = self._store_snapshot(_decode_clock(replies[2]), units_reply)
+        return _build_summary(
+            _decode_map_info(replies[0]),
+            _decode_pause_state(replies[1]),
+            table,
+        )
+
+    def __enter__(self) -> "DFClient":
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.disconnect()
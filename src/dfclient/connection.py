@@ -1,251 +1,783 @@
-"""Low-level TCP connection and RPC protocol for DFHack."""
-
-import socket
-import struct
-from dataclasses import dataclass
-from typing import Callable
-
-from dfclient.models import ConnectionStatus, RPCError
-
-
-# DFHack RPC Protocol Constants
-DFHACK_MAGIC_REQUEST = b"DFHack?\n"
-DFHACK_MAGIC_RESPONSE = b"DFHack!\n"
-DFHACK_VERSION = 1
-
-# RPC result codes
-RPC_REPLY_RESULT = -1
-RPC_REPLY_FAIL = -2
-RPC_REPLY_TEXT = -3
-RPC_REQUEST_QUIT = -4
-
-
-def _decode_text_message(data: bytes) -> str:
-    """Decode a TEXT reply which is protobuf-wrapped.
-
-    Format: field 1 (CoreTextNotification) → field 1 (text string)
-    """
-    if not data:
-        return ""
-
-    try:
-        # Parse outer message
-        pos = 0
-        while pos < len(data):
-            # Read tag
-            tag = data[pos]
-            pos += 1
-            field_num = tag >> 3
-            wire_type = tag & 0x7
-
-            if wire_type == 2:  # length-delimited
-                # Read length (varint)
-                length = 0
-                shift = 0
-                while pos < len(data):
-                    byte = data[pos]
-                    pos += 1
-                    length |= (byte & 0x7F) << shift
-                    if not (byte & 0x80):
-                        break
-                    shift += 7
-
-                if field_num == 1:
-                    # This is the inner message, parse it
-                    inner = data[pos:pos + length]
-                    # Parse inner to get field 1 (the actual text)
-                    ipos = 0
-                    while ipos < len(inner):
-                        itag = inner[ipos]
-                        ipos += 1
-                        ifield = itag >> 3
-                        iwire = itag & 0x7
-
-                        if iwire == 2:
-                            ilen = 0
-                            ishift = 0
-                            while ipos < len(inner):
-                                byte = inner[ipos]
-                                ipos += 1
-                                ilen |= (byte & 0x7F) << ishift
-                                if not (byte & 0x80):
-                                    break
-                                ishift += 7
-
-                            if ifield == 1:
-                                return inner[ipos:ipos + ilen].decode("utf-8", errors="replace")
-                            ipos += ilen
-                        else:
-                            break
-                pos += length
-            else:
-                break
-    except Exception:
-        pass
-
-    # Fallback: try direct decode
-    return data.decode("utf-8", errors="replace")
-
-
-@dataclass
-class RPCMessage:
-    """A raw RPC message."""
-    id: int  # Method ID or result code
-    data: bytes
-
-
-class DFHackConnection:
-    """Low-level connection to DFHack RPC server."""
-
-    def __init__(self, host: str = "127.0.0.1", port: int = 5000, timeout: float = 30.0):
-        self.host = host
-        self.port = port
-        self.timeout = timeout
-        self._socket: socket.socket | None = None
-        self._connected = False
-        self._dfhack_version: str = ""
-
-    @property
-    def connected(self) -> bool:
-        return self._connected
-
-    def connect(self) -> ConnectionStatus:
-        """Connect to DFHack and perform handshake."""
-        try:
-            self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self._socket.settimeout(self.timeout)
-            self._socket.connect((self.host, self.port))
-
-            # Send handshake
-            self._socket.sendall(DFHACK_MAGIC_REQUEST)
-            self._socket.sendall(struct.pack("<I", DFHACK_VERSION))
-
-            # Read response
-            response_magic = self._recv_exact(len(DFHACK_MAGIC_RESPONSE))
-            if response_magic != DFHACK_MAGIC_RESPONSE:
-                raise ConnectionError(f"Invalid magic: {response_magic!r}")
-
-            version_data = self._recv_exact(4)
-            server_version = struct.unpack("<I", version_data)[0]
-            self._dfhack_version = str(server_version)
-
-            self._connected = True
-            return ConnectionStatus(
-                connected=True,
-                dfhack_version=self._dfhack_version,
-            )
-
-        except Exception as e:
-            self._connected = False
-            return ConnectionStatus(
-                connected=False,
-                error=str(e),
-            )
-
-    def disconnect(self) -> None:
-        """Close the connection."""
-        if self._socket:
-            try:
-                # Send quit request
-                self._send_message(RPCMessage(id=RPC_REQUEST_QUIT, data=b""))
-            except Exception:
-                pass
-            try:
-                self._socket.close()
-            except Exception:
-                pass
-            self._socket = None
-        self._connected = False
-
-    def _recv_exact(self, n: int) -> bytes:
-        """Receive exactly n bytes."""
-        if not self._socket:
-            raise ConnectionError("Not connected")
-
-        data = b""
-        while len(data) < n:
-            chunk = self._socket.recv(n - len(data))
-            if not chunk:
-                raise ConnectionError("Connection closed")
-            data += chunk
-        return data
-
-    def _send_message(self, msg: RPCMessage) -> None:
-        """Send an RPC message."""
-        if not self._socket:
-            raise ConnectionError("Not connected")
-
-        # Header: method_id (2 bytes signed) + padding (2 bytes) + size (4 bytes)
-        header = struct.pack("<hxxI", msg.id, len(msg.data))
-        self._socket.sendall(header)
-        if msg.data:
-            self._socket.sendall(msg.data)
-
-    def _recv_message(self) -> RPCMessage:
-        """Receive an RPC message."""
-        # Read header
-        header = self._recv_exact(8)
-        msg_id, size = struct.unpack("<hxxI", header)
-
-        # Read data
-        data = self._recv_exact(size) if size > 0 else b""
-
-        return RPCMessage(id=msg_id, data=data)
-
-    def call(
-        self,
-        method_id: int,
-        request_data: bytes = b"",
-        text_callback: Callable[[str], None] | None = None,
-    ) -> bytes:
-        """
-        Call an RPC method and return the response data.
-
-        Args:
-            method_id: The method ID to call
-            request_data: Serialized protobuf request
-            text_callback: Optional callback for text messages (like console output)
-
-        Returns:
-            The response data bytes
-
-        Raises:
-            RPCError: If the call fails
-        """
-        if not self._connected:
-            raise ConnectionError("Not connected")
-
-        # Send request
-        self._send_message(RPCMessage(id=method_id, data=request_data))
-
-        # Process responses until we get the result
-        while True:
-            response = self._recv_message()
-
-            if response.id == RPC_REPLY_TEXT:
-                # Text message (console output) - protobuf wrapped
-                if text_callback and response.data:
-                    text = _decode_text_message(response.data)
-                    if text:
-                        text_callback(text)
-                continue
-
-            elif response.id == RPC_REPLY_FAIL:
-                # Error response
-                error_msg = response.data.decode("utf-8", errors="replace") if response.data else "Unknown error"
-                raise Exception(f"RPC failed: {error_msg}")
-
-            elif response.id == RPC_REPLY_RESULT:
-                # Success
-                return response.data
-
-            else:
-                # Unexpected response type
-                raise Exception(f"Unexpected response type: {response.id}")
-
-    def __enter__(self) -> "DFHackConnection":
-        self.connect()
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
-        self.disconnect()
+"""Low-level TCP connection and RPC protocol for DFHack."""
+
+import os
+import select
+import socket
+import struct
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+from dfclient.models import ConnectionStatus, RPCError
+from dfclient.proto import core_pb2
+
+
+# DFHack RPC Protocol Constants
+DFHACK_MAGIC_REQUEST = b"DFHack?\n"
+DFHACK_MAGIC_RESPONSE = b"DFHack!\n"
+DFHACK_VERSION = 1
+
+# RPC result codes
+RPC_REPLY_RESULT = -1
+RPC_REPLY_FAIL = -2
+RPC_REPLY_TEXT = -3
+RPC_REQUEST_QUIT = -4
+
+# Core protocol method IDs (built-in)
+CORE_BIND_METHOD = 0
+CORE_RUN_COMMAND = 1
+CORE_RUN_LUA = 2
+
+# Header: method_id (2 bytes signed) + padding (2 bytes) + size (4 bytes)
+_HEADER = struct.Struct("<hxxI")
+
+# Initial size of the reusable receive buffer (grows to fit the largest reply)
+_RECV_BUFFER_SIZE = 64 * 1024
+
+
+def _iov_max() -> int:
+    """Most buffers a single sendmsg call accepts (IOV_MAX)."""
+    try:
+        limit = os.sysconf("SC_IOV_MAX")
+    except (AttributeError, ValueError, OSError):
+        limit = -1
+    return limit if limit > 0 else 1024
+
+
+_IOV_MAX = _iov_max()
+
+
+def _encode_varint(value: int) -> bytes:
+    """Encode an integer as a protobuf varint."""
+    parts = []
+    while value > 127:
+        parts.append((value & 0x7F) | 0x80)
+        value >>= 7
+    parts.append(value)
+    return bytes(parts)
+
+
+def _decode_varint(data: bytes, offset: int = 0) -> tuple[int, int]:
+    """Decode a protobuf varint, return (value, bytes_consumed)."""
+    result = 0
+    shift = 0
+    pos = offset
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated varint")
+        byte = data[pos]
+        result |= (byte & 0x7F) << shift
+        pos += 1
+        if not (byte & 0x80):
+            break
+        shift += 7
+    return result, pos - offset
+
+
+def _encode_string(field_num: int, value: str) -> bytes:
+    """Encode a string field in protobuf format."""
+    encoded = value.encode("utf-8")
+    tag = (field_num << 3) | 2  # wire type 2 = length-delimited
+    return _encode_varint(tag) + _encode_varint(len(encoded)) + encoded
+
+
+def _encode_bind_request(method: str, input_msg: str, output_msg: str, plugin: str = "") -> bytes:
+    """Encode a CoreBindRequest protobuf message."""
+    # Fields: method (1), input_msg (2), output_msg (3), plugin (4)
+    data = _encode_string(1, method)
+    data += _encode_string(2, input_msg)
+    data += _encode_string(3, output_msg)
+    if plugin:
+        data += _encode_string(4, plugin)
+    return data
+
+
+def _decode_bind_reply(data: bytes) -> int:
+    """Decode a CoreBindReply to get the assigned method ID."""
+    if core_pb2 is not None:
+        reply = core_pb2.CoreBindReply.FromString(data)
+        if not reply.HasField("assigned_id"):
+            raise ValueError("assigned_id not found in reply")
+        return reply.assigned_id
+
+    # Hand-rolled fallback. Field 1 is assigned_id (int32)
+    pos = 0
+    while pos < len(data):
+        tag, consumed = _decode_varint(data, pos)
+        pos += consumed
+        field_num = tag >> 3
+        wire_type = tag & 0x7
+
+        if field_num == 1 and wire_type == 0:  # varint
+            value, consumed = _decode_varint(data, pos)
+            # Handle signed int32 (zigzag would be different, but this is regular int32)
+            if value > 0x7FFFFFFF:
+                value -= 0x100000000
+            return value
+        elif wire_type == 0:
+            _, consumed = _decode_varint(data, pos)
+            pos += consumed
+        elif wire_type == 2:
+            length, consumed = _decode_varint(data, pos)
+            pos += consumed + length
+        else:
+            raise ValueError(f"Unknown wire type {wire_type}")
+
+    raise ValueError("assigned_id not found in reply")
+
+
+def _decode_text_message(data: bytes) -> str:
+    """Decode a TEXT reply which is protobuf-wrapped.
+
+    Format: field 1 (CoreTextNotification) → field 1 (text string)
+    """
+    if not data:
+        return ""
+
+    if core_pb2 is not None:
+        try:
+            notification = core_pb2.CoreTextNotification.FromString(data)
+        except Exception:
+            pass
+        else:
+            if notification.fragments:
+                return b"".join(f.text for f in notification.fragments).decode("utf-8", errors="replace")
+
+    # Hand-rolled fallback
+    try:
+        # Parse outer message
+        pos = 0
+        while pos < len(data):
+            # Read tag
+            tag = data[pos]
+            pos += 1
+            field_num = tag >> 3
+            wire_type = tag & 0x7
+
+            if wire_type == 2:  # length-delimited
+                # Read length (varint)
+                length = 0
+                shift = 0
+                while pos < len(data):
+                    byte = data[pos]
+                    pos += 1
+                    length |= (byte & 0x7F) << shift
+                    if not (byte & 0x80):
+                        break
+                    shift += 7
+
+                if field_num == 1:
+                    # This is the inner message, parse it
+                    inner = data[pos:pos + length]
+                    # Parse inner to get field 1 (the actual text)
+                    ipos = 0
+                    while ipos < len(inner):
+                        itag = inner[ipos]
+                        ipos += 1
+                        ifield = itag >> 3
+                        iwire = itag & 0x7
+
+                        if iwire == 2:
+                            ilen = 0
+                            ishift = 0
+                            while ipos < len(inner):
+                                byte = inner[ipos]
+                                ipos += 1
+                                ilen |= (byte & 0x7F) << ishift
+                                if not (byte & 0x80):
+                                    break
+                                ishift += 7
+
+                            if ifield == 1:
+                                return inner[ipos:ipos + ilen].decode("utf-8", errors="replace")
+                            ipos += ilen
+                        else:
+                            break
+                pos += length
+            else:
+                break
+    except Exception:
+        pass
+
+    # Fallback: try direct decode
+    return data.decode("utf-8", errors="replace")
+
+
+def _encode_run_lua(module: str, function: str, args: list[str]) -> bytes:
+    """Encode a CoreRunLuaRequest protobuf message."""
+    # Fields: module (1), function (2), arguments (3, repeated)
+    data = _encode_string(1, module) + _encode_string(2, function)
+    for arg in args:
+        data += _encode_string(3, arg)
+    return data
+
+
+def _decode_string_list(data: bytes) -> list[str]:
+    """Decode a StringListMessage (field 1, repeated string)."""
+    if core_pb2 is not None:
+        return [
+            value.decode("utf-8", errors="replace")
+            for value in core_pb2.StringListMessage.FromString(data).value
+        ]
+
+    # Hand-rolled fallback
+    values = []
+    pos = 0
+    while pos < len(data):
+        tag, consumed = _decode_varint(data, pos)
+        pos += consumed
+        field_num = tag >> 3
+        wire_type = tag & 0x7
+
+        if wire_type == 2:
+            length, consumed = _decode_varint(data, pos)
+            pos += consumed
+            if field_num == 1:
+                values.append(data[pos:pos + length].decode("utf-8", errors="replace"))
+            pos += length
+        elif wire_type == 0:
+            _, consumed = _decode_varint(data, pos)
+            pos += consumed
+        else:
+            raise ValueError(f"Unknown wire type {wire_type}")
+    return values
+
+
+class _MethodIds:
+    """Method IDs bound on one connection: "plugin:method" -> id.
+
+    Holds no socket, so the sync and asyncio clients share the caching and
+    only differ in how they send the CoreBindMethod calls.
+    """
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+
+    def clear(self) -> None:
+        self._ids.clear()
+
+    def unbound(self, methods: list[tuple[str, str, str]], plugin: str = "") -> list[tuple[str, str, str]]:
+        """The methods that still need binding."""
+        return [m for m in methods if f"{plugin}:{m[0]}" not in self._ids]
+
+    @staticmethod
+    def requests(unbound: list[tuple[str, str, str]], plugin: str = "") -> list[tuple[int, bytes]]:
+        """The CoreBindMethod calls that bind unbound."""
+        return [
+            (CORE_BIND_METHOD, _encode_bind_request(method, input_msg, output_msg, plugin))
+            for method, input_msg, output_msg in unbound
+        ]
+
+    def store(self, unbound: list[tuple[str, str, str]], replies: list[bytes], plugin: str = "") -> None:
+        """Record the IDs assigned in the replies to requests(unbound)."""
+        for (method, _, _), reply in zip(unbound, replies):
+            self._ids[f"{plugin}:{method}"] = _decode_bind_reply(reply)
+
+    def ids(self, methods: list[tuple[str, str, str]], plugin: str = "") -> list[int]:
+        """The IDs of methods, which must all be bound."""
+        return [self._ids[f"{plugin}:{m[0]}"] for m in methods]
+
+
+@dataclass
+class RPCMessage:
+    """A raw RPC message."""
+    id: int  # Method ID or result code
+    data: bytes
+
+
+class DFHackConnection:
+    """Low-level connection to DFHack RPC server.
+
+    With ``low_latency`` enabled (the default) each message is written with a
+    single vectored send, replies are received into a reusable buffer via
+    ``recv_into`` and Nagle's algorithm is disabled on the socket. Disable it
+    to get the original one-``sendall``-per-part transport.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 5000,
+        timeout: float = 30.0,
+        low_latency: bool = True,
+    ):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.low_latency = low_latency
+        self._socket: socket.socket | None = None
+        self._connected = False
+        self._dfhack_version: str = ""
+        # Method IDs are assigned per connection
+        self._method_ids = _MethodIds()
+        # Lua modules installed into DFHack through this connection
+        self.lua_modules: set[str] = set()
+        self._recv_buffer = bytearray(_RECV_BUFFER_SIZE) if low_latency else bytearray()
+        self._reset_stream()
+
+    def _reset_stream(self) -> None:
+        """Forget all per-stream receive state."""
+        # Bytes of the current read already in _recv_buffer (or _partial)
+        self._received = 0
+        self._partial = b""
+        # Header of a frame whose body hasn't been read yet
+        self._header: tuple[int, int] | None = None
+        # Requests sent whose final reply hasn't been read
+        self._outstanding = 0
+        # Absolute time.monotonic() deadline for the current call
+        self._deadline: float | None = None
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    def connect(self) -> ConnectionStatus:
+        """Connect to DFHack and perform handshake."""
+        try:
+            self._reset_stream()
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._socket.settimeout(self.timeout)
+            if self.low_latency:
+                self._set_low_latency_options()
+            self._socket.connect((self.host, self.port))
+
+            # Send handshake
+            self._socket.sendall(DFHACK_MAGIC_REQUEST)
+            self._socket.sendall(struct.pack("<I", DFHACK_VERSION))
+
+            # Read response
+            response_magic = self._recv_exact(len(DFHACK_MAGIC_RESPONSE))
+            if response_magic != DFHACK_MAGIC_RESPONSE:
+                raise ConnectionError(f"Invalid magic: {response_magic!r}")
+
+            version_data = self._recv_exact(4)
+            server_version = struct.unpack("<I", version_data)[0]
+            self._dfhack_version = str(server_version)
+            self._method_ids.clear()
+            self.lua_modules.clear()
+
+            self._connected = True
+            return ConnectionStatus(
+                connected=True,
+                dfhack_version=self._dfhack_version,
+            )
+
+        except Exception as e:
+            self._connected = False
+            return ConnectionStatus(
+                connected=False,
+                error=str(e),
+            )
+
+    def disconnect(self) -> None:
+        """Close the connection."""
+        if self._socket:
+            try:
+                # Send quit request
+                self._send_message(RPCMessage(id=RPC_REQUEST_QUIT, data=b""))
+            except Exception:
+                pass
+            try:
+                self._socket.close()
+            except Exception:
+                pass
+            self._socket = None
+        self._connected = False
+
+    def _set_low_latency_options(self) -> None:
+        """Disable Nagle's algorithm on the socket."""
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._quickack()
+
+    def _quickack(self) -> None:
+        """Ask the kernel to ACK immediately instead of delaying.
+
+        If the server writes a reply header and body separately, a delayed
+        ACK leaves the body stuck behind Nagle on the server side for tens
+        of milliseconds. Linux clears the flag after use, so this is
+        re-armed whenever the last outstanding reply has been read, ready
+        for the next request's reply.
+        """
+        if hasattr(socket, "TCP_QUICKACK"):
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+
+    def _recv_exact(self, n: int) -> bytes:
+        """Receive exactly n bytes.
+
+        If the read times out part way, the bytes received so far are kept
+        and the next call with the same n picks up where this one stopped.
+        """
+        if not self._socket:
+            raise ConnectionError("Not connected")
+
+        if self.low_latency:
+            return bytes(self._recv_into_buffer(n))
+
+        data, self._partial = self._partial, b""
+        try:
+            while len(data) < n:
+                self._wait_readable()
+                chunk = self._socket.recv(n - len(data))
+                if not chunk:
+                    raise ConnectionError("Connection closed")
+                data += chunk
+        except TimeoutError:
+            self._partial = data
+            raise
+        return data
+
+    def _recv_into_buffer(self, n: int) -> memoryview:
+        """Receive exactly n bytes into the reusable buffer.
+
+        The returned view is only valid until the next receive. A read that
+        times out part way resumes from the same offset on the next call.
+        """
+        if not self._received and len(self._recv_buffer) < n:
+            self._recv_buffer = bytearray(max(n, 2 * len(self._recv_buffer)))
+        view = memoryview(self._recv_buffer)[:n]
+        while self._received < n:
+            self._wait_readable()
+            count = self._socket.recv_into(view[self._received:], n - self._received)
+            if not count:
+                raise ConnectionError("Connection closed")
+            self._received += count
+        self._received = 0
+        return view
+
+    def _wait_readable(self) -> None:
+        """Block until the socket is readable or the call deadline passes."""
+        if self._deadline is None:
+            return
+        remaining = self._deadline - time.monotonic()
+        if remaining <= 0 or not select.select([self._socket], [], [], remaining)[0]:
+            raise TimeoutError("DFHack call timed out")
+
+    def _send_message(self, msg: RPCMessage) -> None:
+        """Send an RPC message."""
+        if not self._socket:
+            raise ConnectionError("Not connected")
+
+        header = _HEADER.pack(msg.id, len(msg.data))
+        if self.low_latency:
+            self._send_vectored([header, msg.data] if msg.data else [header])
+            return
+
+        self._socket.sendall(header)
+        if msg.data:
+            self._socket.sendall(msg.data)
+
+    def _send_vectored(self, buffers: list[bytes]) -> None:
+        """Write all buffers with as few send calls as possible."""
+        if not hasattr(self._socket, "sendmsg"):
+            # No scatter/gather I/O on this platform (Windows)
+            self._socket.sendall(b"".join(buffers))
+            return
+
+        views = [memoryview(b) for b in buffers if b]
+        # Index of the first buffer not fully written
+        start = 0
+        while start < len(views):
+            sent = self._socket.sendmsg(views[start:start + _IOV_MAX])
+            # Skip fully written buffers, trim a partially written one
+            while start < len(views) and sent >= len(views[start]):
+                sent -= len(views[start])
+                start += 1
+            if sent:
+                views[start] = views[start][sent:]
+
+    def _recv_message(self) -> RPCMessage:
+        """Receive an RPC message.
+
+        Safe to retry after a timeout: a header that was already read is
+        remembered until its body arrives.
+        """
+        # Read header
+        if self._header is None:
+            if self.low_latency:
+                self._header = _HEADER.unpack(self._recv_into_buffer(_HEADER.size))
+            else:
+                self._header = _HEADER.unpack(self._recv_exact(_HEADER.size))
+        msg_id, size = self._header
+
+        # Read data
+        data = self._recv_exact(size) if size > 0 else b""
+        self._header = None
+
+        return RPCMessage(id=msg_id, data=data)
+
+    @property
+    def outstanding(self) -> int:
+        """Number of sent requests whose replies have not been read yet."""
+        return self._outstanding
+
+    @contextmanager
+    def _deadline_scope(self, timeout: float | None) -> Iterator[None]:
+        """Apply a per-call deadline to every read inside the block."""
+        self._deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            yield
+        finally:
+            self._deadline = None
+
+    def _send_requests(self, messages: list[RPCMessage]) -> None:
+        """Write requests back to back and count them as outstanding."""
+        if self.low_latency and len(messages) > 1:
+            buffers = []
+            for msg in messages:
+                buffers.append(_HEADER.pack(msg.id, len(msg.data)))
+                buffers.append(msg.data)
+            self._send_vectored(buffers)
+        else:
+            for msg in messages:
+                self._send_message(msg)
+        self._outstanding += len(messages)
+
+    def _skip_stale(self, pending: int) -> None:
+        """Discard replies to earlier requests until only ``pending`` remain.
+
+        These belong to calls that timed out or were posted without waiting;
+        DFHack answers in order, so they arrive ahead of the current call's.
+        """
+        while self._outstanding > pending:
+            self._recv_final()
+
+    def call(
+        self,
+        method_id: int,
+        request_data: bytes = b"",
+        text_callback: Callable[[str], None] | None = None,
+        timeout: float | None = None,
+    ) -> bytes:
+        """
+        Call an RPC method and return the response data.
+
+        Args:
+            method_id: The method ID to call
+            request_data: Serialized protobuf request
+            text_callback: Optional callback for text messages (like console output)
+            timeout: Optional deadline for this call in seconds. On timeout
+                the reply stays outstanding and is discarded by a later call.
+
+        Returns:
+            The response data bytes
+
+        Raises:
+            RPCError: If the call fails
+            TimeoutError: If the deadline passes before the reply arrives
+        """
+        if not self._connected:
+            raise ConnectionError("Not connected")
+
+        # Send request
+        self._send_requests([RPCMessage(id=method_id, data=request_data)])
+
+        with self._deadline_scope(timeout):
+            self._skip_stale(1)
+            return self._reply_data(self._recv_final(text_callback))
+
+    def post(self, method_id: int, request_data: bytes = b"") -> None:
+        """
+        Send an RPC request without waiting for its reply.
+
+        The reply (and any text output) is read and discarded by the next
+        call on this connection, or by drain().
+        """
+        if not self._connected:
+            raise ConnectionError("Not connected")
+
+        self._send_requests([RPCMessage(id=method_id, data=request_data)])
+
+    def drain(self, timeout: float | None = None) -> None:
+        """Read and discard the replies to every outstanding request.
+
+        Raises:
+            TimeoutError: If the deadline passes first (the remaining
+                replies stay outstanding)
+        """
+        if not self._connected:
+            raise ConnectionError("Not connected")
+
+        with self._deadline_scope(timeout):
+            self._skip_stale(0)
+
+    def call_many(
+        self,
+        calls: list[tuple[int, bytes] | tuple[int, bytes, Callable[[str], None] | None]],
+        timeout: float | None = None,
+    ) -> list[bytes]:
+        """
+        Pipeline several RPC calls over a single network round trip.
+
+        All requests are written back to back, then the replies are read in
+        order. DFHack answers requests on a connection sequentially, so any
+        TEXT frames seen before a call's RESULT belong to that call.
+
+        Args:
+            calls: (method_id, request_data) or
+                (method_id, request_data, text_callback) tuples
+            timeout: Optional deadline for the whole batch in seconds
+
+        Returns:
+            The response data bytes, one per call, in request order
+
+        Raises:
+            RPCError: If any call fails (after all replies have been read,
+                so the connection stays usable)
+            TimeoutError: If the deadline passes first
+        """
+        if not self._connected:
+            raise ConnectionError("Not connected")
+        if not calls:
+            return []
+
+        self._send_requests([RPCMessage(id=call[0], data=call[1]) for call in calls])
+
+        results: list[bytes] = []
+        error: Exception | None = None
+        with self._deadline_scope(timeout):
+            self._skip_stale(len(calls))
+            for call in calls:
+                text_callback = call[2] if len(call) > 2 else None
+                response = self._recv_final(text_callback)
+                try:
+                    results.append(self._reply_data(response))
+                except Exception as e:
+                    # Keep reading so later replies don't leak into the next call
+                    error = error or e
+                    results.append(b"")
+
+        if error:
+            raise error
+        return results
+
+    def iter_call(
+        self,
+        method_id: int,
+        request_data: bytes = b"",
+        timeout: float | None = None,
+    ) -> Iterator[str]:
+        """
+        Call an RPC method and yield its text output as each frame arrives.
+
+        If the caller stops iterating early, the rest of the reply stays
+        outstanding and is discarded by a later call.
+
+        Args:
+            method_id: The method ID to call
+            request_data: Serialized protobuf request
+            timeout: Optional deadline for the whole call in seconds
+
+        Yields:
+            Decoded text of each TEXT frame
+
+        Raises:
+            RPCError: If the call fails
+            TimeoutError: If the deadline passes before the reply arrives
+        """
+        if not self._connected:
+            raise ConnectionError("Not connected")
+
+        self._send_requests([RPCMessage(id=method_id, data=request_data)])
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            # Yielding hands control back to the caller, so the deadline is
+            # only applied while this generator is reading
+            self._deadline = deadline
+            try:
+                self._skip_stale(1)
+                response = self._recv_message()
+            finally:
+                self._deadline = None
+
+            if response.id == RPC_REPLY_TEXT:
+                if response.data:
+                    text = _decode_text_message(response.data)
+                    if text:
+                        yield text
+                continue
+
+            self._outstanding -= 1
+            if self.low_latency and not self._outstanding:
+                self._quickack()
+            self._reply_data(response)
+            return
+
+    def _recv_final(self, text_callback: Callable[[str], None] | None = None) -> RPCMessage:
+        """Read frames for the oldest outstanding request until its RESULT (or FAIL)."""
+        # Process responses until we get the result
+        while True:
+            response = self._recv_message()
+
+            if response.id == RPC_REPLY_TEXT:
+                # Text message (console output) - protobuf wrapped
+                if text_callback and response.data:
+                    text = _decode_text_message(response.data)
+                    if text:
+                        text_callback(text)
+                continue
+
+            self._outstanding -= 1
+            if self.low_latency and not self._outstanding:
+                self._quickack()
+            return response
+
+    def _reply_data(self, response: RPCMessage) -> bytes:
+        """Return the data of a final (non-TEXT) reply frame, or raise."""
+        if response.id == RPC_REPLY_FAIL:
+            # Error response
+            error_msg = response.data.decode("utf-8", errors="replace") if response.data else "Unknown error"
+            raise Exception(f"RPC failed: {error_msg}")
+
+        elif response.id == RPC_REPLY_RESULT:
+            # Success
+            return response.data
+
+        else:
+            # Unexpected response type
+            raise Exception(f"Unexpected response type: {response.id}")
+
+    def bind_method(self, method: str, input_msg: str, output_msg: str, plugin: str = "") -> int:
+        """Bind a method and return its assigned ID (cached per connection)."""
+        return self.bind_methods([(method, input_msg, output_msg)], plugin)[0]
+
+    def bind_methods(self, methods: list[tuple[str, str, str]], plugin: str = "") -> list[int]:
+        """Bind several methods, pipelining the ones not already cached."""
+        unbound = self._method_ids.unbound(methods, plugin)
+        if unbound:
+            replies = self.call_many(self._method_ids.requests(unbound, plugin))
+            self._method_ids.store(unbound, replies, plugin)
+        return self._method_ids.ids(methods, plugin)
+
+    def run_lua(
+        self,
+        module: str,
+        function: str,
+        args: list[str] | None = None,
+        timeout: float | None = None,
+    ) -> list[str]:
+        """
+        Call a function of a loaded Lua module via CoreRunLua.
+
+        DFHack passes the arguments to the function as strings and returns
+        its results converted with tostring (nil becomes "").
+
+        Args:
+            module: Module name as given to require (e.g., "dfclient.rpc")
+            function: Function name within the module
+            args: String arguments
+            timeout: Optional deadline for this call in seconds
+
+        Returns:
+            The function's results as strings
+        """
+        reply = self.call(CORE_RUN_LUA, _encode_run_lua(module, function, args or []), timeout=timeout)
+        return _decode_string_list(reply)
+
+    def __enter__(self) -> "DFHackConnection":
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.disconnect()
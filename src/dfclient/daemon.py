@@ -1,720 +1,1252 @@
-"""Persistent daemon for fast DFHack queries.
-
-Keeps a single TCP connection to DFHack open and accepts JSON commands
-via a socket on localhost:5001.
-
-Protocol:
-- Request: One JSON object per line
-- Response: One JSON object per line
-
-Commands:
-- {"cmd": "snapshot"}           - Full game state
-- {"cmd": "pause"}              - Pause game
-- {"cmd": "unpause"}            - Unpause game
-- {"cmd": "play", "seconds": N} - Run game for N seconds
-- {"cmd": "run", "command": X}  - Run DFHack console command
-- {"cmd": "quit"}               - Shutdown daemon
-"""
-
-import json
-import socket
-import time
-from typing import Any
-
-from dfclient.client import DFClient
-
-
-DAEMON_PORT = 5001
-
-
-class DFDaemon:
-    """Daemon that keeps DFHack connection open for fast queries."""
-
-    def __init__(self, port: int = DAEMON_PORT):
-        self.port = port
-        self.client: DFClient | None = None
-        self.server: socket.socket | None = None
-        self.running = False
-
-    def connect_dfhack(self) -> bool:
-        """Connect to DFHack."""
-        try:
-            self.client = DFClient()
-            status = self.client.connect()
-            return status.connected
-        except Exception as e:
-            print(f"Failed to connect to DFHack: {e}")
-            return False
-
-    def _get_state(self, radius: int = 100) -> dict[str, Any]:
-        """Get camera-centered game state via Lua.
-
-        Only returns entities within `radius` tiles of camera on same Z-level.
-        """
-        lua = f'''
-local cam_x = df.global.window_x
-local cam_y = df.global.window_y
-local cam_z = df.global.window_z
-local radius = {radius}
-
-print("CAMERA:"..cam_x..","..cam_y..","..cam_z.."|radius="..radius)
-
-local year = df.global.cur_year
-local season = ({{"spring","summer","autumn","winter"}})[math.floor(df.global.cur_year_tick/100800)+1] or "?"
-print("YEAR:"..year.."/"..season)
-
--- Helper: check if position is within view
-local function inView(x, y, z)
-  if z ~= cam_z then return false end
-  return math.abs(x - cam_x) <= radius and math.abs(y - cam_y) <= radius
-end
-
--- Dwarves in view with comprehensive status
-for i,u in ipairs(df.global.world.units.active) do
-  if dfhack.units.isCitizen(u) and dfhack.units.isAlive(u) and inView(u.pos.x, u.pos.y, u.pos.z) then
-    local name = dfhack.units.getReadableName(u)
-    local job = u.job.current_job and df.job_type[u.job.current_job.job_type] or "idle"
-    local stress = dfhack.units.getStressCategory(u)
-    local pos = u.pos.x..","..u.pos.y
-
-    -- Physical state
-    local wounds = #u.body.wounds
-    local blood = math.floor(u.body.blood_count * 100 / math.max(1, u.body.blood_max))
-    local hunger = u.counters2.hunger_timer < 75000 and "hungry" or nil
-    local thirst = u.counters2.thirst_timer < 75000 and "thirsty" or nil
-    local tired = u.counters2.sleepiness_timer < 50000 and "tired" or nil
-
-    local phys = {{}}
-    if wounds > 0 then table.insert(phys, wounds.." wounds") end
-    if blood < 80 then table.insert(phys, blood.."%% blood") end
-    if hunger then table.insert(phys, hunger) end
-    if thirst then table.insert(phys, thirst) end
-    if tired then table.insert(phys, tired) end
-    local physStr = #phys > 0 and table.concat(phys, ",") or "healthy"
-
-    -- Top unmet need
-    local topNeed = nil
-    local worstFocus = 0
-    local soul = u.status.current_soul
-    if soul then
-      for j=0,#soul.personality.needs-1 do
-        local n = soul.personality.needs[j]
-        if n.focus_level < worstFocus then
-          worstFocus = n.focus_level
-          topNeed = df.need_type[n.id]
-        end
-      end
-    end
-
-    -- Recent emotion
-    local emotion = nil
-    if soul and #soul.personality.emotions > 0 then
-      local em = soul.personality.emotions[#soul.personality.emotions-1]
-      emotion = df.emotion_type[em.type]
-    end
-
-    -- Top skill
-    local topSkill = nil
-    local topLevel = 0
-    if soul then
-      for j=0,#soul.skills-1 do
-        local sk = soul.skills[j]
-        if sk.rating > topLevel then
-          topLevel = sk.rating
-          topSkill = df.job_skill[sk.id]
-        end
-      end
-    end
-
-    local parts = {{pos, name, job, "stress:"..stress, physStr}}
-    if topNeed then table.insert(parts, "needs:"..topNeed) end
-    if emotion then table.insert(parts, "feeling:"..emotion) end
-    if topSkill then table.insert(parts, "best:"..topSkill.."("..topLevel..")") end
-
-    print("DWARF:"..table.concat(parts, "|"))
-  end
-end
-
--- Other creatures in view (non-citizen, non-invader)
-for i,u in ipairs(df.global.world.units.active) do
-  if dfhack.units.isAlive(u) and not dfhack.units.isCitizen(u)
-     and not u.flags1.marauder and not u.flags1.active_invader
-     and inView(u.pos.x, u.pos.y, u.pos.z) then
-    local race = df.global.world.raws.creatures.all[u.race].creature_id
-    local pos = u.pos.x..","..u.pos.y
-    local job = u.job.current_job and df.job_type[u.job.current_job.job_type] or "wandering"
-    print("CREATURE:"..pos.."|"..race.."|"..job)
-  end
-end
-
--- Threats in view
-for i,u in ipairs(df.global.world.units.active) do
-  if dfhack.units.isAlive(u) and (u.flags1.marauder or u.flags1.active_invader)
-     and inView(u.pos.x, u.pos.y, u.pos.z) then
-    local race = df.global.world.raws.creatures.all[u.race].creature_id
-    local pos = u.pos.x..","..u.pos.y
-    print("THREAT:"..pos.."|"..race)
-  end
-end
-
--- Buildings in view
-for i,b in ipairs(df.global.world.buildings.all) do
-  if inView(b.centerx, b.centery, b.z) then
-    local btype = df.building_type[b:getType()]
-    local pos = b.centerx..","..b.centery
-    local custom = ""
-    if b:getType() == df.building_type.Workshop then
-      custom = df.workshop_type[b:getSubtype()] or ""
-    elseif b:getType() == df.building_type.Furnace then
-      custom = df.furnace_type[b:getSubtype()] or ""
-    elseif b:getType() == df.building_type.Stockpile then
-      custom = "id="..b.id
-    end
-    print("BUILDING:"..pos.."|"..btype.."|"..custom)
-  end
-end
-
--- Items on ground in view (limit to avoid spam)
-local itemCount = 0
-for i,item in ipairs(df.global.world.items.all) do
-  if itemCount >= 50 then break end
-  if item.flags.on_ground and inView(item.pos.x, item.pos.y, item.pos.z) then
-    local itype = df.item_type[item:getType()]
-    local pos = item.pos.x..","..item.pos.y
-    local mat = dfhack.matinfo.decode(item)
-    local matName = mat and mat:toString() or ""
-    print("ITEM:"..pos.."|"..itype.."|"..matName)
-    itemCount = itemCount + 1
-  end
-end
-if itemCount >= 50 then print("ITEM:...|more items truncated") end
-
--- Terrain sample (check key features in grid)
-local terrain = {{walls=0, floors=0, stairs=0, water=0, trees=0}}
-local step = math.max(1, math.floor(radius / 10))
-for dx = -radius, radius, step do
-  for dy = -radius, radius, step do
-    local x, y, z = cam_x + dx, cam_y + dy, cam_z
-    local tt = dfhack.maps.getTileType(x, y, z)
-    if tt then
-      local shape = df.tiletype.attrs[tt].shape
-      if shape == df.tiletype_shape.WALL then terrain.walls = terrain.walls + 1
-      elseif shape == df.tiletype_shape.FLOOR then terrain.floors = terrain.floors + 1
-      elseif shape == df.tiletype_shape.STAIR_UP or shape == df.tiletype_shape.STAIR_DOWN
-             or shape == df.tiletype_shape.STAIR_UPDOWN then terrain.stairs = terrain.stairs + 1
-      end
-      local mat = df.tiletype.attrs[tt].material
-      if mat == df.tiletype_material.POOL or mat == df.tiletype_material.RIVER then
-        terrain.water = terrain.water + 1
-      elseif mat == df.tiletype_material.TREE then
-        terrain.trees = terrain.trees + 1
-      end
-    end
-  end
-end
-print("TERRAIN:walls="..terrain.walls.."|floors="..terrain.floors.."|stairs="..terrain.stairs.."|water="..terrain.water.."|trees="..terrain.trees)
-
--- Active jobs in view
-local jobCount = 0
-for i,j in ipairs(df.global.world.jobs.list) do
-  if jobCount >= 20 then break end
-  if j and inView(j.pos.x, j.pos.y, j.pos.z) then
-    local jtype = df.job_type[j.job_type]
-    local pos = j.pos.x..","..j.pos.y
-    local worker = j.holder and dfhack.units.getReadableName(j.holder) or "unassigned"
-    print("JOB:"..pos.."|"..jtype.."|"..worker)
-    jobCount = jobCount + 1
-  end
-end
-
--- Recent announcements (keep global - important alerts)
-local ann = df.global.world.status.announcements
-local anns = {{}}
-for i=#ann-1,math.max(0,#ann-5),-1 do table.insert(anns, ann[i].text) end
-if #anns > 0 then print("RECENT:"..table.concat(anns, ";")) end
-'''
-        result = self.client.run_command(f"lua {lua}", timeout=5.0)
-
-        data = {
-            "camera": "",
-            "year": "",
-            "dwarves": [],
-            "creatures": [],
-            "threats": [],
-            "buildings": [],
-            "items": [],
-            "terrain": "",
-            "jobs": [],
-            "recent": []
-        }
-        for line in result:
-            if line.startswith("CAMERA:"):
-                data["camera"] = line[7:]
-            elif line.startswith("YEAR:"):
-                data["year"] = line[5:]
-            elif line.startswith("DWARF:"):
-                data["dwarves"].append(line[6:])
-            elif line.startswith("CREATURE:"):
-                data["creatures"].append(line[9:])
-            elif line.startswith("THREAT:"):
-                data["threats"].append(line[7:])
-            elif line.startswith("BUILDING:"):
-                data["buildings"].append(line[9:])
-            elif line.startswith("ITEM:"):
-                data["items"].append(line[5:])
-            elif line.startswith("TERRAIN:"):
-                data["terrain"] = line[8:]
-            elif line.startswith("JOB:"):
-                data["jobs"].append(line[4:])
-            elif line.startswith("RECENT:"):
-                raw = line[7:]
-                if raw:
-                    data["recent"] = raw.split(";")
-
-        hint = "Use Lua to dig, build, assign labors, or investigate further."
-        if data["threats"]:
-            hint = "THREATS IN VIEW! Use exterminate or military. " + hint
-
-        data["hint"] = hint
-        return data
-
-    def cmd_pause(self) -> dict[str, Any]:
-        """Pause the game."""
-        if not self.client:
-            return {"error": "Not connected"}
-        try:
-            self.client.pause()
-            return {"paused": True}
-        except Exception as e:
-            return {"error": str(e)}
-
-    def cmd_unpause(self) -> dict[str, Any]:
-        """Unpause the game."""
-        if not self.client:
-            return {"error": "Not connected"}
-        try:
-            self.client.unpause()
-            return {"paused": False}
-        except Exception as e:
-            return {"error": str(e)}
-
-    def cmd_play(self, seconds: int) -> dict[str, Any]:
-        """Run game for N seconds, return state after."""
-        if not self.client:
-            return {"error": "Not connected"}
-
-        try:
-            self.client.unpause()
-            time.sleep(seconds)
-            self.client.pause()
-            state = self._get_state()
-            state["seconds"] = seconds
-            return state
-        except Exception as e:
-            return {"error": str(e)}
-
-    def cmd_tick(self, ticks: int) -> dict[str, Any]:
-        """Advance game by N ticks (faster than play, uses polling).
-
-        With timestream enabled, this is much faster than real-time waiting.
-        """
-        if not self.client:
-            return {"error": "Not connected"}
-
-        try:
-            # Get current tick
-            result = self.client.run_command("lua print(df.global.cur_year_tick)", timeout=1.0)
-            start_tick = int(result[0]) if result else 0
-            target_tick = start_tick + ticks
-
-            self.client.unpause()
-
-            # Poll for tick advancement (check every 50ms)
-            max_iterations = ticks * 10  # Safety limit
-            iterations = 0
-            while iterations < max_iterations:
-                time.sleep(0.05)
-                result = self.client.run_command("lua print(df.global.cur_year_tick)", timeout=1.0)
-                current_tick = int(result[0]) if result else 0
-                if current_tick >= target_tick:
-                    break
-                iterations += 1
-
-            self.client.pause()
-            state = self._get_state()
-            state["ticks_advanced"] = current_tick - start_tick
-            return state
-        except Exception as e:
-            return {"error": str(e)}
-
-    def cmd_run(self, command: str) -> dict[str, Any]:
-        """Run a DFHack console command."""
-        if not self.client:
-            return {"error": "Not connected"}
-        try:
-            result = self.client.run_command(command, timeout=5.0)
-            return {"output": result}
-        except Exception as e:
-            return {"error": str(e)}
-
-    def cmd_dig(self, x1: int, y1: int, z1: int, x2: int, y2: int, dig_type: str) -> dict[str, Any]:
-        """Designate area for digging."""
-        if not self.client:
-            return {"error": "Not connected"}
-
-        # Map dig type names to Lua values
-        dig_types = {
-            "mine": 1,
-            "stair_updown": 2,
-            "channel": 3,
-            "ramp": 4,
-            "stair_down": 5,
-            "stair_up": 6,
-        }
-        dig_val = dig_types.get(dig_type, 1)
-
-        lua = f'''
-local count = 0
-local min_x, max_x = math.min({x1}, {x2}), math.max({x1}, {x2})
-local min_y, max_y = math.min({y1}, {y2}), math.max({y1}, {y2})
-local z = {z1}
-for x = min_x, max_x do
-  for y = min_y, max_y do
-    local block = dfhack.maps.getTileBlock(x, y, z)
-    if block then
-      local bx, by = x % 16, y % 16
-      local tt = dfhack.maps.getTileType(x, y, z)
-      if tt then
-        local shape = df.tiletype.attrs[tt].shape
-        if shape == df.tiletype_shape.WALL or shape == df.tiletype_shape.FLOOR then
-          block.designation[bx][by].dig = {dig_val}
-          count = count + 1
-        end
-      end
-    end
-  end
-end
-print("DESIGNATED:"..count)
-'''
-        try:
-            result = self.client.run_command(f"lua {lua}", timeout=3.0)
-            count = 0
-            for line in result:
-                if line.startswith("DESIGNATED:"):
-                    count = int(line[11:])
-            return {"designated": count, "type": dig_type, "area": f"({x1},{y1},{z1}) to ({x2},{y2},{z1})"}
-        except Exception as e:
-            return {"error": str(e)}
-
-    def cmd_dig_now(self) -> dict[str, Any]:
-        """Instantly complete all dig designations."""
-        if not self.client:
-            return {"error": "Not connected"}
-        try:
-            result = self.client.run_command("dig-now", timeout=10.0)
-            return {"completed": True, "output": result}
-        except Exception as e:
-            return {"error": str(e)}
-
-    def cmd_build(self, build_type: str, x: int, y: int, z: int) -> dict[str, Any]:
-        """Build workshop/furnace at position."""
-        if not self.client:
-            return {"error": "Not connected"}
-
-        # Map build type names to workshop subtypes
-        workshop_types = {
-            "carpenter": 0, "farmer": 1, "mason": 2, "craftsdwarf": 3, "jeweler": 4,
-            "metalsmith": 5, "magma_forge": 6, "bowyer": 7, "mechanic": 8, "siege": 9,
-            "butcher": 10, "leather": 11, "tanner": 12, "clothier": 13, "fishery": 14,
-            "still": 15, "loom": 16, "quern": 17, "kennel": 18, "kitchen": 19,
-            "ashery": 20, "dyer": 21, "millstone": 22, "tool": 24,
-        }
-        furnace_types = {
-            "furnace_smelter": 0, "furnace_wood": 1, "furnace_glass": 2, "furnace_kiln": 3,
-        }
-
-        if build_type in workshop_types:
-            subtype = workshop_types[build_type]
-            bld_type = "Workshop"
-        elif build_type in furnace_types:
-            subtype = furnace_types[build_type]
-            bld_type = "Furnace"
-        else:
-            return {"error": f"Unknown building type: {build_type}"}
-
-        lua = f'''
-local pos = df.coord:new()
-pos.x, pos.y, pos.z = {x}, {y}, {z}
-local bld, err = dfhack.buildings.constructBuilding{{
-  type = df.building_type.{bld_type},
-  subtype = {subtype},
-  custom = -1,
-  pos = pos,
-  width = 3,
-  height = 3
-}}
-if bld then
-  dfhack.buildings.completeBuild(bld)
-  print("BUILT:"..bld.id)
-else
-  print("ERROR:"..(err or "unknown"))
-end
-'''
-        try:
-            result = self.client.run_command(f"lua {lua}", timeout=3.0)
-            for line in result:
-                if line.startswith("BUILT:"):
-                    return {"built": build_type, "id": int(line[6:]), "pos": f"({x},{y},{z})"}
-                elif line.startswith("ERROR:"):
-                    return {"error": line[6:]}
-            return {"error": "Unknown result"}
-        except Exception as e:
-            return {"error": str(e)}
-
-    def cmd_stockpile(self, x: int, y: int, z: int, width: int, height: int, preset: str) -> dict[str, Any]:
-        """Create and configure a stockpile."""
-        if not self.client:
-            return {"error": "Not connected"}
-
-        # Map preset names to library paths
-        preset_map = {
-            "all": "all", "food": "cat_food", "booze": "booze", "seeds": "seeds",
-            "stone": "cat_stone", "wood": "cat_wood", "weapons": "cat_weapons",
-            "armor": "cat_armor", "ammo": "cat_ammo", "furniture": "cat_furniture",
-            "bars": "cat_bars_blocks", "gems": "cat_gems", "cloth": "cat_cloth",
-            "leather": "cat_leather", "finished_goods": "cat_finished_goods",
-            "refuse": "cat_refuse", "corpses": "cat_corpses", "animals": "cat_animals",
-            "coins": "cat_coins",
-        }
-        lib_preset = preset_map.get(preset, preset)
-
-        # Step 1: Create stockpile
-        lua = f'''
-local sp, err = dfhack.buildings.constructBuilding{{
-  type = df.building_type.Stockpile,
-  pos = {{x={x}, y={y}, z={z}}},
-  width = {width},
-  height = {height},
-  abstract = true
-}}
-if sp then
-  dfhack.buildings.completeBuild(sp)
-  print("STOCKPILE:"..sp.id)
-else
-  print("ERROR:"..(err or "unknown"))
-end
-'''
-        try:
-            result = self.client.run_command(f"lua {lua}", timeout=3.0)
-            sp_id = None
-            for line in result:
-                if line.startswith("STOCKPILE:"):
-                    sp_id = int(line[10:])
-                elif line.startswith("ERROR:"):
-                    return {"error": line[6:]}
-
-            if sp_id is None:
-                return {"error": "Failed to create stockpile"}
-
-            # Step 2: Configure with preset
-            config_result = self.client.run_command(f"stockpiles import library/{lib_preset} -s {sp_id}", timeout=3.0)
-            return {"created": True, "id": sp_id, "preset": preset, "pos": f"({x},{y},{z})", "size": f"{width}x{height}"}
-        except Exception as e:
-            return {"error": str(e)}
-
-    def cmd_order(self, job_type: str, amount: int) -> dict[str, Any]:
-        """Create a manager work order."""
-        if not self.client:
-            return {"error": "Not connected"}
-
-        # Common reactions that need CustomReaction wrapper
-        reactions = {
-            "brew": "BREW_DRINK_FROM_PLANT",
-            "brew_fruit": "BREW_DRINK_FROM_PLANT_GROWTH",
-        }
-
-        # Common job types that work directly
-        direct_jobs = {
-            "MakeCharcoal", "MakeBed", "MakeBarrel", "MakeBin", "MakeTable",
-            "MakeChair", "MakeDoor", "MakeCabinet", "MakeBox", "PrepareMeal",
-            "ProcessPlants", "MillPlants", "MakeCheese", "TanHide",
-        }
-
-        try:
-            if job_type.lower() in reactions:
-                # Use reaction syntax
-                reaction_code = reactions[job_type.lower()]
-                json_str = f'{{"job":"CustomReaction","reaction":"{reaction_code}","amount":{amount}}}'
-                result = self.client.run_command(f"workorder '{json_str}'", timeout=3.0)
-            else:
-                # Try direct job type with JSON
-                json_str = f'{{"job":"{job_type}","amount":{amount}}}'
-                result = self.client.run_command(f"workorder '{json_str}'", timeout=3.0)
-
-            return {"ordered": job_type, "amount": amount, "output": result}
-        except Exception as e:
-            return {"error": str(e)}
-
-    def cmd_labor(self, name: str, labor: str, enabled: bool) -> dict[str, Any]:
-        """Enable/disable labor for a dwarf."""
-        if not self.client:
-            return {"error": "Not connected"}
-
-        action = "true" if enabled else "false"
-        lua = f'''
-local found = false
-for i, u in ipairs(df.global.world.units.active) do
-  if dfhack.units.isCitizen(u) then
-    local uname = dfhack.units.getReadableName(u)
-    if uname:lower():find("{name.lower()}") then
-      local labor_id = df.unit_labor.{labor}
-      if labor_id then
-        u.status.labors[labor_id] = {action}
-        print("SET:"..uname.."|".."{labor}".."|"..tostring({action}))
-        found = true
-        break
-      else
-        print("ERROR:Unknown labor {labor}")
-        break
-      end
-    end
-  end
-end
-if not found then print("ERROR:Dwarf not found: {name}") end
-'''
-        try:
-            result = self.client.run_command(f"lua {lua}", timeout=3.0)
-            for line in result:
-                if line.startswith("SET:"):
-                    parts = line[4:].split("|")
-                    return {"dwarf": parts[0], "labor": parts[1], "enabled": parts[2] == "true"}
-                elif line.startswith("ERROR:"):
-                    return {"error": line[6:]}
-            return {"error": "Unknown result"}
-        except Exception as e:
-            return {"error": str(e)}
-
-    def handle_request(self, request: dict) -> dict[str, Any]:
-        """Handle a JSON request and return response."""
-        start = time.time()
-        cmd = request.get("cmd", "")
-
-        if cmd == "snapshot":
-            radius = request.get("radius", 100)
-            data = self._get_state(radius=int(radius))
-        elif cmd == "pause":
-            data = self.cmd_pause()
-        elif cmd == "unpause":
-            data = self.cmd_unpause()
-        elif cmd == "play":
-            seconds = request.get("seconds", 5)
-            data = self.cmd_play(int(seconds))
-        elif cmd == "tick":
-            ticks = request.get("ticks", 100)
-            data = self.cmd_tick(int(ticks))
-        elif cmd == "run":
-            command = request.get("command", "")
-            data = self.cmd_run(command)
-        elif cmd == "quit":
-            self.running = False
-            data = {"shutdown": True}
-        # Designation commands
-        elif cmd == "dig":
-            data = self.cmd_dig(
-                request.get("x1", 0), request.get("y1", 0), request.get("z1", 0),
-                request.get("x2", 0), request.get("y2", 0), request.get("type", "mine")
-            )
-        elif cmd == "dig-now":
-            data = self.cmd_dig_now()
-        elif cmd == "build":
-            data = self.cmd_build(
-                request.get("type", ""), request.get("x", 0),
-                request.get("y", 0), request.get("z", 0)
-            )
-        elif cmd == "stockpile":
-            data = self.cmd_stockpile(
-                request.get("x", 0), request.get("y", 0), request.get("z", 0),
-                request.get("width", 5), request.get("height", 5), request.get("preset", "all")
-            )
-        elif cmd == "order":
-            data = self.cmd_order(request.get("job", ""), request.get("amount", 1))
-        elif cmd == "labor":
-            data = self.cmd_labor(
-                request.get("name", ""), request.get("labor", ""),
-                request.get("enabled", True)
-            )
-        else:
-            data = {"error": f"Unknown command: {cmd}"}
-
-        ms = int((time.time() - start) * 1000)
-
-        if "error" in data:
-            return {"ok": False, "error": data["error"], "ms": ms}
-        return {"ok": True, "data": data, "ms": ms}
-
-    def handle_client(self, conn: socket.socket) -> None:
-        """Handle a single client connection."""
-        try:
-            # Read until newline
-            data = b""
-            while b"\n" not in data:
-                chunk = conn.recv(4096)
-                if not chunk:
-                    return
-                data += chunk
-
-            line = data.split(b"\n")[0].decode("utf-8")
-            request = json.loads(line)
-
-            response = self.handle_request(request)
-            conn.sendall(json.dumps(response).encode("utf-8") + b"\n")
-        except json.JSONDecodeError as e:
-            error = {"ok": False, "error": f"Invalid JSON: {e}"}
-            conn.sendall(json.dumps(error).encode("utf-8") + b"\n")
-        except Exception as e:
-            error = {"ok": False, "error": str(e)}
-            conn.sendall(json.dumps(error).encode("utf-8") + b"\n")
-        finally:
-            conn.close()
-
-    def run(self) -> None:
-        """Start the daemon server."""
-        if not self.connect_dfhack():
-            print("Could not connect to DFHack. Is the game running?")
-            return
-
-        print(f"Connected to DFHack")
-
-        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.server.bind(("127.0.0.1", self.port))
-        self.server.listen(5)
-        self.server.settimeout(1.0)  # Allow checking self.running
-
-        print(f"Daemon listening on localhost:{self.port}")
-        print("Commands: snapshot, pause, unpause, play, run, quit")
-
-        self.running = True
-        while self.running:
-            try:
-                conn, addr = self.server.accept()
-                self.handle_client(conn)
-            except socket.timeout:
-                continue
-            except KeyboardInterrupt:
-                print("\nShutting down...")
-                break
-
-        self.server.close()
-        if self.client:
-            self.client.disconnect()
-        print("Daemon stopped")
-
-
-def main():
-    daemon = DFDaemon()
-    daemon.run()
-
-
-if __name__ == "__main__":
-    main()
+"""Persistent daemon for fast DFHack queries.
+
+Keeps a pool of DFHack connections open and accepts JSON commands via a
+socket on localhost:5001 (and optionally a Unix domain socket), serving
+many clients at once.
+
+Snapshots are kept hot: a background refresher checks the game clock
+every DAEMON_REFRESH_INTERVAL seconds and retakes the snapshots clients
+asked for recently once the game has moved DAEMON_REFRESH_TICKS ticks
+(or at all, if it is paused).
+Mutating commands (everything but READ_COMMANDS, including pause and
+unpause) drop the cache. Snapshot responses carry "year", "tick" (game
+clock of the data), "age" (seconds since it was taken) and "cached".
+
+The refresher also publishes the fortress summary and unit table to a
+memory-mapped state file (see dfclient.shm), for local scripts to read
+without a request. It runs on its own thread, and only while snapshots
+or the state file were read in the last DAEMON_WATCH_TIME seconds.
+
+Protocol:
+- Request: One JSON object per line
+- Response: One JSON object per line
+- A connection is a session: send any number of requests, without
+  waiting for responses. Responses come back as each request completes,
+  not necessarily in order; a request's optional "id" is copied into its
+  response (and its streamed lines) to match them up.
+- An optional "client" field names the sender; requests are scheduled
+  fairly between clients (default: one client per connection)
+
+Scheduling:
+- Read-only commands (READ_COMMANDS) run concurrently on pooled
+  connections.
+- Everything else can change the game and goes through a single writer,
+  one command at a time; each client's commands run in the order sent.
+- Both queues hand out requests round-robin by client and are bounded:
+  when full, new requests are refused with an error instead of waiting.
+- A connection has at most DAEMON_CLIENT_BACKLOG requests in flight;
+  further requests on it are read once earlier ones are answered.
+
+Commands:
+- {"cmd": "snapshot"}           - Full game state
+- {"cmd": "pause"}              - Pause game
+- {"cmd": "unpause"}            - Unpause game
+- {"cmd": "play", "seconds": N} - Run game for N seconds
+- {"cmd": "run", "command": X}  - Run DFHack console command
+- {"cmd": "run", "command": X, "stream": true}
+                                - Same, but send each output line as a
+                                  {"line": ...} object while it runs, then
+                                  the final response
+- {"cmd": "batch", "ops": [...], "atomic": false}
+                                - Run a list of commands (see BATCH_OPS) in
+                                  order, merging designations, buildings and
+                                  labors into one game call; returns a
+                                  response per op. atomic pauses the game
+                                  throughout and stops at the first failed op
+- {"cmd": "quit"}               - Shutdown daemon
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Hashable
+
+import numpy as np
+
+from dfclient.client import DFClient
+from dfclient.enums import GameEnums
+from dfclient.models import UnitBrief
+from dfclient.shm import RUNTIME_DIR, STATE_PATH, FortressState, StateWriter
+
+
+DAEMON_PORT = 5001
+
+# Unix socket path used by --unix without a path
+DAEMON_SOCKET_PATH = RUNTIME_DIR / "daemon.sock"
+
+# Seconds between the refresher's checks of the game clock
+DAEMON_REFRESH_INTERVAL = 1.0
+
+# Game ticks a cached snapshot may fall behind the game before the
+# refresher retakes it
+DAEMON_REFRESH_TICKS = 10
+
+# Seconds a snapshot radius stays cached (and the state file published)
+# after it was last requested (read)
+DAEMON_WATCH_TIME = 60.0
+
+# Snapshot radius when a request doesn't give one
+DEFAULT_RADIUS = 100
+
+# cur_year_tick runs from 0 to this within a year
+_TICKS_PER_YEAR = 403200
+
+# DFHack connections the daemon may hold open at once
+DAEMON_POOL_SIZE = 5
+
+# Seconds a unit snapshot (used to resolve dwarf names) is reused before
+# the daemon checks the game clock again
+DAEMON_SNAPSHOT_MAX_AGE = 2.0
+
+# Commands that only read game state; they run concurrently, everything
+# else is serialized through the writer
+READ_COMMANDS = frozenset({"snapshot"})
+
+# Concurrent read-only commands; one pool connection stays free for the
+# writer and one for the refresher
+DAEMON_READERS = DAEMON_POOL_SIZE - 2
+
+# Requests each queue (reads, writes) holds before refusing new ones
+DAEMON_BACKLOG = 64
+
+# Requests a connection may have in flight; past this, the daemon stops
+# reading its socket until one is answered
+DAEMON_CLIENT_BACKLOG = 8
+
+# Connections the listening socket queues before accepting them
+DAEMON_LISTEN_BACKLOG = 128
+
+# Longest request line accepted, in bytes
+DAEMON_MAX_LINE = 1 << 20
+
+
+# Dig type names -> tile_dig_designation values
+DIG_TYPES = {
+    "mine": 1,
+    "stair_updown": 2,
+    "channel": 3,
+    "ramp": 4,
+    "stair_down": 5,
+    "stair_up": 6,
+}
+
+# Workshop subtypes by build type name
+WORKSHOP_TYPES = {
+    "carpenter": 0, "farmer": 1, "mason": 2, "craftsdwarf": 3, "jeweler": 4,
+    "metalsmith": 5, "magma_forge": 6, "bowyer": 7, "mechanic": 8, "siege": 9,
+    "butcher": 10, "leather": 11, "tanner": 12, "clothier": 13, "fishery": 14,
+    "still": 15, "loom": 16, "quern": 17, "kennel": 18, "kitchen": 19,
+    "ashery": 20, "dyer": 21, "millstone": 22, "tool": 24,
+}
+FURNACE_TYPES = {
+    "furnace_smelter": 0, "furnace_wood": 1, "furnace_glass": 2, "furnace_kiln": 3,
+}
+
+# Build type name -> (building_type, subtype)
+BUILD_TYPES = {
+    **{name: ("Workshop", subtype) for name, subtype in WORKSHOP_TYPES.items()},
+    **{name: ("Furnace", subtype) for name, subtype in FURNACE_TYPES.items()},
+}
+
+# Stockpile preset names -> stockpiles library paths (other names are
+# passed through as library paths)
+STOCKPILE_PRESETS = {
+    "all": "all", "food": "cat_food", "booze": "booze", "seeds": "seeds",
+    "stone": "cat_stone", "wood": "cat_wood", "weapons": "cat_weapons",
+    "armor": "cat_armor", "ammo": "cat_ammo", "furniture": "cat_furniture",
+    "bars": "cat_bars_blocks", "gems": "cat_gems", "cloth": "cat_cloth",
+    "leather": "cat_leather", "finished_goods": "cat_finished_goods",
+    "refuse": "cat_refuse", "corpses": "cat_corpses", "animals": "cat_animals",
+    "coins": "cat_coins",
+}
+
+# Commands a batch may contain: cmd -> its required fields and their types.
+# Optional fields take the same defaults as the standalone command.
+BATCH_OPS: dict[str, dict[str, type]] = {
+    "dig": {"x1": int, "y1": int, "z1": int, "x2": int, "y2": int},
+    "build": {"type": str, "x": int, "y": int, "z": int},
+    "stockpile": {"x": int, "y": int, "z": int},
+    "labor": {"name": str, "labor": str},
+    "dig-now": {},
+    "order": {"job": str},
+    "run": {"command": str},
+    "pause": {},
+    "unpause": {},
+    "tick": {},
+    "play": {},
+}
+
+# Optional fields of batch ops and their types, checked when present
+BATCH_OPTIONAL_FIELDS: dict[str, dict[str, type]] = {
+    "dig": {"type": str},
+    "stockpile": {"width": int, "height": int, "preset": str},
+    "labor": {"enabled": bool},
+    "order": {"amount": int},
+    "tick": {"ticks": int},
+    "play": {"seconds": int},
+}
+
+# Batch ops applied together in one dfclient.batch.apply call when adjacent
+_LUA_BATCH_OPS = frozenset({"dig", "build", "stockpile", "labor"})
+
+# Batch ops that let the game run, so can't be part of an atomic batch
+_UNPAUSING_OPS = frozenset({"unpause", "tick", "play"})
+
+
+async def _read_request_line(reader: asyncio.StreamReader) -> bytes:
+    """Read one request line (b"" at EOF).
+
+    Raises:
+        ValueError: If the line is longer than the reader's limit, after
+            discarding all of it up to and including its newline
+    """
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as e:
+        # EOF; a last line without a newline still counts
+        return e.partial
+    except asyncio.LimitOverrunError as e:
+        overrun = e.consumed
+    try:
+        while True:
+            # Drop what is buffered; the rest of the line may still be coming
+            await reader.readexactly(overrun)
+            try:
+                await reader.readuntil(b"\n")
+                break
+            except asyncio.LimitOverrunError as e:
+                overrun = e.consumed
+    except asyncio.IncompleteReadError:
+        return b""
+    raise ValueError("Request line too long")
+
+
+def _is_field_type(value: Any, field_type: type) -> bool:
+    """Whether a JSON value has a batch op field's type (booleans aren't ints)."""
+    return isinstance(value, field_type) and (field_type is bool or not isinstance(value, bool))
+
+
+def _format_dwarf(entry: list[Any], enums: GameEnums) -> str:
+    """One dwarf of a dfclient.snapshot state as "pos|name|job|stress|..."."""
+    (x, y, name, job, stress, wounds, blood, hunger, thirst, sleepiness,
+     need, emotion, skill, skill_level) = entry
+    phys = []
+    if wounds > 0:
+        phys.append(f"{wounds} wounds")
+    if blood < 80:
+        phys.append(f"{blood}% blood")
+    if hunger < 75000:
+        phys.append("hungry")
+    if thirst < 75000:
+        phys.append("thirsty")
+    if sleepiness < 50000:
+        phys.append("tired")
+
+    parts = [
+        f"{x},{y}", name, enums.job_type.name(job) if job >= 0 else "idle",
+        f"stress:{stress}", ",".join(phys) or "healthy",
+    ]
+    if need >= 0:
+        parts.append(f"needs:{enums.need_type.name(need)}")
+    if emotion >= 0:
+        parts.append(f"feeling:{enums.emotion_type.name(emotion)}")
+    if skill >= 0:
+        parts.append(f"best:{enums.job_skill.name(skill)}({skill_level})")
+    return "|".join(parts)
+
+
+def _format_building(entry: list[Any], enums: GameEnums) -> str:
+    """One building of a dfclient.snapshot state as "pos|type|custom"."""
+    x, y, building_type, subtype, building_id = entry
+    type_name = enums.building_type.name(building_type)
+    custom = ""
+    if type_name == "Workshop":
+        custom = enums.workshop_type.name(subtype)
+    elif type_name == "Furnace":
+        custom = enums.furnace_type.name(subtype)
+    elif type_name == "Stockpile":
+        custom = f"id={building_id}"
+    return f"{x},{y}|{type_name}|{custom}"
+
+
+class DaemonBusy(Exception):
+    """A request was refused because the daemon's backlog is full."""
+
+
+@dataclass
+class _CachedState:
+    """A formatted snapshot and the game clock when it was taken."""
+    data: dict[str, Any]
+    year: int
+    tick: int
+    taken: float  # time.monotonic()
+
+    @property
+    def ticks(self) -> int:
+        return self.year * _TICKS_PER_YEAR + self.tick
+
+
+@dataclass
+class _Job:
+    """A queued request and the future its response is delivered to."""
+    request: dict
+    future: asyncio.Future
+    emit: Callable[[str], None] | None = None
+
+
+class _FairQueue:
+    """Bounded request queue that takes turns between clients.
+
+    Each client's requests come out in the order they were put in; between
+    clients, get() goes round-robin, so one client with a long backlog
+    can't starve the others.
+    """
+
+    def __init__(self, limit: int = DAEMON_BACKLOG):
+        self.limit = limit
+        # client -> its pending jobs; dict order is the turn order
+        self._clients: dict[Hashable, deque[_Job]] = {}
+        self._size = 0
+        self._available = asyncio.Semaphore(0)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def put_nowait(self, client: Hashable, job: _Job) -> None:
+        """Queue a job for a client.
+
+        Raises:
+            DaemonBusy: If the queue is full
+        """
+        if self._size >= self.limit:
+            raise DaemonBusy(f"Daemon busy: {self._size} requests queued")
+        jobs = self._clients.get(client)
+        if jobs is None:
+            jobs = self._clients[client] = deque()
+        jobs.append(job)
+        self._size += 1
+        self._available.release()
+
+    async def get(self) -> _Job:
+        """Wait for the next job, taking clients in turn."""
+        await self._available.acquire()
+        client = next(iter(self._clients))
+        jobs = self._clients.pop(client)
+        job = jobs.popleft()
+        if jobs:
+            # Back of the line until every other client has had a turn
+            self._clients[client] = jobs
+        self._size -= 1
+        return job
+
+    def clear(self) -> list[_Job]:
+        """Remove and return every queued job."""
+        jobs = [job for pending in self._clients.values() for job in pending]
+        self._clients.clear()
+        self._size = 0
+        self._available = asyncio.Semaphore(0)
+        return jobs
+
+
+class DFDaemon:
+    """Daemon that keeps DFHack connections open for fast queries."""
+
+    def __init__(
+        self,
+        port: int = DAEMON_PORT,
+        unix_path: Path | str | None = None,
+        state_path: Path | str | None = STATE_PATH,
+    ):
+        """
+        Args:
+            port: TCP port on localhost
+            unix_path: Also listen on this Unix domain socket
+            state_path: State file to publish to; None to not publish
+        """
+        self.port = port
+        self.unix_path = unix_path
+        self.state_path = state_path
+        self.client: DFClient | None = None
+        self.server: asyncio.Server | None = None
+        self.running = False
+        self._reads: _FairQueue | None = None
+        self._writes: _FairQueue | None = None
+        self._stopped: asyncio.Event | None = None
+        self._state_writer: StateWriter | None = None
+        # Hot snapshot cache: radius -> newest snapshot. Mutations clear it
+        # and bump the generation, so snapshots taken before are not stored.
+        self._states: dict[int, _CachedState] = {}
+        self._state_generation = 0
+        self._state_lock = threading.Lock()
+        # Radius -> when a snapshot of it was last requested
+        self._watched: dict[int, float] = {}
+        # (generation, year, tick) and payload last written to the state file
+        self._published: tuple[tuple[int, int, int], bytes] | None = None
+
+    def connect_dfhack(self) -> bool:
+        """Connect to DFHack."""
+        try:
+            self.client = DFClient(pool_size=DAEMON_POOL_SIZE, snapshot_max_age=DAEMON_SNAPSHOT_MAX_AGE)
+            status = self.client.connect()
+            if status.connected:
+                # Load (or fetch and cache) the raws and enum tables now
+                # rather than on the first command
+                self.client.get_raws()
+                self.client.get_enums()
+            return status.connected
+        except Exception as e:
+            print(f"Failed to connect to DFHack: {e}")
+            return False
+
+    def _get_state(self, radius: int = DEFAULT_RADIUS) -> dict[str, Any]:
+        """Get camera-centered game state via the dfclient.snapshot Lua module.
+
+        Only returns entities within `radius` tiles of camera on same Z-level.
+        """
+        return self._read_state(radius)[0]
+
+    def _read_state(self, radius: int) -> tuple[dict[str, Any], int, int]:
+        """_get_state's data plus the game clock (year, tick) it was read at."""
+        state = self.client.call_lua("dfclient.snapshot", "state", [radius], timeout=5.0)
+        raws = self.client.get_raws()
+        enums = self.client.get_enums()
+
+        # Empty Lua tables come back as {} rather than []
+        items = [
+            f"{x},{y}|{enums.item_type.name(item_type)}|{material}"
+            for x, y, item_type, material in state.get("items") or []
+        ]
+        if state.get("items_truncated"):
+            items.append("...|more items truncated")
+        data = {
+            "camera": state.get("camera", ""),
+            "year": state.get("year", ""),
+            "dwarves": [_format_dwarf(entry, enums) for entry in state.get("dwarves") or []],
+            "creatures": [
+                f"{x},{y}|{raws.creature(race)}|{enums.job_type.name(job) if job >= 0 else 'wandering'}"
+                for x, y, race, job in state.get("creatures") or []
+            ],
+            "threats": [f"{x},{y}|{raws.creature(race)}" for x, y, race in state.get("threats") or []],
+            "buildings": [_format_building(entry, enums) for entry in state.get("buildings") or []],
+            "items": items,
+            "terrain": self._terrain_summary(state.get("terrain") or []),
+            "jobs": [
+                f"{x},{y}|{enums.job_type.name(job)}|{worker}"
+                for x, y, job, worker in state.get("jobs") or []
+            ],
+            "recent": state.get("recent") or [],
+        }
+
+        hint = "Use Lua to dig, build, assign labors, or investigate further."
+        if data["threats"]:
+            hint = "THREATS IN VIEW! Use exterminate or military. " + hint
+
+        data["hint"] = hint
+        year, tick = state.get("clock") or (0, 0)
+        return data, year, tick
+
+    def _take_state(self, radius: int) -> _CachedState:
+        """Read a snapshot and cache it, unless a mutation ran meanwhile."""
+        with self._state_lock:
+            generation = self._state_generation
+        data, year, tick = self._read_state(radius)
+        entry = _CachedState(data, year, tick, time.monotonic())
+        with self._state_lock:
+            if generation == self._state_generation:
+                self._states[radius] = entry
+        return entry
+
+    def cmd_snapshot(self, radius: int) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Camera-centered state, from the cache when it holds one.
+
+        Returns (data, metadata): the snapshot's game year and tick, its
+        age in seconds and whether it came from the cache.
+        """
+        with self._state_lock:
+            self._watched[radius] = time.monotonic()
+            entry = self._states.get(radius)
+        cached = entry is not None
+        if entry is None:
+            entry = self._take_state(radius)
+        return entry.data, {
+            "year": entry.year,
+            "tick": entry.tick,
+            "age": round(time.monotonic() - entry.taken, 3),
+            "cached": cached,
+        }
+
+    def invalidate_states(self) -> None:
+        """Drop cached snapshots, e.g. after a command changed the game."""
+        with self._state_lock:
+            self._state_generation += 1
+            self._states.clear()
+
+    @staticmethod
+    def _is_behind(entry: _CachedState, ticks: int, paused: bool) -> bool:
+        """Whether a cached snapshot should be retaken at game time ``ticks``.
+
+        While the game runs it may lag DAEMON_REFRESH_TICKS; once paused it
+        has to match exactly.
+        """
+        lag = abs(ticks - entry.ticks)
+        return lag >= DAEMON_REFRESH_TICKS or (lag > 0 and paused)
+
+    def _refresh(self) -> None:
+        """Retake watched snapshots that fell behind the game and republish the state file.
+
+        Does nothing (not even read the clock) while no snapshot is watched
+        and nobody reads the state file.
+        """
+        now = time.monotonic()
+        with self._state_lock:
+            for radius, requested in list(self._watched.items()):
+                if now - requested > DAEMON_WATCH_TIME:
+                    del self._watched[radius]
+                    self._states.pop(radius, None)
+            watched = bool(self._watched)
+        publish = bool(self._state_writer) and time.time() - self._state_writer.last_read() <= DAEMON_WATCH_TIME
+        if not (watched or publish):
+            return
+
+        year, tick, paused = self.client.call_lua("dfclient.snapshot", "clock", timeout=1.0)
+        ticks = year * _TICKS_PER_YEAR + tick
+        with self._state_lock:
+            behind = [
+                radius for radius in self._watched
+                if radius not in self._states or self._is_behind(self._states[radius], ticks, paused)
+            ]
+            generation = self._state_generation
+        for radius in behind:
+            self._take_state(radius)
+        if publish:
+            self._publish_state((generation, year, tick))
+
+    def _publish_state(self, key: tuple[int, int, int]) -> None:
+        """Write the fortress summary and unit table to the state file.
+
+        key is (cache generation, year, tick); while it stays the same the
+        last payload is written again, to renew its publish time.
+        """
+        if self._published is None or self._published[0] != key:
+            _, year, tick = key
+            # The summary's unit list refreshes the snapshot the table is read from
+            summary = self.client.get_summary()
+            units = self.client.get_unit_table()
+            raws = self.client.get_raws()
+            creatures = {race: raws.creature(race) for race in np.unique(units.race).tolist()}
+            self._published = key, FortressState(summary, units, creatures, year, tick).encode()
+        self._state_writer.publish(self._published[1])
+
+    def _terrain_summary(self, tiles: list[int]) -> str:
+        """Count walls, floors, stairs, water and trees among sampled tiletypes."""
+        tiletypes = self.client.get_tiletypes()
+        tiles = np.array(tiles, dtype=np.intp)
+        counts = {
+            "walls": tiletypes.shape_is(tiles, "WALL"),
+            "floors": tiletypes.shape_is(tiles, "FLOOR"),
+            "stairs": tiletypes.shape_is(tiles, "STAIR_UP", "STAIR_DOWN", "STAIR_UPDOWN"),
+            "water": tiletypes.material_is(tiles, "POOL", "RIVER"),
+            "trees": tiletypes.material_is(tiles, "TREE_MATERIAL"),
+        }
+        return "|".join(f"{name}={int(mask.sum())}" for name, mask in counts.items())
+
+    def cmd_pause(self) -> dict[str, Any]:
+        """Pause the game."""
+        if not self.client:
+            return {"error": "Not connected"}
+        try:
+            self.client.pause()
+            return {"paused": True}
+        except Exception as e:
+            return {"error": str(e)}
+
+    def cmd_unpause(self) -> dict[str, Any]:
+        """Unpause the game."""
+        if not self.client:
+            return {"error": "Not connected"}
+        try:
+            self.client.unpause()
+            return {"paused": False}
+        except Exception as e:
+            return {"error": str(e)}
+
+    def cmd_play(self, seconds: int) -> dict[str, Any]:
+        """Run game for N seconds, return state after."""
+        if not self.client:
+            return {"error": "Not connected"}
+
+        try:
+            self.client.unpause()
+            time.sleep(seconds)
+            self.client.pause()
+            state = self._get_state()
+            state["seconds"] = seconds
+            return state
+        except Exception as e:
+            return {"error": str(e)}
+
+    def cmd_tick(self, ticks: int) -> dict[str, Any]:
+        """Advance game by N ticks (faster than play, uses polling).
+
+        With timestream enabled, this is much faster than real-time waiting.
+        """
+        if not self.client:
+            return {"error": "Not connected"}
+
+        try:
+            # Get current tick
+            start_tick = self.client.call_lua("dfclient.snapshot", "tick", timeout=1.0)
+            target_tick = start_tick + ticks
+
+            self.client.unpause()
+
+            # Poll for tick advancement (check every 50ms)
+            max_iterations = ticks * 10  # Safety limit
+            iterations = 0
+            while iterations < max_iterations:
+                time.sleep(0.05)
+                current_tick = self.client.call_lua("dfclient.snapshot", "tick", timeout=1.0)
+                if current_tick >= target_tick:
+                    break
+                iterations += 1
+
+            self.client.pause()
+            state = self._get_state()
+            state["ticks_advanced"] = current_tick - start_tick
+            return state
+        except Exception as e:
+            return {"error": str(e)}
+
+    def cmd_run(self, command: str) -> dict[str, Any]:
+        """Run a DFHack console command."""
+        if not self.client:
+            return {"error": "Not connected"}
+        try:
+            result = self.client.run_command(command, timeout=5.0)
+            return {"output": result}
+        except Exception as e:
+            return {"error": str(e)}
+
+    def cmd_run_stream(self, command: str, emit: Callable[[str], None]) -> dict[str, Any]:
+        """Run a DFHack console command, passing each output line to emit as it arrives."""
+        if not self.client:
+            return {"error": "Not connected"}
+        try:
+            count = 0
+            for line in self.client.iter_command(command):
+                emit(line)
+                count += 1
+            return {"lines": count}
+        except Exception as e:
+            return {"error": str(e)}
+
+    def _diggable_tiletypes(self) -> list[int]:
+        """Ids of the tiletypes dig designations apply to (walls and floors)."""
+        tiletypes = self.client.get_tiletypes()
+        return np.flatnonzero(tiletypes.shape_is(np.arange(len(tiletypes)), "WALL", "FLOOR")).tolist()
+
+    def cmd_dig(self, x1: int, y1: int, z1: int, x2: int, y2: int, dig_type: str) -> dict[str, Any]:
+        """Designate area for digging."""
+        if not self.client:
+            return {"error": "Not connected"}
+
+        dig_val = DIG_TYPES.get(dig_type, 1)
+
+        try:
+            count = self.client.call_lua(
+                "dfclient.dig", "designate_where",
+                [x1, y1, z1, x2, y2, dig_val, self._diggable_tiletypes()],
+                timeout=3.0,
+            )
+            return {"designated": count, "type": dig_type, "area": f"({x1},{y1},{z1}) to ({x2},{y2},{z1})"}
+        except Exception as e:
+            return {"error": str(e)}
+
+    def cmd_dig_now(self) -> dict[str, Any]:
+        """Instantly complete all dig designations."""
+        if not self.client:
+            return {"error": "Not connected"}
+        try:
+            result = self.client.run_command("dig-now", timeout=10.0)
+            return {"completed": True, "output": result}
+        except Exception as e:
+            return {"error": str(e)}
+
+    def cmd_build(self, build_type: str, x: int, y: int, z: int) -> dict[str, Any]:
+        """Build workshop/furnace at position."""
+        if not self.client:
+            return {"error": "Not connected"}
+
+        if build_type not in BUILD_TYPES:
+            return {"error": f"Unknown building type: {build_type}"}
+        bld_type, subtype = BUILD_TYPES[build_type]
+
+        try:
+            result = self.client.call_lua(
+                "dfclient.build", "workshop", [bld_type, subtype, x, y, z], timeout=3.0
+            )
+            if "error" in result:
+                return {"error": result["error"]}
+            return {"built": build_type, "id": result["id"], "pos": f"({x},{y},{z})"}
+        except Exception as e:
+            return {"error": str(e)}
+
+    def cmd_stockpile(self, x: int, y: int, z: int, width: int, height: int, preset: str) -> dict[str, Any]:
+        """Create and configure a stockpile."""
+        if not self.client:
+            return {"error": "Not connected"}
+
+        lib_preset = STOCKPILE_PRESETS.get(preset, preset)
+
+        try:
+            # Step 1: Create stockpile
+            result = self.client.call_lua(
+                "dfclient.build", "stockpile", [x, y, z, width, height], timeout=3.0
+            )
+            if "error" in result:
+                return {"error": result["error"]}
+            sp_id = result["id"]
+
+            # Step 2: Configure with preset (output isn't needed, don't wait)
+            self.client.send_command(f"stockpiles import library/{lib_preset} -s {sp_id}")
+            return {"created": True, "id": sp_id, "preset": preset, "pos": f"({x},{y},{z})", "size": f"{width}x{height}"}
+        except Exception as e:
+            return {"error": str(e)}
+
+    def cmd_order(self, job_type: str, amount: int) -> dict[str, Any]:
+        """Create a manager work order."""
+        if not self.client:
+            return {"error": "Not connected"}
+
+        # Common reactions that need CustomReaction wrapper
+        reactions = {
+            "brew": "BREW_DRINK_FROM_PLANT",
+            "brew_fruit": "BREW_DRINK_FROM_PLANT_GROWTH",
+        }
+
+        # Common job types that work directly
+        direct_jobs = {
+            "MakeCharcoal", "MakeBed", "MakeBarrel", "MakeBin", "MakeTable",
+            "MakeChair", "MakeDoor", "MakeCabinet", "MakeBox", "PrepareMeal",
+            "ProcessPlants", "MillPlants", "MakeCheese", "TanHide",
+        }
+
+        try:
+            if job_type.lower() in reactions:
+                # Use reaction syntax
+                reaction_code = reactions[job_type.lower()]
+                json_str = f'{{"job":"CustomReaction","reaction":"{reaction_code}","amount":{amount}}}'
+                result = self.client.run_command(f"workorder '{json_str}'", timeout=3.0)
+            else:
+                # Try direct job type with JSON
+                json_str = f'{{"job":"{job_type}","amount":{amount}}}'
+                result = self.client.run_command(f"workorder '{json_str}'", timeout=3.0)
+
+            return {"ordered": job_type, "amount": amount, "output": result}
+        except Exception as e:
+            return {"error": str(e)}
+
+    def cmd_labor(self, name: str, labor: str, enabled: bool) -> dict[str, Any]:
+        """Enable/disable labor for a dwarf."""
+        if not self.client:
+            return {"error": "Not connected"}
+
+        try:
+            # Resolve the name from the cached unit index; names it can't
+            # match (e.g. a substring inside a word) fall back to the Lua scan
+            matches = self.client.find_citizens(name)
+            if matches:
+                result = self.client.call_lua(
+                    "dfclient.labor", "set_unit", [matches[0].id, labor, enabled], timeout=3.0
+                )
+            else:
+                result = self.client.call_lua("dfclient.labor", "set", [name, labor, enabled], timeout=3.0)
+            if "error" in result:
+                return {"error": result["error"]}
+            return {"dwarf": result["dwarf"], "labor": result["labor"], "enabled": result["enabled"]}
+        except Exception as e:
+            return {"error": str(e)}
+
+    def _check_batch_op(self, op: Any, atomic: bool) -> str | None:
+        """Why a batch op is invalid, or None if it can run."""
+        if not isinstance(op, dict):
+            return "not a JSON object"
+        cmd = op.get("cmd")
+        if cmd not in BATCH_OPS:
+            return f"{cmd!r} can't be batched"
+        for field, field_type in BATCH_OPS[cmd].items():
+            if not _is_field_type(op.get(field), field_type):
+                return f"{cmd} needs {field_type.__name__} {field!r}"
+        for field, field_type in BATCH_OPTIONAL_FIELDS.get(cmd, {}).items():
+            if field in op and not _is_field_type(op[field], field_type):
+                return f"{cmd} {field!r} must be {field_type.__name__}"
+        if atomic and cmd in _UNPAUSING_OPS:
+            return f"{cmd} unpauses the game, so it can't be part of an atomic batch"
+        if cmd == "dig" and op.get("type", "mine") not in DIG_TYPES:
+            return f"unknown dig type {op['type']!r}"
+        if cmd == "build" and op["type"] not in BUILD_TYPES:
+            return f"unknown building type {op['type']!r}"
+        if cmd == "stockpile" and not all(op.get(field, 5) > 0 for field in ("width", "height")):
+            return "stockpile width and height must be positive integers"
+        if cmd == "labor" and self.client.get_enums().unit_labor.value(op["labor"]) is None:
+            return f"unknown labor {op['labor']!r}"
+        return None
+
+    def _lua_batch_op(self, op: dict, citizens: dict[str, list[UnitBrief]]) -> list[Any]:
+        """A batch op as a dfclient.batch.apply op; citizens are the labor ops' name matches."""
+        cmd = op["cmd"]
+        if cmd == "dig":
+            return ["dig", op["x1"], op["y1"], op["z1"], op["x2"], op["y2"], DIG_TYPES[op.get("type", "mine")]]
+        if cmd == "build":
+            return ["workshop", *BUILD_TYPES[op["type"]], op["x"], op["y"], op["z"]]
+        if cmd == "stockpile":
+            return ["stockpile", op["x"], op["y"], op["z"], op.get("width", 5), op.get("height", 5)]
+        # labor: the name resolved from the unit index, as cmd_labor does
+        matches = citizens[op["name"]]
+        if matches:
+            return ["labor_unit", matches[0].id, op["labor"], op.get("enabled", True)]
+        return ["labor", op["name"], op["labor"], op.get("enabled", True)]
+
+    def _lua_batch_data(self, op: dict, result: dict) -> dict[str, Any]:
+        """The standalone command's response data for an applied op's Lua result."""
+        cmd = op["cmd"]
+        if cmd == "dig":
+            x1, y1, z1, x2, y2 = (op[field] for field in ("x1", "y1", "z1", "x2", "y2"))
+            return {
+                "designated": result["designated"], "type": op.get("type", "mine"),
+                "area": f"({x1},{y1},{z1}) to ({x2},{y2},{z1})",
+            }
+        if cmd == "build":
+            return {"built": op["type"], "id": result["id"], "pos": f"({op['x']},{op['y']},{op['z']})"}
+        if cmd == "stockpile":
+            preset = op.get("preset", "all")
+            # Configure with preset (output isn't needed, don't wait)
+            self.client.send_command(
+                f"stockpiles import library/{STOCKPILE_PRESETS.get(preset, preset)} -s {result['id']}"
+            )
+            return {
+                "created": True, "id": result["id"], "preset": preset,
+                "pos": f"({op['x']},{op['y']},{op['z']})",
+                "size": f"{op.get('width', 5)}x{op.get('height', 5)}",
+            }
+        return {"dwarf": result["dwarf"], "labor": result["labor"], "enabled": result["enabled"]}
+
+    def _apply_lua_batch(self, ops: list[dict], atomic: bool) -> list[dict[str, Any]]:
+        """Apply adjacent designation, building and labor ops in one Lua call.
+
+        Returns a result per op that was applied; with atomic, none after
+        the first failure.
+        """
+        start = time.time()
+        diggable = self._diggable_tiletypes()
+        # Every labor op's dwarf from one unit snapshot
+        names = {op["name"] for op in ops if op["cmd"] == "labor"}
+        citizens = self.client.find_citizens_many(names) if names else {}
+        lua_results = self.client.call_lua(
+            "dfclient.batch", "apply",
+            [[self._lua_batch_op(op, citizens) for op in ops], diggable, atomic],
+            timeout=10.0,
+        )
+        ms = int((time.time() - start) * 1000)
+
+        results = []
+        # An empty Lua table comes back as {} rather than []
+        for op, result in zip(ops, lua_results or []):
+            if "error" in result:
+                results.append({"ok": False, "error": result["error"], "ms": ms})
+            else:
+                results.append({"ok": True, "data": self._lua_batch_data(op, result), "ms": ms})
+        return results
+
+    def cmd_batch(self, ops: Any, atomic: bool = False) -> dict[str, Any]:
+        """Run several commands in order with as few game round trips as possible.
+
+        Every op is checked before any runs; one invalid op rejects the
+        whole batch. Runs of adjacent dig, build, stockpile and labor ops
+        are applied by a single dfclient.batch.apply call; other ops run
+        as their standalone command. Each op gets the response its
+        standalone command would give.
+
+        With atomic, the game is paused for the duration (and unpaused
+        after if it was running) and ops after the first failure are
+        skipped. Ops already applied are not undone.
+        """
+        if not self.client:
+            return {"error": "Not connected"}
+        if not isinstance(ops, list) or not ops:
+            return {"error": "batch needs a non-empty list of ops"}
+        try:
+            problems = [
+                f"op {i}: {problem}"
+                for i, op in enumerate(ops)
+                if (problem := self._check_batch_op(op, atomic))
+            ]
+        except Exception as e:
+            return {"error": str(e)}
+        if problems:
+            return {"error": "Invalid batch: " + "; ".join(problems)}
+
+        resume = False
+        if atomic:
+            try:
+                resume = not self.client.get_pause_state()
+                if resume:
+                    self.client.pause()
+            except Exception as e:
+                return {"error": str(e)}
+
+        results: list[dict[str, Any]] = []
+        lua_calls = 0
+        try:
+            i = 0
+            while i < len(ops):
+                if atomic and results and not results[-1]["ok"]:
+                    break
+                if ops[i]["cmd"] in _LUA_BATCH_OPS:
+                    end = i
+                    while end < len(ops) and ops[end]["cmd"] in _LUA_BATCH_OPS:
+                        end += 1
+                    try:
+                        results += self._apply_lua_batch(ops[i:end], atomic)
+                    except Exception as e:
+                        # Unknown which of them were applied
+                        results += [{"ok": False, "error": str(e)} for _ in range(i, end)]
+                    lua_calls += 1
+                    i = end
+                else:
+                    try:
+                        results.append(self.handle_request(ops[i]))
+                    except Exception as e:
+                        results.append({"ok": False, "error": str(e)})
+                    i += 1
+        finally:
+            if resume:
+                self.client.unpause()
+
+        # Ops not reached after a failure in an atomic batch
+        if len(results) < len(ops):
+            failed = len(results) - 1
+            results += [
+                {"ok": False, "error": f"Skipped: op {failed} failed", "skipped": True}
+                for _ in range(len(results), len(ops))
+            ]
+        return {
+            "results": results,
+            "failed": sum(not result["ok"] for result in results),
+            "lua_calls": lua_calls,
+            "atomic": atomic,
+        }
+
+    def handle_request(self, request: dict, emit: Callable[[str], None] | None = None) -> dict[str, Any]:
+        """Handle a JSON request and return response.
+
+        emit, if given, receives output lines of streaming requests
+        ({"cmd": "run", "stream": true}) as they arrive.
+        """
+        start = time.time()
+        cmd = request.get("cmd", "")
+
+        meta = {}
+        if cmd == "snapshot":
+            radius = request.get("radius", DEFAULT_RADIUS)
+            data, meta = self.cmd_snapshot(int(radius))
+        elif cmd == "pause":
+            data = self.cmd_pause()
+        elif cmd == "unpause":
+            data = self.cmd_unpause()
+        elif cmd == "play":
+            seconds = request.get("seconds", 5)
+            data = self.cmd_play(int(seconds))
+        elif cmd == "tick":
+            ticks = request.get("ticks", 100)
+            data = self.cmd_tick(int(ticks))
+        elif cmd == "run":
+            command = request.get("command", "")
+            if request.get("stream") and emit:
+                data = self.cmd_run_stream(command, emit)
+            else:
+                data = self.cmd_run(command)
+        elif cmd == "quit":
+            self.running = False
+            data = {"shutdown": True}
+        # Designation commands
+        elif cmd == "dig":
+            data = self.cmd_dig(
+                request.get("x1", 0), request.get("y1", 0), request.get("z1", 0),
+                request.get("x2", 0), request.get("y2", 0), request.get("type", "mine")
+            )
+        elif cmd == "dig-now":
+            data = self.cmd_dig_now()
+        elif cmd == "build":
+            data = self.cmd_build(
+                request.get("type", ""), request.get("x", 0),
+                request.get("y", 0), request.get("z", 0)
+            )
+        elif cmd == "stockpile":
+            data = self.cmd_stockpile(
+                request.get("x", 0), request.get("y", 0), request.get("z", 0),
+                request.get("width", 5), request.get("height", 5), request.get("preset", "all")
+            )
+        elif cmd == "order":
+            data = self.cmd_order(request.get("job", ""), request.get("amount", 1))
+        elif cmd == "labor":
+            data = self.cmd_labor(
+                request.get("name", ""), request.get("labor", ""),
+                request.get("enabled", True)
+            )
+        elif cmd == "batch":
+            data = self.cmd_batch(request.get("ops"), bool(request.get("atomic", False)))
+        else:
+            data = {"error": f"Unknown command: {cmd}"}
+
+        ms = int((time.time() - start) * 1000)
+
+        if cmd not in READ_COMMANDS:
+            self.invalidate_states()
+
+        if "error" in data:
+            return {"ok": False, "error": data["error"], "ms": ms}
+        return {"ok": True, "data": data, "ms": ms, **meta}
+
+    async def submit(self, request: dict, client: Hashable, emit: Callable[[str], None] | None = None) -> dict[str, Any]:
+        """Queue a request behind the reader or writer workers and await its response.
+
+        emit is called from a worker thread.
+        """
+        if request.get("cmd") == "quit":
+            response = self.handle_request(request)
+            self._stopped.set()
+            return response
+
+        queue = self._reads if request.get("cmd") in READ_COMMANDS else self._writes
+        job = _Job(request, asyncio.get_running_loop().create_future(), emit)
+        try:
+            queue.put_nowait(client, job)
+        except DaemonBusy as e:
+            return {"ok": False, "error": str(e)}
+        return await job.future
+
+    async def _worker(self, queue: _FairQueue, executor: ThreadPoolExecutor) -> None:
+        """Run queued requests one at a time on an executor thread."""
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await queue.get()
+            if job.future.done():
+                continue
+            try:
+                response = await loop.run_in_executor(executor, self.handle_request, job.request, job.emit)
+            except asyncio.CancelledError:
+                if not job.future.done():
+                    job.future.set_result({"ok": False, "error": "Daemon shutting down"})
+                raise
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            if not job.future.done():
+                job.future.set_result(response)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve a client session: read requests until EOF, answer each as it completes.
+
+        Requests are not answered in order; a response (and every streamed
+        line) carries the "id" of its request, if it had one. Once
+        DAEMON_CLIENT_BACKLOG requests are in flight, the next line is only
+        read when one of them is answered, so a pipelining client waits
+        instead of being refused.
+        """
+        loop = asyncio.get_running_loop()
+        # Unix socket peers have no address
+        peer = writer.get_extra_info("peername") or id(writer)
+        pending: set[asyncio.Task] = set()
+        slots = asyncio.Semaphore(DAEMON_CLIENT_BACKLOG)
+
+        def send(message: dict) -> None:
+            if not writer.is_closing():
+                writer.write(json.dumps(message).encode("utf-8") + b"\n")
+
+        async def answer(request: dict) -> None:
+            request_id = request.get("id")
+
+            def tagged(message: dict) -> dict:
+                return message if request_id is None else {"id": request_id, **message}
+
+            async def send_line(line: str) -> None:
+                send(tagged({"line": line}))
+                await writer.drain()
+
+            def emit(line: str) -> None:
+                # Called from a worker thread; blocks it until the line has
+                # left the buffer, so a slow client slows the command down
+                # instead of letting its output pile up
+                asyncio.run_coroutine_threadsafe(send_line(line), loop).result()
+
+            try:
+                client = request.get("client") or peer
+                response = await self.submit(request, client, emit if request.get("stream") else None)
+                send(tagged(response))
+                await writer.drain()
+            finally:
+                slots.release()
+
+        try:
+            while True:
+                try:
+                    line = await _read_request_line(reader)
+                except ValueError:
+                    # The overlong line was discarded; the session can go on
+                    send({"ok": False, "error": f"Request longer than {DAEMON_MAX_LINE} bytes"})
+                    continue
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as e:
+                    send({"ok": False, "error": f"Invalid JSON: {e}"})
+                    continue
+                if not isinstance(request, dict):
+                    send({"ok": False, "error": "Request must be a JSON object"})
+                    continue
+                # Both are used as keys (command sets, the fair queue)
+                problem = None
+                if not isinstance(request.get("cmd", ""), str):
+                    problem = '"cmd" must be a string'
+                elif not isinstance(request.get("client", ""), str):
+                    problem = '"client" must be a string'
+                if problem:
+                    error = {"ok": False, "error": f"Invalid request: {problem}"}
+                    send(error if request.get("id") is None else {"id": request["id"], **error})
+                    continue
+                await slots.acquire()
+                task = asyncio.create_task(answer(request))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            # The client is done sending; it may still be reading
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            for task in pending:
+                task.cancel()
+            writer.close()
+
+    async def _refresh_loop(self, executor: ThreadPoolExecutor) -> None:
+        """Run the refresher every DAEMON_REFRESH_INTERVAL seconds."""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await loop.run_in_executor(executor, self._refresh)
+            except Exception as e:
+                print(f"Background refresh failed: {e}")
+            await asyncio.sleep(DAEMON_REFRESH_INTERVAL)
+
+    async def serve(self) -> None:
+        """Accept clients until a quit command arrives."""
+        self._reads = _FairQueue()
+        self._writes = _FairQueue()
+        self._stopped = asyncio.Event()
+        read_executor = ThreadPoolExecutor(DAEMON_READERS, thread_name_prefix="dfdaemon-read")
+        write_executor = ThreadPoolExecutor(1, thread_name_prefix="dfdaemon-write")
+        workers = [asyncio.create_task(self._worker(self._writes, write_executor))]
+        workers += [
+            asyncio.create_task(self._worker(self._reads, read_executor))
+            for _ in range(DAEMON_READERS)
+        ]
+        refresh_executor = ThreadPoolExecutor(1, thread_name_prefix="dfdaemon-refresh")
+        workers.append(asyncio.create_task(self._refresh_loop(refresh_executor)))
+
+        if self.state_path is not None:
+            try:
+                self._state_writer = StateWriter(self.state_path)
+                print(f"Publishing state to {self.state_path}")
+            except OSError as e:
+                print(f"Not publishing state: {e}")
+
+        self.server = await asyncio.start_server(
+            self.handle_client, "127.0.0.1", self.port,
+            backlog=DAEMON_LISTEN_BACKLOG, limit=DAEMON_MAX_LINE, reuse_address=True,
+        )
+        servers = [self.server]
+        print(f"Daemon listening on localhost:{self.port}")
+        if self.unix_path is not None:
+            Path(self.unix_path).parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            servers.append(await asyncio.start_unix_server(
+                self.handle_client, self.unix_path,
+                backlog=DAEMON_LISTEN_BACKLOG, limit=DAEMON_MAX_LINE, cleanup_socket=True,
+            ))
+            print(f"Daemon listening on {self.unix_path}")
+        print("Commands: snapshot, pause, unpause, play, run, quit")
+
+        self.running = True
+        try:
+            await self._stopped.wait()
+        finally:
+            self.running = False
+            for server in servers:
+                server.close()
+                server.close_clients()
+            for job in self._reads.clear() + self._writes.clear():
+                job.future.set_result({"ok": False, "error": "Daemon shutting down"})
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            # Clients still not reading what was sent to them would keep a
+            # streaming command blocked in emit
+            for server in servers:
+                server.abort_clients()
+            # Let a command that is already running (e.g. play) finish; the
+            # loop keeps running meanwhile, as streamed lines are sent by it
+            await asyncio.to_thread(read_executor.shutdown)
+            await asyncio.to_thread(write_executor.shutdown)
+            await asyncio.to_thread(refresh_executor.shutdown)
+            if self._state_writer:
+                self._state_writer.close()
+                self._state_writer = None
+
+    def run(self) -> None:
+        """Start the daemon server."""
+        if not self.connect_dfhack():
+            print("Could not connect to DFHack. Is the game running?")
+            return
+
+        print(f"Connected to DFHack")
+
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            print("\nShutting down...")
+
+        if self.client:
+            self.client.disconnect()
+        print("Daemon stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DFClient daemon for fast queries")
+    parser.add_argument("--port", type=int, default=DAEMON_PORT, help=f"TCP port (default: {DAEMON_PORT})")
+    parser.add_argument(
+        "--unix", nargs="?", const=str(DAEMON_SOCKET_PATH), metavar="PATH",
+        help=f"Also listen on a Unix domain socket (default path: {DAEMON_SOCKET_PATH})",
+    )
+    parser.add_argument("--state-file", default=str(STATE_PATH), help=f"State file (default: {STATE_PATH})")
+    parser.add_argument("--no-state-file", action="store_true", help="Don't publish a state file")
+    args = parser.parse_args()
+
+    daemon = DFDaemon(
+        port=args.port,
+        unix_path=args.unix,
+        state_path=None if args.no_state_file else args.state_file,
+    )
+    daemon.run()
+
+
+if __name__ == "__main__":
+    main()
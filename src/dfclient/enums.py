@@ -0,0 +1,69 @@
+"""Game enum tables (df.profession, df.job_type, ...) read from the running game."""
+
+from typing import Any, Iterable
+
+# Enums GameEnums reads, by df-structures name
+GAME_ENUMS = (
+    "profession",
+    "job_type",
+    "job_skill",
+    "unit_labor",
+    "need_type",
+    "emotion_type",
+    "building_type",
+    "workshop_type",
+    "furnace_type",
+    "item_type",
+)
+
+
+class EnumTable:
+    """Value <-> name of one game enum.
+
+    ``names[i]`` is the name of value ``first + i``; values the enum
+    leaves out have an empty name.
+    """
+
+    def __init__(self, first: int, names: list[str]):
+        self.first = first
+        self.names = names
+        self._values = {name: first + i for i, name in enumerate(names) if name}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def name(self, value: int) -> str:
+        """Name of a value, or UNKNOWN_<value> if the enum has none."""
+        i = value - self.first
+        if 0 <= i < len(self.names) and self.names[i]:
+            return self.names[i]
+        return f"UNKNOWN_{value}"
+
+    def value(self, name: str) -> int | None:
+        """Value of a name, or None if the enum has no such name."""
+        return self._values.get(name)
+
+    def values(self, names: Iterable[str]) -> list[int]:
+        """Values of the names the enum has, in order; others are skipped."""
+        return [self._values[name] for name in names if name in self._values]
+
+
+class GameEnums:
+    """The GAME_ENUMS tables of the loaded DF version, one attribute each."""
+
+    profession: EnumTable
+    job_type: EnumTable
+    job_skill: EnumTable
+    unit_labor: EnumTable
+    need_type: EnumTable
+    emotion_type: EnumTable
+    building_type: EnumTable
+    workshop_type: EnumTable
+    furnace_type: EnumTable
+    item_type: EnumTable
+
+    def __init__(self, data: dict[str, Any]):
+        """data: dfclient.enums.tables' reply, name -> {first, names}."""
+        for name in GAME_ENUMS:
+            entry = data.get(name) or {}
+            setattr(self, name, EnumTable(entry.get("first", 0), entry.get("names") or []))
@@ -0,0 +1,406 @@
+-- Action library: the patterns from actions/*.lua as callable functions.
+-- Called from Python through DFClient.actions (dfclient/actions.py).
+
+local M = {}
+
+local function citizen_by_id(unit_id)
+  local u = df.unit.find(unit_id)
+  if not u then error("Unit not found: " .. unit_id) end
+  return u
+end
+
+local function job_name(u, default)
+  return u.job.current_job and df.job_type[u.job.current_job.job_type] or default
+end
+
+local function each_job(fn)
+  local link = df.global.world.jobs.list.next
+  while link do
+    if link.item and fn(link.item) then return link.item end
+    link = link.next
+  end
+end
+
+local function each_labor(fn)
+  for i = math.max(0, df.unit_labor._first_item), df.unit_labor._last_item do
+    fn(i, df.unit_labor[i])
+  end
+end
+
+local function is_hostile(u)
+  return u.flags1.marauder or u.flags1.active_invader or u.flags2.visitor_hostile
+end
+
+-- =============================================================================
+-- Citizens (actions/citizens.lua)
+-- =============================================================================
+
+-- Citizens with name, profession, stress category and current job.
+function M.citizens()
+  local out = {}
+  for _, u in ipairs(df.global.world.units.active) do
+    if dfhack.units.isCitizen(u) then
+      table.insert(out, {
+        id = u.id,
+        name = dfhack.units.getReadableName(u),
+        profession = dfhack.units.getProfessionName(u),
+        stress = dfhack.units.getStressCategory(u),
+        job = job_name(u, "idle"),
+      })
+    end
+  end
+  return out
+end
+
+-- Citizens whose name contains `fragment` (case-insensitive).
+function M.find_citizens(fragment)
+  local needle = fragment:lower()
+  local out = {}
+  for _, u in ipairs(df.global.world.units.active) do
+    if dfhack.units.isCitizen(u) then
+      local name = dfhack.units.getReadableName(u)
+      if name:lower():find(needle, 1, true) then
+        table.insert(out, {id = u.id, name = name})
+      end
+    end
+  end
+  return out
+end
+
+-- Skill name -> rating for skills above zero.
+function M.unit_skills(unit_id)
+  local u = citizen_by_id(unit_id)
+  local out = {}
+  if u.status.current_soul then
+    for _, s in ipairs(u.status.current_soul.skills) do
+      if s.rating > 0 then out[df.job_skill[s.id]] = s.rating end
+    end
+  end
+  return out
+end
+
+-- Need name -> focus level for unmet (negative focus) needs.
+function M.unit_needs(unit_id)
+  local u = citizen_by_id(unit_id)
+  local out = {}
+  if u.status.current_soul then
+    for _, n in ipairs(u.status.current_soul.personality.needs) do
+      if n.focus_level < 0 then out[df.need_type[n.id]] = n.focus_level end
+    end
+  end
+  return out
+end
+
+-- Current emotions, oldest first.
+function M.unit_emotions(unit_id)
+  local u = citizen_by_id(unit_id)
+  local out = {}
+  if u.status.current_soul then
+    for _, e in ipairs(u.status.current_soul.personality.emotions) do
+      table.insert(out, {type = df.emotion_type[e.type], strength = e.strength})
+    end
+  end
+  return out
+end
+
+-- =============================================================================
+-- Needs and physical state (actions/needs.lua)
+-- =============================================================================
+
+-- Hunger/thirst/sleep timers, stress, latest emotion, wounds and blood.
+function M.unit_condition(unit_id)
+  local u = citizen_by_id(unit_id)
+  local out = {
+    hunger_timer = u.counters2.hunger_timer,
+    thirst_timer = u.counters2.thirst_timer,
+    sleepiness_timer = u.counters2.sleepiness_timer,
+    stress = dfhack.units.getStressCategory(u),
+    wounds = #u.body.wounds,
+    blood = u.body.blood_count,
+    blood_max = u.body.blood_max,
+  }
+  local soul = u.status.current_soul
+  if soul and #soul.personality.emotions > 0 then
+    local em = soul.personality.emotions[#soul.personality.emotions - 1]
+    out.emotion = df.emotion_type[em.type]
+  end
+  return out
+end
+
+-- Reset hunger, thirst and sleepiness of every living citizen.
+-- Returns the number of citizens touched.
+function M.satisfy_needs()
+  local count = 0
+  for _, u in ipairs(df.global.world.units.active) do
+    if dfhack.units.isCitizen(u) and dfhack.units.isAlive(u) then
+      u.counters2.hunger_timer = 100000
+      u.counters2.thirst_timer = 100000
+      u.counters2.sleepiness_timer = 100000
+      count = count + 1
+    end
+  end
+  return count
+end
+
+-- =============================================================================
+-- Labors (actions/labor.lua)
+-- =============================================================================
+
+-- Names of the labors enabled for a unit.
+function M.unit_labors(unit_id)
+  local u = citizen_by_id(unit_id)
+  local out = {}
+  each_labor(function(i, name)
+    if u.status.labors[i] then table.insert(out, name) end
+  end)
+  return out
+end
+
+-- Enable or disable labors (df.unit_labor names) for a unit.
+-- Returns the number of labors changed.
+function M.set_labors(unit_id, labors, enabled)
+  local u = citizen_by_id(unit_id)
+  local ids = {}
+  for _, name in ipairs(labors) do
+    local id = df.unit_labor[name]
+    if not id then error("Unknown labor " .. name) end
+    table.insert(ids, id)
+  end
+  local changed = 0
+  for _, id in ipairs(ids) do
+    if u.status.labors[id] ~= enabled then
+      u.status.labors[id] = enabled
+      changed = changed + 1
+    end
+  end
+  return changed
+end
+
+-- Disable every labor except `labor` (e.g. a dedicated miner).
+function M.only_labor(unit_id, labor)
+  local u = citizen_by_id(unit_id)
+  local keep = df.unit_labor[labor]
+  if not keep then error("Unknown labor " .. labor) end
+  each_labor(function(i)
+    u.status.labors[i] = (i == keep)
+  end)
+  return true
+end
+
+-- =============================================================================
+-- Digging (actions/dig.lua)
+-- =============================================================================
+
+-- Designate a rectangle with a df.tile_dig_designation name and create the
+-- dig jobs. Returns the number of tiles designated.
+function M.dig_area(x1, y1, x2, y2, z, designation)
+  local dig = df.tile_dig_designation[designation or "Default"]
+  if not dig then error("Unknown dig designation " .. tostring(designation)) end
+  local count = 0
+  for x = math.min(x1, x2), math.max(x1, x2) do
+    for y = math.min(y1, y2), math.max(y1, y2) do
+      local block = dfhack.maps.getTileBlock(x, y, z)
+      if block then
+        block.designation[x % 16][y % 16].dig = dig
+        block.flags.designated = true
+        count = count + 1
+      end
+    end
+  end
+  dfhack.job.checkDesignationsNow()
+  return count
+end
+
+-- =============================================================================
+-- Jobs (actions/jobs.lua)
+-- =============================================================================
+
+-- Every job in the world: id, type, position and worker name.
+function M.jobs()
+  local out = {}
+  each_job(function(j)
+    local worker = dfhack.job.getWorker(j)
+    table.insert(out, {
+      id = j.id,
+      type = df.job_type[j.job_type],
+      pos = {j.pos.x, j.pos.y, j.pos.z},
+      worker = worker and dfhack.units.getReadableName(worker) or nil,
+    })
+  end)
+  return out
+end
+
+-- Assign a unit to the first job of `job_type` (e.g. "Dig").
+-- Returns the job id, or nil if there is no such job.
+function M.assign_job(job_type, unit_id)
+  local jt = df.job_type[job_type]
+  if not jt then error("Unknown job type " .. job_type) end
+  local u = citizen_by_id(unit_id)
+  local job = each_job(function(j) return j.job_type == jt end)
+  if not job then return nil end
+  dfhack.job.addWorker(job, u)
+  return job.id
+end
+
+-- Queue a job at a workshop with a single-item material filter
+-- (job_item_vector_id name, e.g. "WOOD"). Returns the job id.
+function M.add_workshop_job(workshop_id, job_type, vector)
+  local ws = df.building.find(workshop_id)
+  if not ws then error("Building not found: " .. workshop_id) end
+  local jt = df.job_type[job_type]
+  if not jt then error("Unknown job type " .. job_type) end
+
+  local job = dfhack.job.createLinked()
+  job.job_type = jt
+  job.mat_type = -1
+  if vector then
+    local jitem = df.job_item:new()
+    jitem.item_type = df.item_type.NONE
+    jitem.mat_type = -1
+    jitem.mat_index = -1
+    jitem.quantity = 1
+    jitem.vector_id = df.job_item_vector_id[vector]
+    job.job_items.elements:insert('#', jitem)
+  end
+  dfhack.job.assignToWorkshop(job, ws)
+  return job.id
+end
+
+-- =============================================================================
+-- Buildings (actions/building.lua)
+-- =============================================================================
+
+-- Every building: id, type and center position.
+function M.buildings()
+  local out = {}
+  for _, b in ipairs(df.global.world.buildings.all) do
+    table.insert(out, {
+      id = b.id,
+      type = df.building_type[b:getType()],
+      pos = {b.centerx, b.centery, b.z},
+    })
+  end
+  return out
+end
+
+-- Id of the building covering a tile, or nil.
+function M.building_at(x, y, z)
+  local bld = dfhack.buildings.findAtTile({x = x, y = y, z = z})
+  return bld and bld.id or nil
+end
+
+-- Place a 3x3 workshop (df.workshop_type name). Dwarves build it unless
+-- `instant` is set. Returns the building id.
+function M.place_workshop(workshop_type, x, y, z, instant)
+  local subtype = df.workshop_type[workshop_type]
+  if not subtype then error("Unknown workshop type " .. workshop_type) end
+  local pos = df.coord:new()
+  pos.x, pos.y, pos.z = x, y, z
+  local bld, err = dfhack.buildings.constructBuilding{
+    type = df.building_type.Workshop,
+    subtype = subtype,
+    custom = -1,
+    pos = pos,
+    width = 3,
+    height = 3
+  }
+  if not bld then error(err or "unknown") end
+  if instant then
+    bld:setBuildStage(bld:getMaxBuildStage())
+  end
+  dfhack.buildings.completeBuild(bld)
+  return bld.id
+end
+
+-- =============================================================================
+-- Threats and military (actions/threats.lua, actions/combat.lua)
+-- =============================================================================
+
+-- Hostile units: id, race id and position.
+function M.hostiles()
+  local out = {}
+  for _, u in ipairs(df.global.world.units.active) do
+    if is_hostile(u) then
+      table.insert(out, {
+        id = u.id,
+        race = u.race,
+        pos = {u.pos.x, u.pos.y, u.pos.z},
+      })
+    end
+  end
+  return out
+end
+
+-- {race id, number of hostile units} per race.
+function M.hostile_counts()
+  local counts = {}
+  for _, u in ipairs(df.global.world.units.active) do
+    if is_hostile(u) then
+      counts[u.race] = (counts[u.race] or 0) + 1
+    end
+  end
+  local out = {}
+  for race, count in pairs(counts) do
+    table.insert(out, {race, count})
+  end
+  return out
+end
+
+-- Fortress squads with their member names.
+function M.squads()
+  local out = {}
+  for _, squad in ipairs(df.global.world.squads.all) do
+    if squad.entity_id == df.global.plotinfo.group_id then
+      local members = {}
+      for _, pos in ipairs(squad.positions) do
+        if pos.occupant ~= -1 then
+          local u = df.unit.find(pos.occupant)
+          if u then table.insert(members, dfhack.units.getReadableName(u)) end
+        end
+      end
+      table.insert(out, {
+        id = squad.id,
+        name = dfhack.TranslateName(squad.name),
+        members = members,
+      })
+    end
+  end
+  return out
+end
+
+-- =============================================================================
+-- World (actions/world.lua)
+-- =============================================================================
+
+-- Date, site name, weather, camera and citizen count.
+function M.world_info()
+  local tick = df.global.cur_year_tick
+  local seasons = {"spring", "summer", "autumn", "winter"}
+  local citizens = 0
+  for _, u in ipairs(df.global.world.units.active) do
+    if dfhack.units.isCitizen(u) then citizens = citizens + 1 end
+  end
+  local site = df.global.world.world_data.active_site[0]
+  return {
+    year = df.global.cur_year,
+    tick = tick,
+    season = seasons[math.floor(tick / 100800) + 1] or "unknown",
+    site = site and dfhack.TranslateName(site.name) or nil,
+    rain = df.global.cur_rain > 0,
+    snow = df.global.cur_snow > 0,
+    camera = {df.global.window_x, df.global.window_y, df.global.window_z},
+    citizens = citizens,
+  }
+end
+
+-- Text of the newest `count` announcements (or combat reports), newest first.
+function M.announcements(count, reports)
+  local list = reports and df.global.world.status.reports or df.global.world.status.announcements
+  local out = {}
+  for i = #list - 1, math.max(0, #list - count), -1 do
+    table.insert(out, list[i].text)
+  end
+  return out
+end
+
+return M
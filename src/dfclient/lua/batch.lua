@@ -0,0 +1,49 @@
+-- Several daemon operations in one call (the daemon's "batch" command).
+
+local dig = require('dfclient.dig')
+local build = require('dfclient.build')
+local labor = require('dfclient.labor')
+
+local M = {}
+
+local function apply_op(op, diggable)
+  local kind = op[1]
+  if kind == "dig" then
+    return {designated = dig.designate_where(op[2], op[3], op[4], op[5], op[6], op[7], diggable)}
+  elseif kind == "workshop" then
+    return build.workshop(op[2], op[3], op[4], op[5], op[6])
+  elseif kind == "stockpile" then
+    return build.stockpile(op[2], op[3], op[4], op[5], op[6])
+  elseif kind == "labor_unit" then
+    return labor.set_unit(op[2], op[3], op[4])
+  elseif kind == "labor" then
+    return labor.set(op[2], op[3], op[4])
+  end
+  return {error = "Unknown batch op " .. tostring(kind)}
+end
+
+-- Apply ops in order, each a list {kind, args...}:
+--   {"dig", x1, y1, z, x2, y2, dig}       designate diggable tiles
+--   {"workshop", type, subtype, x, y, z}  as build.workshop
+--   {"stockpile", x, y, z, width, height} as build.stockpile
+--   {"labor_unit", unit_id, labor, on}    as labor.set_unit
+--   {"labor", name, labor, on}            as labor.set
+-- `diggable` lists the tiletype ids dig ops may designate. With
+-- `stop_on_error`, ops after the first failed one are not applied.
+-- Returns one result per applied op; failed ops give {error=...}.
+function M.apply(ops, diggable, stop_on_error)
+  local results = {}
+  for i, op in ipairs(ops) do
+    local ok, result = pcall(apply_op, op, diggable)
+    if not ok then
+      result = {error = tostring(result)}
+    end
+    results[i] = result
+    if stop_on_error and result.error then
+      break
+    end
+  end
+  return results
+end
+
+return M
@@ -0,0 +1,42 @@
+-- Building placement.
+
+local M = {}
+
+-- Place and instantly complete a 3x3 workshop or furnace.
+-- Returns {id=...} or {error=...}.
+function M.workshop(bld_type, subtype, x, y, z)
+  local pos = df.coord:new()
+  pos.x, pos.y, pos.z = x, y, z
+  local bld, err = dfhack.buildings.constructBuilding{
+    type = df.building_type[bld_type],
+    subtype = subtype,
+    custom = -1,
+    pos = pos,
+    width = 3,
+    height = 3
+  }
+  if not bld then
+    return {error = err or "unknown"}
+  end
+  dfhack.buildings.completeBuild(bld)
+  return {id = bld.id}
+end
+
+-- Place and complete an empty stockpile.
+-- Returns {id=...} or {error=...}.
+function M.stockpile(x, y, z, width, height)
+  local sp, err = dfhack.buildings.constructBuilding{
+    type = df.building_type.Stockpile,
+    pos = {x = x, y = y, z = z},
+    width = width,
+    height = height,
+    abstract = true
+  }
+  if not sp then
+    return {error = err or "unknown"}
+  end
+  dfhack.buildings.completeBuild(sp)
+  return {id = sp.id}
+end
+
+return M
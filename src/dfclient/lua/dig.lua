@@ -0,0 +1,27 @@
+-- Dig designations.
+
+local M = {}
+
+-- Designate the tiles of a rectangle on one z-level whose tiletype id is
+-- in the list `tiletypes`. Returns the number of tiles designated.
+function M.designate_where(x1, y1, z, x2, y2, dig, tiletypes)
+  local allowed = {}
+  for _, tiletype in ipairs(tiletypes) do
+    allowed[tiletype] = true
+  end
+  local count = 0
+  for x = math.min(x1, x2), math.max(x1, x2) do
+    for y = math.min(y1, y2), math.max(y1, y2) do
+      if allowed[dfhack.maps.getTileType(x, y, z)] then
+        local block = dfhack.maps.getTileBlock(x, y, z)
+        if block then
+          block.designation[x % 16][y % 16].dig = dig
+          count = count + 1
+        end
+      end
+    end
+  end
+  return count
+end
+
+return M
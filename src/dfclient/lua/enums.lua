@@ -0,0 +1,21 @@
+-- Game enum tables, read once per session by DFClient.get_enums.
+
+local M = {}
+
+-- Names of the values of df enums: name -> {first = first value,
+-- names = {name of first, name of first + 1, ...}}, "" for gaps.
+function M.tables(enum_names)
+  local out = {}
+  for _, enum_name in ipairs(enum_names) do
+    local enum = df[enum_name]
+    if not enum then error("Unknown enum " .. enum_name) end
+    local names = {}
+    for i = enum._first_item, enum._last_item do
+      table.insert(names, enum[i] or "")
+    end
+    out[enum_name] = {first = enum._first_item, names = names}
+  end
+  return out
+end
+
+return M
@@ -0,0 +1,40 @@
+-- Labor assignment.
+
+local M = {}
+
+-- Enable or disable a labor for a unit by id.
+-- Returns {dwarf=, labor=, enabled=} or {error=}.
+function M.set_unit(unit_id, labor, enabled)
+  local labor_id = df.unit_labor[labor]
+  if not labor_id then
+    return {error = "Unknown labor " .. labor}
+  end
+  local u = df.unit.find(unit_id)
+  if not u then
+    return {error = "Unit not found: " .. unit_id}
+  end
+  u.status.labors[labor_id] = enabled
+  return {dwarf = dfhack.units.getReadableName(u), labor = labor, enabled = enabled}
+end
+
+-- Enable or disable a labor for the first citizen whose name contains
+-- `name` (case-insensitive). Returns {dwarf=, labor=, enabled=} or {error=}.
+function M.set(name, labor, enabled)
+  local labor_id = df.unit_labor[labor]
+  if not labor_id then
+    return {error = "Unknown labor " .. labor}
+  end
+  local needle = name:lower()
+  for _, u in ipairs(df.global.world.units.active) do
+    if dfhack.units.isCitizen(u) then
+      local uname = dfhack.units.getReadableName(u)
+      if uname:lower():find(needle, 1, true) then
+        u.status.labors[labor_id] = enabled
+        return {dwarf = uname, labor = labor, enabled = enabled}
+      end
+    end
+  end
+  return {error = "Dwarf not found: " .. name}
+end
+
+return M
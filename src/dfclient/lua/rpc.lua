@@ -0,0 +1,36 @@
+-- Typed entry point for DFClient.call_lua.
+-- CoreRunLua only carries strings (arguments in, tostring'd results out),
+-- so the arguments and the result of the target function travel as JSON.
+
+local json = require('json')
+
+-- DFHack's json.encode pretty-prints by default
+local COMPACT = {pretty = false}
+
+local M = {}
+
+-- Content hash of the installed bundle, set by the installer
+M.VERSION = nil
+
+function M.version()
+  return M.VERSION
+end
+
+function M.call(module, name, args)
+  local ok, mod = pcall(require, module)
+  if not ok then
+    return json.encode({error = "cannot load module " .. module .. ": " .. tostring(mod)}, COMPACT)
+  end
+  local fn = type(mod) == "table" and mod[name]
+  if type(fn) ~= "function" then
+    return json.encode({error = "no function " .. name .. " in module " .. module}, COMPACT)
+  end
+  local params = json.decode(args) or {}
+  local result = table.pack(pcall(fn, table.unpack(params, 1, #params)))
+  if not result[1] then
+    return json.encode({error = tostring(result[2])}, COMPACT)
+  end
+  return json.encode({result = result[2]}, COMPACT)
+end
+
+return M
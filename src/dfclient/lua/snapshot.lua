@@ -0,0 +1,146 @@
+-- Camera-centered game state for the daemon's snapshot command.
+
+local M = {}
+
+-- Describe everything within `radius` tiles of the camera on its z-level.
+-- Entries are arrays of raw values: enums and races travel as integer
+-- ids, which the client names from its enum tables and raws.
+function M.state(radius)
+  local state = {
+    dwarves = {}, creatures = {}, threats = {}, buildings = {},
+    items = {}, jobs = {}, recent = {},
+  }
+
+  local cam_x = df.global.window_x
+  local cam_y = df.global.window_y
+  local cam_z = df.global.window_z
+
+  state.camera = cam_x..","..cam_y..","..cam_z.."|radius="..radius
+
+  local year = df.global.cur_year
+  local season = ({"spring","summer","autumn","winter"})[math.floor(df.global.cur_year_tick/100800)+1] or "?"
+  state.year = year.."/"..season
+  state.clock = {year, df.global.cur_year_tick}
+
+  -- Helper: check if position is within view
+  local function inView(x, y, z)
+    if z ~= cam_z then return false end
+    return math.abs(x - cam_x) <= radius and math.abs(y - cam_y) <= radius
+  end
+
+  -- Dwarves in view: {x, y, name, job_type, stress, wounds, blood %,
+  -- hunger, thirst and sleepiness timers, worst need, latest emotion,
+  -- best skill, its rating}; enums are ids, -1 for none
+  for i,u in ipairs(df.global.world.units.active) do
+    if dfhack.units.isCitizen(u) and dfhack.units.isAlive(u) and inView(u.pos.x, u.pos.y, u.pos.z) then
+      local topNeed, worstFocus = -1, 0
+      local emotion = -1
+      local topSkill, topLevel = -1, 0
+      local soul = u.status.current_soul
+      if soul then
+        for j=0,#soul.personality.needs-1 do
+          local n = soul.personality.needs[j]
+          if n.focus_level < worstFocus then
+            worstFocus = n.focus_level
+            topNeed = n.id
+          end
+        end
+        if #soul.personality.emotions > 0 then
+          emotion = soul.personality.emotions[#soul.personality.emotions-1].type
+        end
+        for j=0,#soul.skills-1 do
+          local sk = soul.skills[j]
+          if sk.rating > topLevel then
+            topLevel = sk.rating
+            topSkill = sk.id
+          end
+        end
+      end
+
+      table.insert(state.dwarves, {
+        u.pos.x, u.pos.y,
+        dfhack.units.getReadableName(u),
+        u.job.current_job and u.job.current_job.job_type or -1,
+        dfhack.units.getStressCategory(u),
+        #u.body.wounds,
+        math.floor(u.body.blood_count * 100 / math.max(1, u.body.blood_max)),
+        u.counters2.hunger_timer, u.counters2.thirst_timer, u.counters2.sleepiness_timer,
+        topNeed, emotion, topSkill, topLevel,
+      })
+    end
+  end
+
+  -- Other creatures in view (non-citizen, non-invader): {x, y, race, job_type}
+  for i,u in ipairs(df.global.world.units.active) do
+    if dfhack.units.isAlive(u) and not dfhack.units.isCitizen(u)
+       and not u.flags1.marauder and not u.flags1.active_invader
+       and inView(u.pos.x, u.pos.y, u.pos.z) then
+      local job = u.job.current_job and u.job.current_job.job_type or -1
+      table.insert(state.creatures, {u.pos.x, u.pos.y, u.race, job})
+    end
+  end
+
+  -- Threats in view: {x, y, race}
+  for i,u in ipairs(df.global.world.units.active) do
+    if dfhack.units.isAlive(u) and (u.flags1.marauder or u.flags1.active_invader)
+       and inView(u.pos.x, u.pos.y, u.pos.z) then
+      table.insert(state.threats, {u.pos.x, u.pos.y, u.race})
+    end
+  end
+
+  -- Buildings in view: {x, y, building_type, subtype, id}
+  for i,b in ipairs(df.global.world.buildings.all) do
+    if inView(b.centerx, b.centery, b.z) then
+      table.insert(state.buildings, {b.centerx, b.centery, b:getType(), b:getSubtype(), b.id})
+    end
+  end
+
+  -- Items on ground in view (limit to avoid spam): {x, y, item_type, material}
+  for i,item in ipairs(df.global.world.items.all) do
+    if #state.items >= 50 then
+      state.items_truncated = true
+      break
+    end
+    if item.flags.on_ground and inView(item.pos.x, item.pos.y, item.pos.z) then
+      local mat = dfhack.matinfo.decode(item)
+      table.insert(state.items, {item.pos.x, item.pos.y, item:getType(), mat and mat:toString() or ""})
+    end
+  end
+
+  -- Terrain sample: tiletype ids on a grid around the camera, -1 off the
+  -- map. The client classifies them with its tiletype table.
+  local terrain = {}
+  local step = math.max(1, math.floor(radius / 10))
+  for dx = -radius, radius, step do
+    for dy = -radius, radius, step do
+      table.insert(terrain, dfhack.maps.getTileType(cam_x + dx, cam_y + dy, cam_z) or -1)
+    end
+  end
+  state.terrain = terrain
+
+  -- Active jobs in view: {x, y, job_type, worker name}
+  for i,j in ipairs(df.global.world.jobs.list) do
+    if #state.jobs >= 20 then break end
+    if j and inView(j.pos.x, j.pos.y, j.pos.z) then
+      local worker = j.holder and dfhack.units.getReadableName(j.holder) or "unassigned"
+      table.insert(state.jobs, {j.pos.x, j.pos.y, j.job_type, worker})
+    end
+  end
+
+  -- Recent announcements (keep global - important alerts)
+  local ann = df.global.world.status.announcements
+  for i=#ann-1,math.max(0,#ann-5),-1 do table.insert(state.recent, ann[i].text) end
+  return state
+end
+
+-- Current tick within the year.
+function M.tick()
+  return df.global.cur_year_tick
+end
+
+-- Game clock as {year, tick within the year, paused}; keys cached snapshots.
+function M.clock()
+  return {df.global.cur_year, df.global.cur_year_tick, dfhack.world.ReadPauseState()}
+end
+
+return M
@@ -0,0 +1,104 @@
+-- Unit details read straight from the game: one unit per call, or every
+-- citizen's skills, labors and job in one compact reply.
+
+local M = {}
+
+-- Trained skills as {id, name, level, experience}.
+local function skills_of(u)
+  local out = {}
+  local soul = u.status.current_soul
+  if soul then
+    for _, s in ipairs(soul.skills) do
+      table.insert(out, {
+        id = s.id,
+        name = df.job_skill[s.id],
+        level = s.rating,
+        experience = s.experience,
+      })
+    end
+  end
+  return out
+end
+
+-- Ids of the labors enabled for a unit.
+local function labors_of(u)
+  local out = {}
+  for i = math.max(0, df.unit_labor._first_item), df.unit_labor._last_item do
+    if u.status.labors[i] then table.insert(out, i) end
+  end
+  return out
+end
+
+-- Everything UnitDetail holds for one unit, or nil if there is no such unit.
+function M.detail(unit_id)
+  local u = df.unit.find(unit_id)
+  if not u then return nil end
+  local job = u.job.current_job
+  return {
+    id = u.id,
+    name = dfhack.units.getReadableName(u),
+    race = u.race,
+    profession = df.profession[u.profession],
+    pos = {u.pos.x, u.pos.y, u.pos.z},
+    flags = {
+      dead = dfhack.units.isDead(u),
+      caged = u.flags1.caged,
+      tame = u.flags1.tame,
+      merchant = u.flags1.merchant,
+      diplomat = u.flags1.diplomat,
+      on_ground = u.flags1.on_ground,
+      projectile = u.flags1.projectile,
+      active_invader = u.flags1.active_invader,
+      hidden_ambusher = u.flags1.hidden_ambusher,
+      invader_origin = u.flags1.invader_origin,
+    },
+    job = job and {id = job.id, name = df.job_type[job.job_type]} or nil,
+    skills = skills_of(u),
+    labors = labors_of(u),
+  }
+end
+
+-- Names of an enum's values from 0 to its last item, as a list.
+local function enum_names(enum)
+  local out = {}
+  for i = 0, enum._last_item do out[i + 1] = enum[i] or "" end
+  return out
+end
+
+-- Skills, labors and current job of every citizen in one reply. Per
+-- citizen: skills as a flat {skill_id, rating, ...} list, labors as a
+-- "0110..." string indexed by labor id, job as a job_type name ("" if idle).
+function M.export_citizens()
+  local out = {
+    skill_names = enum_names(df.job_skill),
+    labor_names = enum_names(df.unit_labor),
+    ids = {}, names = {}, skills = {}, labors = {}, jobs = {},
+  }
+  local last_labor = df.unit_labor._last_item
+  for _, u in ipairs(df.global.world.units.active) do
+    if dfhack.units.isCitizen(u) then
+      table.insert(out.ids, u.id)
+      table.insert(out.names, dfhack.units.getReadableName(u))
+
+      local flat = {}
+      local soul = u.status.current_soul
+      if soul then
+        for _, s in ipairs(soul.skills) do
+          table.insert(flat, s.id)
+          table.insert(flat, s.rating)
+        end
+      end
+      table.insert(out.skills, flat)
+
+      local bits = {}
+      for i = 0, last_labor do bits[i + 1] = u.status.labors[i] and "1" or "0" end
+      table.insert(out.labors, table.concat(bits))
+
+      local job = u.job.current_job
+      table.insert(out.jobs, job and df.job_type[job.job_type] or "")
+    end
+  end
+  return out
+end
+
+return M
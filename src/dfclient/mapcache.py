@@ -0,0 +1,237 @@
+"""Local copy of map tiles as NumPy arrays, refreshed block by block."""
+
+from typing import TYPE_CHECKING, Iterator, NamedTuple
+
+import numpy as np
+
+from dfclient.connection import _encode_varint
+from dfclient.proto import rfr_pb2
+from dfclient.protoview import MessageView
+
+if TYPE_CHECKING:
+    from dfclient.client import DFClient
+
+
+# Map blocks are 16x16 tiles on one z-level
+BLOCK_SIZE = 16
+_BLOCK_TILES = BLOCK_SIZE * BLOCK_SIZE
+
+
+class MapRegion(NamedTuple):
+    """Inclusive box of tile coordinates."""
+    x1: int
+    y1: int
+    z1: int
+    x2: int
+    y2: int
+    z2: int
+
+
+class BlockTiles(NamedTuple):
+    """One decoded map block; arrays are 16x16, indexed [y, x]."""
+    x: int  # tile coordinates of the block's corner
+    y: int
+    z: int
+    tiletype: np.ndarray
+    mat_type: np.ndarray
+    mat_index: np.ndarray
+    designation: np.ndarray
+    water: np.ndarray
+    magma: np.ndarray
+
+
+def _encode_block_request(
+    min_x: int, max_x: int, min_y: int, max_y: int, min_z: int, max_z: int,
+    blocks_needed: int, force_reload: bool = False,
+) -> bytes:
+    """Encode a BlockRequest (x/y in blocks, z in tiles; max bounds exclusive)."""
+    if rfr_pb2 is not None:
+        return rfr_pb2.BlockRequest(
+            blocks_needed=blocks_needed,
+            min_x=min_x, max_x=max_x,
+            min_y=min_y, max_y=max_y,
+            min_z=min_z, max_z=max_z,
+            force_reload=force_reload,
+        ).SerializeToString()
+
+    # Hand-rolled fallback. BlockRequest: blocks_needed (1), min_x (2),
+    # max_x (3), min_y (4), max_y (5), min_z (6), max_z (7), force_reload (8)
+    values = (blocks_needed, min_x, max_x, min_y, max_y, min_z, max_z, int(force_reload))
+    return b"".join(
+        _encode_varint(field_num << 3) + _encode_varint(value & 0xFFFFFFFFFFFFFFFF)
+        for field_num, value in enumerate(values, start=1)
+    )
+
+
+def _tile_array(values, dtype, default: int, out: np.ndarray | None = None) -> np.ndarray:
+    """A repeated per-tile field as a 16x16 array (default-filled if absent).
+
+    Writes into ``out`` when it is given instead of allocating.
+    """
+    if out is None:
+        out = np.empty((BLOCK_SIZE, BLOCK_SIZE), dtype=dtype)
+    if len(values) != _BLOCK_TILES:
+        out.fill(default)
+    else:
+        out.ravel()[:] = values
+    return out
+
+
+def _tile_buffers() -> tuple[np.ndarray, ...]:
+    """One set of per-tile arrays, in BlockTiles order."""
+    shape = (BLOCK_SIZE, BLOCK_SIZE)
+    return (
+        np.empty(shape, dtype=np.int16), np.empty(shape, dtype=np.int16),
+        np.empty(shape, dtype=np.int32), np.empty(shape, dtype=np.int8),
+        np.empty(shape, dtype=np.uint8), np.empty(shape, dtype=np.uint8),
+    )
+
+
+def _decode_block_list(reply: bytes, buffers: tuple[np.ndarray, ...] | None = None) -> Iterator[BlockTiles]:
+    """Decode a RemoteFortressReader.BlockList reply, one block at a time.
+
+    With ``buffers`` (from _tile_buffers) every block is decoded into the
+    same arrays, so each yielded block is only valid until the next one.
+    """
+    tiles, mat_type, mat_index, designation, water, magma = buffers or (None,) * 6
+    if rfr_pb2 is not None:
+        for block in rfr_pb2.BlockList.FromString(reply).map_blocks:
+            materials = [(m.mat_type, m.mat_index) for m in block.materials]
+            yield BlockTiles(
+                block.map_x, block.map_y, block.map_z,
+                _tile_array(block.tiles, np.int16, -1, tiles),
+                _tile_array([m[0] for m in materials], np.int16, -1, mat_type),
+                _tile_array([m[1] for m in materials], np.int32, -1, mat_index),
+                _tile_array(block.tile_dig_designation, np.int8, 0, designation),
+                _tile_array(block.water, np.uint8, 0, water),
+                _tile_array(block.magma, np.uint8, 0, magma),
+            )
+        return
+
+    # Hand-rolled fallback. BlockList: map_blocks (1) = repeated MapBlock;
+    # MapBlock: map_x/y/z (1-3), tiles (4), materials (5, MatPair: mat_type 1,
+    # mat_index 2), magma (9), water (10), tile_dig_designation (24)
+    for block in MessageView(reply).iter_messages(1):
+        materials = [(m.get_int32(1), m.get_int32(2)) for m in block.iter_messages(5)]
+        yield BlockTiles(
+            block.get_int32(1), block.get_int32(2), block.get_int32(3),
+            _tile_array(block.get_ints(4), np.int16, -1, tiles),
+            _tile_array([m[0] for m in materials], np.int16, -1, mat_type),
+            _tile_array([m[1] for m in materials], np.int32, -1, mat_index),
+            _tile_array(block.get_ints(24), np.int8, 0, designation),
+            _tile_array(block.get_ints(10), np.uint8, 0, water),
+            _tile_array(block.get_ints(9), np.uint8, 0, magma),
+        )
+
+
+def _block_chunks(region: MapRegion, batch_blocks: int) -> Iterator[tuple[int, int, int, int, int]]:
+    """Split a region into BlockRequest bounds of at most batch_blocks blocks.
+
+    Yields (min_x, max_x, min_y, max_y, z): x/y in blocks with exclusive
+    max bounds, one z-level per chunk.
+    """
+    bx1, bx2 = region.x1 // BLOCK_SIZE, region.x2 // BLOCK_SIZE + 1
+    by1, by2 = region.y1 // BLOCK_SIZE, region.y2 // BLOCK_SIZE + 1
+    width = min(bx2 - bx1, batch_blocks)
+    rows = max(1, batch_blocks // width)
+    for z in range(region.z1, region.z2 + 1):
+        for y in range(by1, by2, rows):
+            for x in range(bx1, bx2, width):
+                yield x, min(x + width, bx2), y, min(y + rows, by2), z
+
+
+class MapCache:
+    """Dense NumPy copy of the tiles in a map region.
+
+    The region is widened to whole 16x16 blocks. Arrays are indexed
+    ``[z, y, x]`` relative to ``origin`` (use ``index()`` or ``window()``
+    to convert from map coordinates):
+
+    - ``tiletype``: tiletype id, -1 where not loaded
+    - ``mat_type``/``mat_index``: tile material (MatPair)
+    - ``designation``: tile_dig_designation
+    - ``water``/``magma``: liquid level 0-7
+
+    DFHack's RemoteFortressReader only sends blocks that changed since it
+    last sent them, so ``refresh()`` after the first load transfers and
+    rewrites just the blocks that changed in the game. The plugin keeps
+    that record for all clients together: if something else reads the
+    same blocks in between, use ``refresh(force=True)``.
+    """
+
+    def __init__(self, client: "DFClient", region: MapRegion):
+        self._client = client
+        self.region = region
+        self._bx = (region.x1 // BLOCK_SIZE, region.x2 // BLOCK_SIZE + 1)
+        self._by = (region.y1 // BLOCK_SIZE, region.y2 // BLOCK_SIZE + 1)
+        self._z = (region.z1, region.z2 + 1)
+        self.origin = (self._bx[0] * BLOCK_SIZE, self._by[0] * BLOCK_SIZE, region.z1)
+
+        shape = (
+            self._z[1] - self._z[0],
+            (self._by[1] - self._by[0]) * BLOCK_SIZE,
+            (self._bx[1] - self._bx[0]) * BLOCK_SIZE,
+        )
+        self.tiletype = np.full(shape, -1, dtype=np.int16)
+        self.mat_type = np.full(shape, -1, dtype=np.int16)
+        self.mat_index = np.full(shape, -1, dtype=np.int32)
+        self.designation = np.zeros(shape, dtype=np.int8)
+        self.water = np.zeros(shape, dtype=np.uint8)
+        self.magma = np.zeros(shape, dtype=np.uint8)
+        # Which blocks hold data, [z, block_y, block_x]
+        self.loaded = np.zeros((shape[0], shape[1] // BLOCK_SIZE, shape[2] // BLOCK_SIZE), dtype=bool)
+        self._fetched = False
+
+    def refresh(self, force: bool = False) -> int:
+        """Fetch changed blocks (all blocks on the first call or with force).
+
+        Returns the number of blocks updated.
+        """
+        request = _encode_block_request(
+            self._bx[0], self._bx[1], self._by[0], self._by[1], self._z[0], self._z[1],
+            blocks_needed=self.loaded.size,
+            force_reload=force or not self._fetched,
+        )
+        reply = self._client._call_rfr("GetBlockList", request)
+        self._fetched = True
+        updated = 0
+        for block in _decode_block_list(reply):
+            if self.store(block):
+                updated += 1
+        return updated
+
+    def store(self, block: BlockTiles) -> bool:
+        """Write one decoded block into the arrays; False if outside the region."""
+        z = block.z - self.origin[2]
+        by = block.y // BLOCK_SIZE - self._by[0]
+        bx = block.x // BLOCK_SIZE - self._bx[0]
+        if not (0 <= z < self.loaded.shape[0] and 0 <= by < self.loaded.shape[1]
+                and 0 <= bx < self.loaded.shape[2]):
+            return False
+        ys = slice(by * BLOCK_SIZE, (by + 1) * BLOCK_SIZE)
+        xs = slice(bx * BLOCK_SIZE, (bx + 1) * BLOCK_SIZE)
+        self.tiletype[z, ys, xs] = block.tiletype
+        self.mat_type[z, ys, xs] = block.mat_type
+        self.mat_index[z, ys, xs] = block.mat_index
+        self.designation[z, ys, xs] = block.designation
+        self.water[z, ys, xs] = block.water
+        self.magma[z, ys, xs] = block.magma
+        self.loaded[z, by, bx] = True
+        return True
+
+    def index(self, x: int, y: int, z: int) -> tuple[int, int, int]:
+        """Array index [z, y, x] of a map tile."""
+        return z - self.origin[2], y - self.origin[1], x - self.origin[0]
+
+    def window(self, x1: int, y1: int, x2: int, y2: int, z: int) -> tuple[int, slice, slice]:
+        """Array index of an inclusive rectangle on one z-level.
+
+        ``cache.tiletype[cache.window(10, 10, 20, 15, 150)]`` is that
+        rectangle's tiletypes.
+        """
+        ox, oy, oz = self.origin
+        return (
+            z - oz,
+            slice(min(y1, y2) - oy, max(y1, y2) - oy + 1),
+            slice(min(x1, x2) - ox, max(x1, x2) - ox + 1),
+        )
@@ -0,0 +1,167 @@
+"""Thread-safe pool of DFHack connections."""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from dfclient.connection import DFHackConnection
+from dfclient.models import ConnectionStatus
+
+# Seconds checkout waits for a free connection before raising TimeoutError
+CHECKOUT_TIMEOUT = 30.0
+
+
+class DFHackConnectionPool:
+    """Pool of DFHack connections with checkout/return semantics.
+
+    DFHack's RPC server serves each client connection on its own thread, so
+    a slow call (a long ``lua`` snapshot) on one connection doesn't hold up
+    cheap reads on another. Connections are opened lazily up to ``size`` and
+    each one has its bind cache warmed with ``warm_methods`` when created.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 5000,
+        size: int = 4,
+        timeout: float = 30.0,
+        warm_methods: dict[str, list[tuple[str, str, str]]] | None = None,
+    ):
+        """
+        Args:
+            host: DFHack host
+            port: DFHack RPC port
+            size: Maximum number of open connections
+            timeout: Socket timeout for each connection
+            warm_methods: plugin -> [(method, input_msg, output_msg)] to bind
+                on every new connection
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.host = host
+        self.port = port
+        self.size = size
+        self.timeout = timeout
+        self.warm_methods = warm_methods or {}
+        self._idle: list[DFHackConnection] = []
+        self._open = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def connected(self) -> bool:
+        with self._cond:
+            return self._open > 0 and not self._closed
+
+    def connect(self) -> ConnectionStatus:
+        """Open the first connection so connection errors surface early."""
+        with self._cond:
+            self._closed = False
+            if self._open:
+                return ConnectionStatus(connected=True)
+            self._open += 1
+        conn, status = self._create()
+        with self._cond:
+            if conn:
+                self._idle.append(conn)
+            else:
+                self._open -= 1
+            self._cond.notify()
+        return status
+
+    def close(self) -> None:
+        """Close idle connections; busy ones are closed when returned."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            conn.disconnect()
+
+    def _create(self) -> tuple[DFHackConnection | None, ConnectionStatus]:
+        """Open and warm a new connection."""
+        conn = DFHackConnection(self.host, self.port, self.timeout)
+        status = conn.connect()
+        if not status.connected:
+            return None, status
+        for plugin, methods in self.warm_methods.items():
+            try:
+                conn.bind_methods(methods, plugin=plugin)
+            except OSError:
+                conn.disconnect()
+                return None, ConnectionStatus(connected=False, error="Connection lost while binding")
+            except Exception:
+                # Plugin missing or method unknown; bind lazily (and fail) on use
+                pass
+        return conn, status
+
+    def checkout(self, timeout: float | None = CHECKOUT_TIMEOUT) -> DFHackConnection:
+        """Take a connection from the pool, opening one if under ``size``.
+
+        ``timeout=None`` waits for a free connection indefinitely. Checkouts
+        aren't reentrant: a thread holding every connection that checks out
+        another gets the TimeoutError.
+
+        Raises:
+            TimeoutError: If no connection frees up within ``timeout``
+            ConnectionError: If the pool is closed or a new connection fails
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise ConnectionError("Connection pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._open < self.size:
+                    self._open += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("No DFHack connection available")
+                self._cond.wait(remaining)
+
+        # Connect outside the lock so other threads can keep checking out
+        conn, status = self._create()
+        if conn is None:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise ConnectionError(status.error or "Failed to connect to DFHack")
+        return conn
+
+    def checkin(self, conn: DFHackConnection, discard: bool = False) -> None:
+        """Return a connection; ``discard`` closes it instead (e.g. after an I/O error)."""
+        with self._cond:
+            if discard or self._closed or not conn.connected:
+                self._open -= 1
+                close = True
+            else:
+                self._idle.append(conn)
+                close = False
+            self._cond.notify()
+        if close:
+            conn.disconnect()
+
+    @contextmanager
+    def connection(self, timeout: float | None = CHECKOUT_TIMEOUT) -> Iterator[DFHackConnection]:
+        """Check out a connection for the duration of a ``with`` block."""
+        conn = self.checkout(timeout)
+        try:
+            yield conn
+        except TimeoutError:
+            # Unanswered requests stay outstanding and are skipped later
+            self.checkin(conn)
+            raise
+        except OSError:
+            # Socket error - the connection is unusable
+            self.checkin(conn, discard=True)
+            raise
+        except BaseException:
+            self.checkin(conn)
+            raise
+        else:
+            self.checkin(conn)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: dfclient/proto/CoreProtocol.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n!dfclient/proto/CoreProtocol.proto\x12\x07\x64\x66proto\"/\n\x10\x43oreTextFragment\x12\x0c\n\x04text\x18\x01 \x01(\x0c\x12\r\n\x05\x63olor\x18\x02 \x01(\x05\"D\n\x14\x43oreTextNotification\x12,\n\tfragments\x18\x01 \x03(\x0b\x32\x19.dfproto.CoreTextFragment\"\x0e\n\x0c\x45mptyMessage\"\x1b\n\nIntMessage\x12\r\n\x05value\x18\x01 \x01(\x05\"\x1e\n\rStringMessage\x12\r\n\x05value\x18\x01 \x01(\x0c\"\"\n\x11StringListMessage\x12\r\n\x05value\x18\x01 \x03(\x0c\"X\n\x0f\x43oreBindRequest\x12\x0e\n\x06method\x18\x01 \x01(\t\x12\x11\n\tinput_msg\x18\x02 \x01(\t\x12\x12\n\noutput_msg\x18\x03 \x01(\t\x12\x0e\n\x06plugin\x18\x04 \x01(\t\"$\n\rCoreBindReply\x12\x13\n\x0b\x61ssigned_id\x18\x01 \x01(\x05\";\n\x15\x43oreRunCommandRequest\x12\x0f\n\x07\x63ommand\x18\x01 \x01(\t\x12\x11\n\targuments\x18\x02 \x03(\t\"H\n\x11\x43oreRunLuaRequest\x12\x0e\n\x06module\x18\x01 \x01(\t\x12\x10\n\x08\x66unction\x18\x02 \x01(\t\x12\x11\n\targuments\x18\x03 \x03(\tB\x02H\x03')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'dfclient.proto.CoreProtocol_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  DESCRIPTOR._serialized_options = b'H\003'
+  _CORETEXTFRAGMENT._serialized_start=46
+  _CORETEXTFRAGMENT._serialized_end=93
+  _CORETEXTNOTIFICATION._serialized_start=95
+  _CORETEXTNOTIFICATION._serialized_end=163
+  _EMPTYMESSAGE._serialized_start=165
+  _EMPTYMESSAGE._serialized_end=179
+  _INTMESSAGE._serialized_start=181
+  _INTMESSAGE._serialized_end=208
+  _STRINGMESSAGE._serialized_start=210
+  _STRINGMESSAGE._serialized_end=240
+  _STRINGLISTMESSAGE._serialized_start=242
+  _STRINGLISTMESSAGE._serialized_end=276
+  _COREBINDREQUEST._serialized_start=278
+  _COREBINDREQUEST._serialized_end=366
+  _COREBINDREPLY._serialized_start=368
+  _COREBINDREPLY._serialized_end=404
+  _CORERUNCOMMANDREQUEST._serialized_start=406
+  _CORERUNCOMMANDREQUEST._serialized_end=465
+  _CORERUNLUAREQUEST._serialized_start=467
+  _CORERUNLUAREQUEST._serialized_end=539
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: dfclient/proto/RemoteFortressReader.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n)dfclient/proto/RemoteFortressReader.proto\x12\x14RemoteFortressReader\"\x1b\n\nSingleBool\x12\r\n\x05value\x18\x01 \x01(\x08\"9\n\x0bVersionInfo\x12\x16\n\x0e\x64\x66hack_version\x18\x01 \x01(\x0c\x12\x12\n\ndf_version\x18\x02 \x01(\x0c\"\xcd\x01\n\x07MapInfo\x12\x14\n\x0c\x62lock_size_x\x18\x01 \x01(\x05\x12\x14\n\x0c\x62lock_size_y\x18\x02 \x01(\x05\x12\x14\n\x0c\x62lock_size_z\x18\x03 \x01(\x05\x12\x13\n\x0b\x62lock_pos_x\x18\x04 \x01(\x05\x12\x13\n\x0b\x62lock_pos_y\x18\x05 \x01(\x05\x12\x13\n\x0b\x62lock_pos_z\x18\x06 \x01(\x05\x12\x12\n\nworld_name\x18\x07 \x01(\x0c\x12\x1a\n\x12world_name_english\x18\x08 \x01(\x0c\x12\x11\n\tsave_name\x18\t \x01(\x0c\"\xbc\x01\n\x08ViewInfo\x12\x12\n\nview_pos_x\x18\x01 \x01(\x05\x12\x12\n\nview_pos_y\x18\x02 \x01(\x05\x12\x12\n\nview_pos_z\x18\x03 \x01(\x05\x12\x1c\n\x0c\x63ursor_pos_x\x18\x04 \x01(\x05:\x06-30000\x12\x1c\n\x0c\x63ursor_pos_y\x18\x05 \x01(\x05:\x06-30000\x12\x1c\n\x0c\x63ursor_pos_z\x18\x06 \x01(\x05:\x06-30000\x12\x1a\n\x0e\x66ollow_unit_id\x18\x07 \x01(\x05:\x02-1\"\x1d\n\x07UnitCiv\x12\x12\n\x06\x63iv_id\x18\x01 \x01(\x05:\x02-1\"\'\n\x0eUnitProfession\x12\x15\n\rprofession_id\x18\x03 \x01(\x05\"\xff\x01\n\x0eUnitDefinition\x12\n\n\x02id\x18\x01 \x01(\x05\x12\r\n\x05pos_y\x18\x03 \x01(\x05\x12\r\n\x05pos_z\x18\x04 \x01(\x05\x12\x0f\n\x07race_id\x18\x05 \x01(\x05\x12*\n\x03\x63iv\x18\x06 \x01(\x0b\x32\x1d.RemoteFortressReader.UnitCiv\x12\x0e\n\x06\x66lags1\x18\x08 \x01(\r\x12\x0e\n\x06\x66lags2\x18\t \x01(\r\x12\x0e\n\x06\x66lags3\x18\n \x01(\r\x12\x0e\n\x06\x66lags4\x18\x0b \x01(\r\x12\x0c\n\x04name\x18\r \x01(\x0c\x12\x38\n\nprofession\x18\x10 \x01(\x0b\x32$.RemoteFortressReader.UnitProfession\"G\n\x08UnitList\x12;\n\rcreature_list\x18\x01 \x03(\x0b\x32$.RemoteFortressReader.UnitDefinition\".\n\x07MatPair\x12\x10\n\x08mat_type\x18\x01 \x01(\x05\x12\x11\n\tmat_index\x18\x02 \x01(\x05\"\x9b\x01\n\x08Tiletype\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0c\n\x04name\x18\x02 \x01(\x0c\x12\x0f\n\x07\x63\x61ption\x18\x03 \x01(\x0c\x12\x11\n\x05shape\x18\x04 \x01(\x05:\x02-1\x12\x13\n\x07special\x18\x05 \x01(\x05:\x02-1\x12\x14\n\x08material\x18\x06 \x01(\x05:\x02-1\x12\x13\n\x07variant\x18\x07 \x01(\x05:\x02-1\x12\x11\n\tdirection\x18\x08 \x01(\x0c\"E\n\x0cTiletypeList\x12\x35\n\rtiletype_list\x18\x01 \x03(\x0b\x32\x1e.RemoteFortressReader.Tiletype\"_\n\x12MaterialDefinition\x12/\n\x08mat_pair\x18\x01 \x01(\x0b\x32\x1d.RemoteFortressReader.MatPair\x12\n\n\x02id\x18\x02 \x01(\x0c\x12\x0c\n\x04name\x18\x03 \x01(\x0c\"O\n\x0cMaterialList\x12?\n\rmaterial_list\x18\x01 \x03(\x0b\x32(.RemoteFortressReader.MaterialDefinition\"?\n\x0b\x43reatureRaw\x12\r\n\x05index\x18\x01 \x01(\x05\x12\x13\n\x0b\x63reature_id\x18\x02 \x01(\x0c\x12\x0c\n\x04name\x18\x03 \x03(\x0c\"K\n\x0f\x43reatureRawList\x12\x38\n\rcreature_raws\x18\x01 \x03(\x0b\x32!.RemoteFortressReader.CreatureRaw\"3\n\x08PlantRaw\x12\r\n\x05index\x18\x01 \x01(\x05\x12\n\n\x02id\x18\x02 \x01(\x0c\x12\x0c\n\x04name\x18\x03 \x01(\x0c\"B\n\x0cPlantRawList\x12\x32\n\nplant_raws\x18\x01 \x03(\x0b\x32\x1e.RemoteFortressReader.PlantRaw\"\x95\x01\n\x0c\x42lockRequest\x12\x15\n\rblocks_needed\x18\x01 \x01(\x05\x12\r\n\x05min_x\x18\x02 \x01(\x05\x12\r\n\x05max_x\x18\x03 \x01(\x05\x12\r\n\x05min_y\x18\x04 \x01(\x05\x12\r\n\x05max_y\x18\x05 \x01(\x05\x12\r\n\x05min_z\x18\x06 \x01(\x05\x12\r\n\x05max_z\x18\x07 \x01(\x05\x12\x14\n\x0c\x66orce_reload\x18\x08 \x01(\x08\"\xdd\x03\n\x08MapBlock\x12\r\n\x05map_x\x18\x01 \x01(\x05\x12\r\n\x05map_y\x18\x02 \x01(\x05\x12\r\n\x05map_z\x18\x03 \x01(\x05\x12\r\n\x05tiles\x18\x04 \x03(\x05\x12\x30\n\tmaterials\x18\x05 \x03(\x0b\x32\x1d.RemoteFortressReader.MatPair\x12\x36\n\x0flayer_materials\x18\x06 \x03(\x0b\x32\x1d.RemoteFortressReader.MatPair\x12\x35\n\x0evein_materials\x18\x07 \x03(\x0b\x32\x1d.RemoteFortressReader.MatPair\x12\x35\n\x0e\x62\x61se_materials\x18\x08 \x03(\x0b\x32\x1d.RemoteFortressReader.MatPair\x12\r\n\x05magma\x18\t \x03(\x05\x12\r\n\x05water\x18\n \x03(\x05\x12\x0e\n\x06hidden\x18\x0b \x03(\x08\x12\r\n\x05light\x18\x0c \x03(\x08\x12\x14\n\x0csubterranean\x18\r \x03(\x08\x12\x0f\n\x07outside\x18\x0e \x03(\x08\x12\x0f\n\x07\x61quifer\x18\x0f \x03(\x08\x12\x16\n\x0ewater_stagnant\x18\x10 \x03(\x08\x12\x12\n\nwater_salt\x18\x11 \x03(\x08\x12\x1c\n\x14tile_dig_designation\x18\x18 \x03(\x05\"]\n\tBlockList\x12\x32\n\nmap_blocks\x18\x01 \x03(\x0b\x32\x1e.RemoteFortressReader.MapBlock\x12\r\n\x05map_x\x18\x02 \x01(\x05\x12\r\n\x05map_y\x18\x03 \x01(\x05\x42\x02H\x03')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'dfclient.proto.RemoteFortressReader_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  DESCRIPTOR._serialized_options = b'H\003'
+  _SINGLEBOOL._serialized_start=67
+  _SINGLEBOOL._serialized_end=94
+  _VERSIONINFO._serialized_start=96
+  _VERSIONINFO._serialized_end=153
+  _MAPINFO._serialized_start=156
+  _MAPINFO._serialized_end=361
+  _VIEWINFO._serialized_start=364
+  _VIEWINFO._serialized_end=552
+  _UNITCIV._serialized_start=554
+  _UNITCIV._serialized_end=583
+  _UNITPROFESSION._serialized_start=585
+  _UNITPROFESSION._serialized_end=624
+  _UNITDEFINITION._serialized_start=627
+  _UNITDEFINITION._serialized_end=882
+  _UNITLIST._serialized_start=884
+  _UNITLIST._serialized_end=955
+  _MATPAIR._serialized_start=957
+  _MATPAIR._serialized_end=1003
+  _TILETYPE._serialized_start=1006
+  _TILETYPE._serialized_end=1161
+  _TILETYPELIST._serialized_start=1163
+  _TILETYPELIST._serialized_end=1232
+  _MATERIALDEFINITION._serialized_start=1234
+  _MATERIALDEFINITION._serialized_end=1329
+  _MATERIALLIST._serialized_start=1331
+  _MATERIALLIST._serialized_end=1410
+  _CREATURERAW._serialized_start=1412
+  _CREATURERAW._serialized_end=1475
+  _CREATURERAWLIST._serialized_start=1477
+  _CREATURERAWLIST._serialized_end=1552
+  _PLANTRAW._serialized_start=1554
+  _PLANTRAW._serialized_end=1605
+  _PLANTRAWLIST._serialized_start=1607
+  _PLANTRAWLIST._serialized_end=1673
+  _BLOCKREQUEST._serialized_start=1676
+  _BLOCKREQUEST._serialized_end=1825
+  _MAPBLOCK._serialized_start=1828
+  _MAPBLOCK._serialized_end=2305
+  _BLOCKLIST._serialized_start=2307
+  _BLOCKLIST._serialized_end=2400
+# @@protoc_insertion_point(module_scope)
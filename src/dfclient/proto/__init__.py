@@ -0,0 +1,19 @@
+"""Generated protobuf message classes for the DFHack RPC protocol.
+
+``CoreProtocol_pb2`` and ``RemoteFortressReader_pb2`` are generated by
+protoc from the .proto files next to them (see their headers for the
+command) and parse with the protobuf runtime's C/upb backend.
+
+``core_pb2`` and ``rfr_pb2`` are None when the installed protobuf runtime
+can't load the generated code; the decoders in connection.py and client.py
+then fall back to their hand-rolled parsers.
+"""
+
+try:
+    from dfclient.proto import CoreProtocol_pb2 as core_pb2
+    from dfclient.proto import RemoteFortressReader_pb2 as rfr_pb2
+except Exception:  # protobuf missing or too old/new for the generated code
+    core_pb2 = None
+    rfr_pb2 = None
+
+__all__ = ["core_pb2", "rfr_pb2"]
@@ -0,0 +1,195 @@
+"""Lazy, zero-copy read access to protobuf messages."""
+
+import struct
+from typing import Iterator, TypeVar
+
+V = TypeVar("V", bound="MessageView")
+
+
+def _read_varint(buf: memoryview, pos: int) -> tuple[int, int]:
+    """Decode a varint at pos, return (value, position after it)."""
+    byte = buf[pos]
+    if byte < 0x80:
+        return byte, pos + 1
+    result = byte & 0x7F
+    shift = 7
+    while True:
+        pos += 1
+        byte = buf[pos]
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos + 1
+        shift += 7
+
+
+class MessageView:
+    """Read-only view of one protobuf message inside a larger buffer.
+
+    Nothing is decoded up front. The first field access scans the message
+    once and records where each field's value starts; after that a field is
+    decoded only when it is read. Length-delimited values are returned as
+    memoryview slices or nested views, so no bytes are copied.
+
+    When a field occurs more than once the last occurrence wins for the
+    single-value getters, as in protobuf; use iter_messages for
+    repeated fields.
+    """
+
+    __slots__ = ("_buf", "_start", "_end", "_offsets")
+
+    def __init__(self, data: bytes | bytearray | memoryview, start: int = 0, end: int | None = None):
+        self._buf = data if isinstance(data, memoryview) else memoryview(data)
+        self._start = start
+        self._end = len(self._buf) if end is None else end
+        # field number -> (wire type, offset of the value), filled on first access
+        self._offsets: dict[int, tuple[int, int]] | None = None
+
+    def _scan(self) -> dict[int, tuple[int, int]]:
+        buf = self._buf
+        pos = self._start
+        end = self._end
+        offsets = {}
+        while pos < end:
+            # Inline the one-byte case of every varint: tags of fields 1-15
+            # and short lengths, i.e. almost everything in a DFHack reply
+            tag = buf[pos]
+            pos += 1
+            if tag & 0x80:
+                tag, pos = _read_varint(buf, pos - 1)
+            wire_type = tag & 0x7
+            offsets[tag >> 3] = (wire_type, pos)
+            if wire_type == 0:
+                while buf[pos] & 0x80:
+                    pos += 1
+                pos += 1
+            elif wire_type == 2:
+                length = buf[pos]
+                pos += 1
+                if length & 0x80:
+                    length, pos = _read_varint(buf, pos - 1)
+                pos += length
+            elif wire_type == 5:
+                pos += 4
+            elif wire_type == 1:
+                pos += 8
+            else:
+                raise ValueError(f"Unknown wire type {wire_type}")
+        self._offsets = offsets
+        return offsets
+
+    def _field(self, field_num: int) -> tuple[int, int] | None:
+        offsets = self._offsets
+        if offsets is None:
+            offsets = self._scan()
+        return offsets.get(field_num)
+
+    def __contains__(self, field_num: int) -> bool:
+        return self._field(field_num) is not None
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def get_int(self, field_num: int, default: int = 0) -> int:
+        """Read a varint or fixed-width field as an unsigned integer."""
+        entry = self._field(field_num)
+        if entry is None:
+            return default
+        wire_type, pos = entry
+        if wire_type == 0:
+            return _read_varint(self._buf, pos)[0]
+        if wire_type == 5:
+            return struct.unpack_from("<I", self._buf, pos)[0]
+        if wire_type == 1:
+            return struct.unpack_from("<Q", self._buf, pos)[0]
+        return default
+
+    def get_int32(self, field_num: int, default: int = 0) -> int:
+        """Read an int32/int64 varint field, keeping its sign."""
+        value = self.get_int(field_num, default)
+        return value - (1 << 64) if value >= 1 << 63 else value
+
+    def get_bytes(self, field_num: int) -> memoryview | None:
+        """Return a length-delimited field's value without copying it."""
+        entry = self._field(field_num)
+        if entry is None or entry[0] != 2:
+            return None
+        length, pos = _read_varint(self._buf, entry[1])
+        return self._buf[pos:pos + length]
+
+    def get_string(self, field_num: int, default: str = "") -> str:
+        """Decode a length-delimited field as UTF-8 text."""
+        value = self.get_bytes(field_num)
+        if value is None:
+            return default
+        return str(value, "utf-8", errors="replace")
+
+    def get_message(self, field_num: int, view_type: type[V] | None = None) -> V:
+        """Nested view of a submessage field (empty if the field is absent).
+
+        ``view_type`` picks the MessageView subclass to return.
+        """
+        cls = view_type or MessageView
+        entry = self._field(field_num)
+        if entry is None or entry[0] != 2:
+            return cls(self._buf, self._start, self._start)
+        length, pos = _read_varint(self._buf, entry[1])
+        return cls(self._buf, pos, pos + length)
+
+    def iter_messages(self, field_num: int, view_type: type[V] | None = None) -> Iterator[V]:
+        """Yield a view of every occurrence of a repeated submessage field."""
+        cls = view_type or MessageView
+        buf = self._buf
+        pos = self._start
+        end = self._end
+        while pos < end:
+            tag, pos = _read_varint(buf, pos)
+            wire_type = tag & 0x7
+            if wire_type == 2:
+                length, pos = _read_varint(buf, pos)
+                if tag >> 3 == field_num:
+                    yield cls(buf, pos, pos + length)
+                pos += length
+            elif wire_type == 0:
+                while buf[pos] & 0x80:
+                    pos += 1
+                pos += 1
+            elif wire_type == 5:
+                pos += 4
+            elif wire_type == 1:
+                pos += 8
+            else:
+                raise ValueError(f"Unknown wire type {wire_type}")
+
+    def get_ints(self, field_num: int) -> list[int]:
+        """All values of a repeated varint field, packed or not, as int32."""
+        buf = self._buf
+        pos = self._start
+        end = self._end
+        values = []
+        while pos < end:
+            tag, pos = _read_varint(buf, pos)
+            wire_type = tag & 0x7
+            if wire_type == 0:
+                value, pos = _read_varint(buf, pos)
+                if tag >> 3 == field_num:
+                    values.append(value)
+            elif wire_type == 2:
+                length, pos = _read_varint(buf, pos)
+                if tag >> 3 != field_num:
+                    pos += length
+                    continue
+                packed_end = pos + length
+                while pos < packed_end:
+                    value, pos = _read_varint(buf, pos)
+                    values.append(value)
+            elif wire_type == 5:
+                pos += 4
+            elif wire_type == 1:
+                pos += 8
+            else:
+                raise ValueError(f"Unknown wire type {wire_type}")
+        return [v - (1 << 64) if v >= 1 << 63 else v for v in values]
+
+    def tobytes(self) -> bytes:
+        """Copy the message's encoded bytes."""
+        return self._buf[self._start:self._end].tobytes()
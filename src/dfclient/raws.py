@@ -0,0 +1,329 @@
+"""World raws: tiletype and material lookup arrays, creature and plant ids,
+and their on-disk cache."""
+
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+from dfclient.proto import rfr_pb2
+from dfclient.protoview import MessageView
+
+# Where get_raws() keeps one file per world
+RAWS_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "dfclient" / "raws"
+
+# Bumped whenever the layout of a cache file changes
+_RAWS_FORMAT = 1
+
+# RemoteFortressReader's tiletype enums; position = value, -1 = none
+TILETYPE_SHAPES = (
+    "EMPTY", "FLOOR", "BOULDER", "PEBBLES", "WALL", "FORTIFICATION",
+    "STAIR_UP", "STAIR_DOWN", "STAIR_UPDOWN", "RAMP", "RAMP_TOP",
+    "BROOK_BED", "BROOK_TOP", "TREE_SHAPE", "SAPLING", "SHRUB",
+    "ENDLESS_PIT", "BRANCH", "TRUNK_BRANCH", "TWIG",
+)
+TILETYPE_SPECIALS = (
+    "NORMAL", "RIVER_SOURCE", "WATERFALL", "SMOOTH", "FURROWED", "WET",
+    "DEAD", "WORN_1", "WORN_2", "WORN_3", "TRACK", "SMOOTH_DEAD",
+)
+TILETYPE_MATERIALS = (
+    "AIR", "SOIL", "STONE", "FEATURE", "LAVA_STONE", "MINERAL",
+    "FROZEN_LIQUID", "CONSTRUCTION", "GRASS_LIGHT", "GRASS_DARK",
+    "GRASS_DRY", "GRASS_DEAD", "PLANT", "HFS", "CAMPFIRE", "FIRE", "ASHES",
+    "MAGMA", "DRIFTWOOD", "POOL", "BROOK", "RIVER", "ROOT",
+    "TREE_MATERIAL", "MUSHROOM", "UNDERWORLD_GATE",
+)
+
+
+def _enum_values(enum: tuple[str, ...], names: Sequence[str], kind: str) -> list[int]:
+    """Enum values of names, raising ValueError for unknown ones."""
+    values = []
+    for name in names:
+        if name not in enum:
+            raise ValueError(f"Unknown tiletype {kind} {name}")
+        values.append(enum.index(name))
+    return values
+
+
+def _text(value: bytes | memoryview) -> str:
+    return str(value, "utf-8", errors="replace")
+
+
+class TiletypeTable:
+    """Shape, special, material and variant of every tiletype id.
+
+    Each attribute is an array indexed by tiletype id, so classifying a
+    whole tile array (e.g. ``MapCache.tiletype``) is one indexing
+    operation: ``table.shape[tiles]``, or ``table.shape_is(tiles, "WALL")``
+    for a mask. Values are positions in the TILETYPE_* tuples, -1 for
+    none. The arrays carry one extra last entry that is -1 everywhere, so
+    the -1 MapCache stores for unloaded tiles classifies as "none".
+    """
+
+    def __init__(self, rows: Sequence[tuple[int, str, int, int, int, int]]):
+        """rows: (id, name, shape, special, material, variant) per tiletype."""
+        rows = list(rows)
+        size = max((row[0] for row in rows), default=-1) + 2
+        self.names: list[str] = [""] * (size - 1)
+        self.shape = np.full(size, -1, dtype=np.int8)
+        self.special = np.full(size, -1, dtype=np.int8)
+        self.material = np.full(size, -1, dtype=np.int8)
+        self.variant = np.full(size, -1, dtype=np.int8)
+        for tiletype_id, name, shape, special, material, variant in rows:
+            self.names[tiletype_id] = name
+            self.shape[tiletype_id] = shape
+            self.special[tiletype_id] = special
+            self.material[tiletype_id] = material
+            self.variant[tiletype_id] = variant
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def shape_is(self, tiles: np.ndarray, *shapes: str) -> np.ndarray:
+        """Mask of tiles with one of the given shapes (e.g. "WALL")."""
+        return np.isin(self.shape[tiles], _enum_values(TILETYPE_SHAPES, shapes, "shape"))
+
+    def special_is(self, tiles: np.ndarray, *specials: str) -> np.ndarray:
+        """Mask of tiles with one of the given specials (e.g. "SMOOTH")."""
+        return np.isin(self.special[tiles], _enum_values(TILETYPE_SPECIALS, specials, "special"))
+
+    def material_is(self, tiles: np.ndarray, *materials: str) -> np.ndarray:
+        """Mask of tiles with one of the given materials (e.g. "MINERAL")."""
+        return np.isin(self.material[tiles], _enum_values(TILETYPE_MATERIALS, materials, "material"))
+
+
+class MaterialTable:
+    """Every material of the world, looked up by (mat_type, mat_index).
+
+    ``lookup()`` turns whole arrays of material pairs (e.g.
+    ``MapCache.mat_type`` and ``mat_index``) into rows of ``ids`` and
+    ``names`` with one sorted search.
+    """
+
+    def __init__(self, pairs: Sequence[tuple[int, int]], ids: list[str], names: list[str]):
+        self.ids = ids
+        self.names = names
+        pairs = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+        self.mat_type = pairs[:, 0].astype(np.int32)
+        self.mat_index = pairs[:, 1].astype(np.int32)
+        keys = self._key(self.mat_type, self.mat_index)
+        self._order = np.argsort(keys, kind="stable")
+        self._keys = keys[self._order]
+
+    @staticmethod
+    def _key(mat_type: np.ndarray, mat_index: np.ndarray) -> np.ndarray:
+        # mat_index is >= -1, so the shifted sum keeps (type, index) order
+        return (np.asarray(mat_type, dtype=np.int64) << 32) + np.asarray(mat_index, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def lookup(self, mat_type: np.ndarray, mat_index: np.ndarray) -> np.ndarray:
+        """Row of each material pair, -1 where the pair is unknown."""
+        if not len(self._keys):
+            return np.full(np.shape(mat_type), -1, dtype=np.intp)
+        keys = self._key(mat_type, mat_index)
+        pos = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+        return np.where(self._keys[pos] == keys, self._order[pos], -1)
+
+    def id_of(self, mat_type: int, mat_index: int) -> str | None:
+        """Material id token of one pair, or None if it is unknown."""
+        row = int(self.lookup(np.array(mat_type), np.array(mat_index)))
+        return self.ids[row] if row >= 0 else None
+
+
+def _decode_tiletype_list(reply: bytes) -> TiletypeTable:
+    """Decode a RemoteFortressReader.TiletypeList reply."""
+    if rfr_pb2 is not None:
+        return TiletypeTable([
+            (t.id, _text(t.name), t.shape, t.special, t.material, t.variant)
+            for t in rfr_pb2.TiletypeList.FromString(reply).tiletype_list
+        ])
+
+    # Hand-rolled fallback. TiletypeList: tiletype_list (1) = repeated
+    # Tiletype: id (1), name (2), shape (4), special (5), material (6),
+    # variant (7); the enums default to -1
+    return TiletypeTable([
+        (
+            t.get_int32(1), t.get_string(2),
+            t.get_int32(4, -1), t.get_int32(5, -1), t.get_int32(6, -1), t.get_int32(7, -1),
+        )
+        for t in MessageView(reply).iter_messages(1)
+    ])
+
+
+def _decode_material_list(reply: bytes) -> MaterialTable:
+    """Decode a RemoteFortressReader.MaterialList reply."""
+    if rfr_pb2 is not None:
+        materials = rfr_pb2.MaterialList.FromString(reply).material_list
+        return MaterialTable(
+            [(m.mat_pair.mat_type, m.mat_pair.mat_index) for m in materials],
+            [_text(m.id) for m in materials],
+            [_text(m.name) for m in materials],
+        )
+
+    # Hand-rolled fallback. MaterialList: material_list (1) = repeated
+    # MaterialDefinition: mat_pair (1, MatPair: mat_type 1, mat_index 2),
+    # id (2), name (3)
+    materials = list(MessageView(reply).iter_messages(1))
+    pairs = []
+    for m in materials:
+        pair = m.get_message(1)
+        pairs.append((pair.get_int32(1), pair.get_int32(2)))
+    return MaterialTable(
+        pairs,
+        [m.get_string(2) for m in materials],
+        [m.get_string(3) for m in materials],
+    )
+
+
+def _decode_creature_raws(reply: bytes) -> list[tuple[int, str, str]]:
+    """Decode a RemoteFortressReader.CreatureRawList as (index, id, name)."""
+    if rfr_pb2 is not None:
+        return [
+            (c.index, _text(c.creature_id), _text(c.name[0]) if c.name else "")
+            for c in rfr_pb2.CreatureRawList.FromString(reply).creature_raws
+        ]
+
+    # Hand-rolled fallback. CreatureRawList: creature_raws (1) = repeated
+    # CreatureRaw: index (1), creature_id (2), name (3, repeated; the
+    # first occurrence is the singular)
+    creatures = []
+    for c in MessageView(reply).iter_messages(1):
+        names = list(c.iter_messages(3))
+        creatures.append((c.get_int32(1), c.get_string(2), _text(names[0].tobytes()) if names else ""))
+    return creatures
+
+
+def _decode_plant_raws(reply: bytes) -> list[tuple[int, str, str]]:
+    """Decode a RemoteFortressReader.PlantRawList as (index, id, name)."""
+    if rfr_pb2 is not None:
+        return [
+            (p.index, _text(p.id), _text(p.name))
+            for p in rfr_pb2.PlantRawList.FromString(reply).plant_raws
+        ]
+
+    # Hand-rolled fallback. PlantRawList: plant_raws (1) = repeated
+    # PlantRaw: index (1), id (2), name (3)
+    return [
+        (p.get_int32(1), p.get_string(2), p.get_string(3))
+        for p in MessageView(reply).iter_messages(1)
+    ]
+
+
+def _by_index(rows: list[tuple[int, str, str]]) -> tuple[list[str], list[str]]:
+    """(index, id, name) rows as id and name lists indexed by index."""
+    size = max((row[0] for row in rows), default=-1) + 1
+    ids, names = [""] * size, [""] * size
+    for index, raw_id, name in rows:
+        ids[index] = raw_id
+        names[index] = name
+    return ids, names
+
+
+class WorldRaws:
+    """The raws a client resolves game ids with, for one world.
+
+    - ``creatures``/``creature_names``: creature id and name by race id
+    - ``plants``/``plant_names``: plant id and name by plant index
+    - ``materials``: MaterialTable
+    - ``tiletypes``: TiletypeTable
+
+    ``save()`` writes everything to one compressed .npz file and
+    ``load()`` reads it back without touching the game.
+    """
+
+    def __init__(
+        self,
+        creatures: list[str], creature_names: list[str],
+        plants: list[str], plant_names: list[str],
+        materials: MaterialTable, tiletypes: TiletypeTable,
+    ):
+        self.creatures = creatures
+        self.creature_names = creature_names
+        self.plants = plants
+        self.plant_names = plant_names
+        self.materials = materials
+        self.tiletypes = tiletypes
+
+    @classmethod
+    def from_replies(
+        cls, creatures: bytes, plants: bytes, materials: bytes, tiletypes: bytes,
+    ) -> "WorldRaws":
+        """Build from GetCreatureRaws, GetPlantRaws, GetMaterialList and
+        GetTiletypeList replies."""
+        return cls(
+            *_by_index(_decode_creature_raws(creatures)),
+            *_by_index(_decode_plant_raws(plants)),
+            _decode_material_list(materials),
+            _decode_tiletype_list(tiletypes),
+        )
+
+    def creature(self, race_id: int) -> str:
+        """Creature id of a race (e.g. "DWARF"), or race_<id> if unknown."""
+        if 0 <= race_id < len(self.creatures) and self.creatures[race_id]:
+            return self.creatures[race_id]
+        return f"race_{race_id}"
+
+    def plant(self, plant_index: int) -> str:
+        """Plant id of a plant index, or plant_<index> if unknown."""
+        if 0 <= plant_index < len(self.plants) and self.plants[plant_index]:
+            return self.plants[plant_index]
+        return f"plant_{plant_index}"
+
+    def save(self, path: Path) -> None:
+        """Write the raws to ``path``, replacing it atomically."""
+        tiletypes = self.tiletypes
+        size = len(tiletypes)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez_compressed(
+                f,
+                format=np.array(_RAWS_FORMAT),
+                creatures=np.array(self.creatures, dtype=str),
+                creature_names=np.array(self.creature_names, dtype=str),
+                plants=np.array(self.plants, dtype=str),
+                plant_names=np.array(self.plant_names, dtype=str),
+                mat_type=self.materials.mat_type,
+                mat_index=self.materials.mat_index,
+                material_ids=np.array(self.materials.ids, dtype=str),
+                material_names=np.array(self.materials.names, dtype=str),
+                tiletype_names=np.array(tiletypes.names, dtype=str),
+                tiletype_attrs=np.stack([
+                    tiletypes.shape[:size], tiletypes.special[:size],
+                    tiletypes.material[:size], tiletypes.variant[:size],
+                ]),
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "WorldRaws | None":
+        """Read raws written by save(); None if the file is missing,
+        unreadable or from another format version."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data["format"]) != _RAWS_FORMAT:
+                    return None
+                attrs = data["tiletype_attrs"].tolist()
+                return cls(
+                    data["creatures"].tolist(), data["creature_names"].tolist(),
+                    data["plants"].tolist(), data["plant_names"].tolist(),
+                    MaterialTable(
+                        np.stack([data["mat_type"], data["mat_index"]], axis=1),
+                        data["material_ids"].tolist(), data["material_names"].tolist(),
+                    ),
+                    TiletypeTable(list(zip(range(len(attrs[0])), data["tiletype_names"].tolist(), *attrs))),
+                )
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+def raws_cache_path(cache_dir: Path, world_name: str, save_name: str, df_version: str) -> Path:
+    """Cache file of one world's raws under one DF version."""
+    key = hashlib.sha1(f"{world_name}\0{save_name}\0{df_version}".encode()).hexdigest()[:12]
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", save_name or world_name).strip("_") or "world"
+    return cache_dir / f"{slug}-{key}.npz"
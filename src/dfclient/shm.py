@@ -0,0 +1,278 @@
+"""Fortress state shared with local readers through a memory-mapped file.
+
+The daemon publishes its latest fortress state (summary, unit table,
+creature names) into a file that scripts on the same host map and read
+directly, without a request to the daemon or DFHack.
+
+File layout: a fixed header, then the payload.
+
+    magic "DFSM" | format u32 | sequence u64 | length u64 | published f64
+
+Updates are guarded like a seqlock: the writer makes ``sequence`` odd,
+rewrites the payload, length and publish time, then makes it even again.
+A reader copies the payload between two reads of ``sequence`` and retries
+if they differ or are odd.
+
+Readers also touch a ``<state file>.wanted`` file on their first read of the
+state and then at most every STATE_WANTED_INTERVAL seconds, so polling a
+mapped state costs no syscalls. Its mtime tells the writer whether anyone
+still reads the state; the daemon stops publishing when nobody has for a
+while, so the first read after such a pause finds no fresh state.
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from dfclient.enums import EnumTable
+from dfclient.models import FortressSummary
+from dfclient.units import UnitTable
+
+# Per-user runtime files of the daemon (state file, Unix socket)
+RUNTIME_DIR = Path(os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()) / "dfclient"
+
+STATE_PATH = RUNTIME_DIR / "state.mmap"
+
+# Seconds after which a published state is treated as missing (the daemon
+# republishes more often than this while it runs)
+STATE_MAX_AGE = 5.0
+
+_MAGIC = b"DFSM"
+# Bumped whenever the payload layout changes
+_FORMAT = 1
+_HEADER = struct.Struct("<4sIQQd")
+_SEQUENCE = struct.Struct("<Q")
+_LENGTH_PUBLISHED = struct.Struct("<Qd")
+_SEQUENCE_OFFSET = 8
+
+# Seconds between a reader's touches of the .wanted file; the daemon keeps
+# publishing for DAEMON_WATCH_TIME (more than this) after one
+STATE_WANTED_INTERVAL = 30.0
+
+# Payload space reserved up front; the file grows if a state needs more
+_INITIAL_CAPACITY = 1 << 20
+
+# Attempts at reading a consistent payload before giving up
+_READ_RETRIES = 100
+
+
+def _wanted_path(path: Path) -> Path:
+    """File whose mtime is when a reader last read the state file at path."""
+    return path.with_name(path.name + ".wanted")
+
+
+class FortressState:
+    """The fortress as the daemon last saw it.
+
+    ``units`` is a full UnitTable, so the client's masks and builders work
+    on it unchanged; ``creature(race)`` names the races in it.
+    """
+
+    def __init__(
+        self,
+        summary: FortressSummary,
+        units: UnitTable,
+        creatures: dict[int, str],
+        year: int = 0,
+        tick: int = 0,
+        published: float = 0.0,
+    ):
+        self.summary = summary
+        self.units = units
+        self.creatures = creatures
+        self.year = year
+        self.tick = tick
+        # Wall-clock time the daemon published this state
+        self.published = published
+
+    def creature(self, race_id: int) -> str:
+        """Creature id of a race (e.g. "DWARF"), as WorldRaws.creature."""
+        return self.creatures.get(race_id) or f"race_{race_id}"
+
+    @property
+    def age(self) -> float:
+        """Seconds since the state was published."""
+        return time.time() - self.published
+
+    def encode(self) -> bytes:
+        """Serialize as a payload: u32 meta length, JSON meta, columns, name offsets, names."""
+        units = self.units
+        columns = np.column_stack([
+            units.id, units.race, units.civ_id, units.profession_id,
+            units.flags1, units.flags2, units.flags3, units.flags4,
+            units.pos[:, 1], units.pos[:, 2],
+        ]).astype("<i8")
+        names = [bytes(name) for name in units.names]
+        offsets = np.cumsum([0] + [len(name) for name in names], dtype="<i4")
+        meta = json.dumps({
+            "summary": self.summary.model_dump(),
+            "units": len(units),
+            "professions": {"first": units.professions.first, "names": units.professions.names},
+            "creatures": self.creatures,
+            "year": self.year,
+            "tick": self.tick,
+        }).encode("utf-8")
+        return b"".join([
+            struct.pack("<I", len(meta)), meta,
+            columns.tobytes(), offsets.tobytes(), b"".join(names),
+        ])
+
+    @classmethod
+    def decode(cls, payload: bytes, published: float = 0.0) -> "FortressState":
+        """Rebuild a state from encode()'s payload."""
+        (meta_len,) = struct.unpack_from("<I", payload)
+        pos = 4 + meta_len
+        meta: dict[str, Any] = json.loads(payload[4:pos])
+        count = meta["units"]
+        columns = np.frombuffer(payload, dtype="<i8", count=count * 10, offset=pos).reshape(count, 10)
+        pos += columns.nbytes
+        offsets = np.frombuffer(payload, dtype="<i4", count=count + 1, offset=pos).tolist()
+        pos += 4 * (count + 1)
+        names = [payload[pos + start:pos + end] for start, end in zip(offsets, offsets[1:])]
+        professions = EnumTable(meta["professions"]["first"], meta["professions"]["names"])
+        return cls(
+            FortressSummary(**meta["summary"]),
+            UnitTable(columns, names, professions),
+            {int(race): name for race, name in meta["creatures"].items()},
+            meta["year"],
+            meta["tick"],
+            published,
+        )
+
+
+class StateWriter:
+    """Publishes payloads into a state file (one writer per file).
+
+    The file is built under a temporary name and moved into place, so a
+    reader never maps a half-initialized file.
+    """
+
+    def __init__(self, path: Path | str = STATE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        fd = os.open(tmp_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.ftruncate(fd, _HEADER.size + _INITIAL_CAPACITY)
+            self._map = mmap.mmap(fd, _HEADER.size + _INITIAL_CAPACITY)
+        finally:
+            os.close(fd)
+        self._sequence = 0
+        _HEADER.pack_into(self._map, 0, _MAGIC, _FORMAT, 0, 0, 0.0)
+        os.replace(tmp_path, self.path)
+
+    def publish(self, payload: bytes) -> None:
+        """Replace the published payload."""
+        end = _HEADER.size + len(payload)
+        if end > len(self._map):
+            # Readers notice the longer length and map the file again
+            self._map.resize(max(end, 2 * len(self._map)))
+        self._sequence += 1
+        _SEQUENCE.pack_into(self._map, _SEQUENCE_OFFSET, self._sequence)
+        self._map[_HEADER.size:end] = payload
+        _LENGTH_PUBLISHED.pack_into(self._map, _SEQUENCE_OFFSET + _SEQUENCE.size, len(payload), time.time())
+        self._sequence += 1
+        _SEQUENCE.pack_into(self._map, _SEQUENCE_OFFSET, self._sequence)
+
+    def last_read(self) -> float:
+        """Wall-clock time a reader last read the state; 0.0 if none has."""
+        try:
+            return _wanted_path(self.path).stat().st_mtime
+        except OSError:
+            return 0.0
+
+    def close(self) -> None:
+        """Remove the file, so readers stop finding a state."""
+        for path in (self.path, _wanted_path(self.path)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        self._map.close()
+
+
+class StateReader:
+    """Reads the payload of a state file through a shared mapping.
+
+    Raises:
+        OSError: If the file can't be opened
+        ValueError: If it isn't a state file of this format
+    """
+
+    def __init__(self, path: Path | str = STATE_PATH):
+        self.path = Path(path)
+        self._map = self._open()
+        # When this reader last touched the .wanted file (monotonic)
+        self._wanted_touched: float | None = None
+
+    def _open(self) -> mmap.mmap:
+        with open(self.path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, fmt = struct.unpack_from("<4sI", mapped)
+        if magic != _MAGIC or fmt != _FORMAT:
+            mapped.close()
+            raise ValueError(f"{self.path} is not a dfclient state file (format {_FORMAT})")
+        return mapped
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "StateReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def read_payload(self) -> tuple[bytes, float] | None:
+        """(payload, publish time) of a consistent snapshot, None if nothing is published yet.
+
+        Raises:
+            TimeoutError: If the writer kept changing the payload while reading
+        """
+        now = time.monotonic()
+        if self._wanted_touched is None or now - self._wanted_touched >= STATE_WANTED_INTERVAL:
+            # Tell the writer the state is in use (it may stop publishing otherwise)
+            self._wanted_touched = now
+            try:
+                _wanted_path(self.path).touch()
+            except OSError:
+                pass
+        for _ in range(_READ_RETRIES):
+            _, _, sequence, length, published = _HEADER.unpack_from(self._map)
+            if sequence & 1:
+                continue
+            if _HEADER.size + length > len(self._map):
+                # The writer grew the file since it was mapped
+                self._map.close()
+                self._map = self._open()
+                continue
+            payload = self._map[_HEADER.size:_HEADER.size + length]
+            if _SEQUENCE.unpack_from(self._map, _SEQUENCE_OFFSET)[0] == sequence:
+                return (payload, published) if sequence else None
+        raise TimeoutError("State file kept changing while reading")
+
+    def read(self) -> FortressState | None:
+        """The published state, None if nothing is published yet."""
+        result = self.read_payload()
+        if result is None:
+            return None
+        return FortressState.decode(*result)
+
+
+def read_fortress_state(path: Path | str = STATE_PATH, max_age: float = STATE_MAX_AGE) -> FortressState | None:
+    """The daemon's published state, or None if there is none younger than max_age."""
+    try:
+        with StateReader(path) as reader:
+            state = reader.read()
+    except (OSError, ValueError):
+        return None
+    if state is None or state.age > max_age:
+        return None
+    return state
@@ -0,0 +1,252 @@
+"""Columnar unit table: one array per UnitDefinition field."""
+
+import unicodedata
+from bisect import bisect_left
+from operator import attrgetter
+from typing import Any, Iterable
+
+import numpy as np
+
+from dfclient.enums import EnumTable
+from dfclient.models import JobInfo, SkillInfo, Unit
+
+# flags1 bits
+FLAG1_DEAD = 0x2
+FLAG1_MERCHANT = 0x40
+FLAG1_TAME = 0x400
+FLAG1_CAGED = 0x200000
+FLAG1_HIDDEN_AMBUSHER = 0x40000
+FLAG1_ACTIVE_INVADER = 0x80000
+
+# flags2 bits
+FLAG2_INVADER_ORIGIN = 0x1
+FLAG2_DIPLOMAT = 0x800000
+
+# Professions meaning "no job assigned"
+IDLE_PROFESSIONS = ("NONE", "CHILD")
+
+# Military professions: basic, master and elite ranks of each weapon (the
+# ranks a DF version lacks are left out when looking up their ids)
+_WEAPON_PROFESSIONS = (
+    "HAMMERMAN", "SPEARMAN", "CROSSBOWMAN", "WRESTLER", "AXEMAN", "SWORDSMAN",
+    "MACEMAN", "PIKEMAN", "BOWMAN", "BLOWGUNMAN", "LASHER",
+)
+MILITARY_PROFESSIONS = tuple(
+    rank + name for rank in ("", "MASTER_", "ELITE_") for name in _WEAPON_PROFESSIONS
+)
+
+# Fields copied out of a decoded unit, in column order
+_COLUMNS = attrgetter(
+    "id", "race_id", "civ.civ_id", "profession.profession_id",
+    "flags1", "flags2", "flags3", "flags4", "pos_y", "pos_z",
+)
+_NAME = attrgetter("name")
+
+
+class UnitTable:
+    """Every unit of a GetUnitList reply as parallel NumPy arrays.
+
+    Row ``i`` of each column belongs to the same unit. Classification is
+    done with vectorized masks (``table.citizen() & table.idle()``), and
+    only the rows that are actually reported get turned into models by
+    the client's builders. Names stay raw bytes until they are needed.
+
+    Position x is not part of the unit data this client reads, so
+    ``pos[:, 0]`` is always 0.
+
+    ``professions`` is the game's profession enum; it names
+    ``profession_id`` and defines the idle() and military() professions.
+    """
+
+    def __init__(self, columns: np.ndarray, names: list[bytes], professions: EnumTable):
+        # Built on first use by the client (see UnitIndex)
+        self.index: UnitIndex | None = None
+        self.professions = professions
+        self.id = columns[:, 0].astype(np.int32)
+        self.race = columns[:, 1].astype(np.int32)
+        self.civ_id = columns[:, 2].astype(np.int32)
+        self.profession_id = columns[:, 3].astype(np.int32)
+        self.flags1 = columns[:, 4].astype(np.uint32)
+        self.flags2 = columns[:, 5].astype(np.uint32)
+        self.flags3 = columns[:, 6].astype(np.uint32)
+        self.flags4 = columns[:, 7].astype(np.uint32)
+        self.pos = np.zeros((len(columns), 3), dtype=np.int32)
+        self.pos[:, 1:] = columns[:, 8:10]
+        self.names = names
+
+    @classmethod
+    def from_units(cls, units: Iterable[Any], professions: EnumTable) -> "UnitTable":
+        """Fill the table in one pass over decoded UnitDefinition messages."""
+        units = list(units)
+        columns = np.array(list(map(_COLUMNS, units)), dtype=np.int64).reshape(-1, 10)
+        return cls(columns, list(map(_NAME, units)), professions)
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    # Masks
+
+    def alive(self) -> np.ndarray:
+        return (self.flags1 & FLAG1_DEAD) == 0
+
+    def invader(self) -> np.ndarray:
+        """Active invaders, hidden ambushers and units of an invading group."""
+        return (
+            (self.flags1 & (FLAG1_ACTIVE_INVADER | FLAG1_HIDDEN_AMBUSHER)) != 0
+        ) | ((self.flags2 & FLAG2_INVADER_ORIGIN) != 0)
+
+    def visitor(self) -> np.ndarray:
+        """Members of a civilization who are not citizens: merchants,
+        diplomats and active invaders."""
+        return (
+            ((self.flags1 & (FLAG1_MERCHANT | FLAG1_ACTIVE_INVADER)) != 0)
+            | ((self.flags2 & FLAG2_DIPLOMAT) != 0)
+        ) & (self.civ_id >= 0)
+
+    def citizen(self) -> np.ndarray:
+        """Living units of a civilization that are not visitors."""
+        return self.alive() & (self.civ_id >= 0) & ~self.visitor()
+
+    def idle(self) -> np.ndarray:
+        return np.isin(self.profession_id, self.professions.values(IDLE_PROFESSIONS))
+
+    def military(self) -> np.ndarray:
+        return np.isin(self.profession_id, self.professions.values(MILITARY_PROFESSIONS))
+
+    # Rows
+
+    def rows(self, mask: np.ndarray | None = None) -> list[int]:
+        """Row numbers selected by a mask (all rows if None)."""
+        if mask is None:
+            return list(range(len(self)))
+        return np.flatnonzero(mask).tolist()
+
+    def row_of(self, unit_id: int) -> int | None:
+        """Row number of a unit id, or None if it is not in the table."""
+        rows = np.flatnonzero(self.id == unit_id)
+        return int(rows[0]) if len(rows) else None
+
+
+def normalize_name(name: str) -> str:
+    """Fold a unit name for matching: lowercase, no accents or quotes."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    text = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(text.casefold().replace('"', " ").replace("`", " ").split())
+
+
+def _group_rows(column: np.ndarray) -> dict[int, list[int]]:
+    """Value -> rows holding it, rows in table order."""
+    order = np.argsort(column, kind="stable")
+    values, starts = np.unique(column[order], return_index=True)
+    groups = np.split(order, starts[1:])
+    return {value: group.tolist() for value, group in zip(values.tolist(), groups)}
+
+
+class UnitIndex:
+    """Hash and prefix lookups over one UnitTable snapshot.
+
+    Built once per table: unit id -> row, civ_id and profession_id ->
+    rows, flag class (the UnitTable mask names) -> rows, and a sorted
+    prefix map of normalized names. Every row list is in table order.
+    """
+
+    CLASSES = ("alive", "citizen", "invader", "visitor", "idle", "military")
+
+    def __init__(self, table: UnitTable, names: list[str]):
+        self.by_id: dict[int, int] = {unit_id: row for row, unit_id in enumerate(table.id.tolist())}
+        self.by_civ = _group_rows(table.civ_id)
+        self.by_profession = _group_rows(table.profession_id)
+        self.by_class: dict[str, list[int]] = {
+            name: table.rows(getattr(table, name)()) for name in self.CLASSES
+        }
+
+        # Every word of a name and the whole name are keys, so "urist",
+        # "mcdwarf" and "urist mcd" all find "Urist McDwarf"
+        entries = []
+        for row, name in enumerate(names):
+            folded = normalize_name(name)
+            if not folded:
+                continue
+            entries.append((folded, row))
+            words = folded.split()
+            if len(words) > 1:
+                entries.extend((word, row) for word in words)
+        entries.sort()
+        self._name_keys = [key for key, _ in entries]
+        self._name_rows = [row for _, row in entries]
+
+    def row(self, unit_id: int) -> int | None:
+        """Row of a unit id, or None."""
+        return self.by_id.get(unit_id)
+
+    def find_name(self, text: str) -> list[int]:
+        """Rows whose name, or a word of it, starts with ``text``."""
+        prefix = normalize_name(text)
+        if not prefix:
+            return []
+        keys = self._name_keys
+        rows = set()
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and keys[i].startswith(prefix):
+            rows.add(self._name_rows[i])
+            i += 1
+        return sorted(rows)
+
+
+class CitizenExport:
+    """Skills, labors and current job of every citizen, as matrices.
+
+    Row ``i`` of every attribute is the same citizen:
+
+    - ``skills``: ratings, citizens x skills (column = job_skill id)
+    - ``labors``: enabled flags, citizens x labors (column = unit_labor id)
+    - ``jobs``: current job_type name, or None when idle
+    """
+
+    def __init__(self, data: dict[str, Any]):
+        self.skill_names: list[str] = data.get("skill_names") or []
+        self.labor_names: list[str] = data.get("labor_names") or []
+        self.ids = np.array(data.get("ids") or [], dtype=np.int32)
+        self.names: list[str] = data.get("names") or []
+        self.jobs: list[str | None] = [job or None for job in data.get("jobs") or []]
+
+        count = len(self.ids)
+        self.skills = np.zeros((count, len(self.skill_names)), dtype=np.int16)
+        for row, flat in enumerate(data.get("skills") or []):
+            if flat:
+                pairs = np.array(flat, dtype=np.int32).reshape(-1, 2)
+                self.skills[row, pairs[:, 0]] = pairs[:, 1]
+
+        bitmap = "".join(data.get("labors") or []).encode("ascii")
+        self.labors = (
+            np.frombuffer(bitmap, dtype=np.uint8).reshape(count, len(self.labor_names)) == ord("1")
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def skill(self, name: str) -> np.ndarray:
+        """Every citizen's rating in one skill (e.g. "MINING")."""
+        return self.skills[:, self.skill_names.index(name)]
+
+    def labor(self, name: str) -> np.ndarray:
+        """Whether each citizen has one labor (e.g. "MINE") enabled."""
+        return self.labors[:, self.labor_names.index(name)]
+
+    def idle(self) -> np.ndarray:
+        """Mask of citizens without a current job."""
+        return np.array([job is None for job in self.jobs], dtype=bool)
+
+    def unit(self, row: int) -> Unit:
+        """One row as a Unit model with skills, labors and current job."""
+        job = self.jobs[row]
+        return Unit(
+            id=int(self.ids[row]),
+            name=self.names[row],
+            current_job=JobInfo(name=job) if job else None,
+            skills=[
+                SkillInfo(id=skill_id, name=self.skill_names[skill_id], level=level)
+                for skill_id, level in enumerate(self.skills[row].tolist()) if level
+            ],
+            labors={labor_id: True for labor_id in np.flatnonzero(self.labors[row]).tolist()},
+        )